@@ -0,0 +1,438 @@
+"""
+Interfaz de Línea de Comandos sin Pygame
+Universidad Nacional de Chimborazo - Metaheurísticas
+
+Ejecuta el algoritmo ACO sin ventana ni pygame, pensado para lanzar
+muchas corridas en servidores sin pantalla. Solo depende de numpy.
+
+Uso:
+    python -m aco run --scenario 0 --iterations 100 --ants 30 --seed 42
+    python -m aco run --engine parallel --workers 16 --ants 2000
+    python -m aco run --scenario mapa.npz
+    python -m aco run --profile perfil.csv
+    python -m aco bench --output actual.json
+    python -m aco compare base.json actual.json --threshold 0.1
+    python -m aco sweep --alpha 0.5,1,2 --beta 1:5:5 --scenarios 0,3 --cache barrido
+    python -m aco record --scenario 3 --every 20 --output cuadros/   (requiere pygame)
+
+La salida de 'run' es un objeto JSON con el mejor costo, la mejor ruta,
+el historial de costos y el tiempo de ejecución.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+
+def _finite_or_none(value):
+    """Convertir infinito a None para que la salida sea JSON válido"""
+    return value if value != float('inf') else None
+
+
+def run_headless(scenario=0, iterations=100, ants=30, seed=None, engine='ants',
+                 alpha=None, beta=None, evaporation_rate=None, rows=None, cols=None,
+                 workers=None, patience=None, entropy_threshold=None, route_share=None,
+                 backtrack=0, storage=None, profile=None):
+    """
+    Ejecutar una corrida completa del solver sin visualización.
+    
+    Con storage (un directorio) la grilla y las feromonas se guardan en
+    disco con MappedEnvironment, para mapas que no caben en memoria.
+    Con profile (un archivo .json o .csv) se activa el perfilado por
+    fases, se guardan ahí los registros por iteración y el resultado
+    incluye el resumen en 'profile'.
+    
+    Returns:
+        Diccionario serializable a JSON con los resultados
+    """
+    from config import ACOParams, GRID_ROWS, GRID_COLS
+    from environment import Environment, MappedEnvironment
+    from aco_algorithm import create_solver
+    from scenarios import load_scenario
+    
+    if storage:
+        env = MappedEnvironment(rows or GRID_ROWS, cols or GRID_COLS, storage)
+    else:
+        env = Environment(rows or GRID_ROWS, cols or GRID_COLS)
+    name = load_scenario(env, scenario, seed=seed)
+    if name is None:
+        raise ValueError(f"Escenario inválido: {scenario}")
+        
+    params = ACOParams()
+    params.num_ants = ants
+    params.max_iterations = iterations
+    if alpha is not None:
+        params.alpha = alpha
+    if beta is not None:
+        params.beta = beta
+    if evaporation_rate is not None:
+        params.evaporation_rate = evaporation_rate
+    params.backtrack_budget = backtrack
+    params.stagnation_iterations = patience
+    params.entropy_threshold = entropy_threshold
+    params.route_share_threshold = route_share
+        
+    options = {'workers': workers} if engine == 'parallel' else {}
+    with create_solver(env, params, engine, seed=seed, **options) as solver:
+        solver.reset()
+        profiler = solver.enable_profiling() if profile else None
+        
+        start_time = time.perf_counter()
+        while not solver.completed:
+            solver.run_iteration()
+        wall_time = time.perf_counter() - start_time
+    if storage:
+        env.flush()
+    if profiler:
+        profiler.save(profile)
+        
+    result = {
+        'scenario': scenario,
+        'scenario_name': name,
+        'engine': engine,
+        'seed': seed,
+        'seed_entropy': str(solver.seed_sequence.entropy),
+        'rows': env.rows,
+        'cols': env.cols,
+        'params': {
+            'num_ants': params.num_ants,
+            'alpha': params.alpha,
+            'beta': params.beta,
+            'evaporation_rate': params.evaporation_rate,
+            'q': params.q,
+            'max_iterations': params.max_iterations,
+            'backtrack_budget': params.backtrack_budget,
+            'stagnation_iterations': params.stagnation_iterations,
+            'entropy_threshold': params.entropy_threshold,
+            'route_share_threshold': params.route_share_threshold,
+        },
+        'iterations': solver.iteration,
+        'stop_reason': solver.stop_reason,
+        'best_cost': _finite_or_none(solver.best_cost),
+        'best_path': [list(pos) for pos in solver.best_path] if solver.best_path else None,
+        'history': [_finite_or_none(cost) for cost in solver.history],
+        'wall_time': wall_time,
+    }
+    if profiler:
+        result['profile'] = profiler.totals()
+    return result
+
+
+def cmd_run(args):
+    """Comando 'run': una corrida completa con salida JSON"""
+    try:
+        result = run_headless(
+            scenario=args.scenario,
+            iterations=args.iterations,
+            ants=args.ants,
+            seed=args.seed,
+            engine=args.engine,
+            alpha=args.alpha,
+            beta=args.beta,
+            evaporation_rate=args.evaporation,
+            rows=args.rows,
+            cols=args.cols,
+            workers=args.workers,
+            patience=args.patience,
+            entropy_threshold=args.entropy_threshold,
+            route_share=args.route_share,
+            backtrack=args.backtrack,
+            storage=args.storage,
+            profile=args.profile,
+        )
+    except (ValueError, OSError) as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 2
+        
+    json.dump(result, sys.stdout, indent=args.indent)
+    sys.stdout.write("\n")
+    return 0
+
+
+def cmd_record(args):
+    """Comando 'record': grabar una corrida sin pantalla (PNG o video)"""
+    from config import ACOParams, GRID_ROWS, GRID_COLS
+    from environment import Environment
+    from aco_algorithm import create_solver
+    from scenarios import load_scenario
+    
+    try:
+        from recording import record_run
+    except ImportError as error:
+        print(f"error: grabar requiere pygame ({error})", file=sys.stderr)
+        return 2
+        
+    env = Environment(args.rows or GRID_ROWS, args.cols or GRID_COLS)
+    params = ACOParams()
+    params.num_ants = args.ants
+    params.max_iterations = args.iterations
+    if args.alpha is not None:
+        params.alpha = args.alpha
+    if args.beta is not None:
+        params.beta = args.beta
+    if args.evaporation is not None:
+        params.evaporation_rate = args.evaporation
+        
+    try:
+        if load_scenario(env, args.scenario, seed=args.seed) is None:
+            raise ValueError(f"Escenario inválido: {args.scenario}")
+        with create_solver(env, params, args.engine, seed=args.seed) as solver:
+            summary = record_run(env, solver, args.output, every=args.every, per=args.per,
+                                 fps=args.fps, max_frames=args.max_frames,
+                                 image_format=args.format)
+    except (ValueError, OSError) as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 2
+        
+    summary['best_cost'] = _finite_or_none(summary['best_cost'])
+    json.dump(summary, sys.stdout, indent=args.indent)
+    sys.stdout.write("\n")
+    return 0
+
+
+def _scenario(text):
+    """Índice de escenario o ruta a un archivo de mapa"""
+    return int(text) if text.lstrip('-').isdigit() else text
+
+
+def _int_list(text):
+    """Convertir '10,30,100' en [10, 30, 100]"""
+    return [int(value) for value in text.split(',') if value]
+
+
+def _size_list(text):
+    """Convertir '30x35,500x500' en [(30, 35), (500, 500)]"""
+    sizes = []
+    for value in text.split(','):
+        rows, cols = value.lower().split('x')
+        sizes.append((int(rows), int(cols)))
+    return sizes
+
+
+def cmd_bench(args):
+    """Comando 'bench': benchmarks de todos los escenarios"""
+    from benchmark import run_benchmarks, save_results
+    
+    def progress(result):
+        print(f"  {result['engine']:>10} {result['rows']}x{result['cols']} "
+              f"hormigas={result['num_ants']:<4} {result['scenario_name']:<20} "
+              f"{result['ant_steps_per_sec']:>12.0f} pasos/s "
+              f"{result['peak_memory_mb']:>8.1f} MB", file=sys.stderr)
+              
+    results = run_benchmarks(
+        scenarios=args.scenarios,
+        sizes=args.sizes,
+        colonies=args.ants,
+        engines=args.engines.split(','),
+        iterations=args.iterations,
+        seed=args.seed,
+        progress=progress,
+    )
+    if args.output:
+        save_results(results, args.output)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    return 0
+
+
+def cmd_compare(args):
+    """Comando 'compare': detectar regresiones entre dos corridas"""
+    from benchmark import load_results, compare_results
+    
+    regressions = compare_results(load_results(args.baseline),
+                                  load_results(args.current), args.threshold)
+    for reg in regressions:
+        case = reg['case']
+        print(f"REGRESIÓN {case['engine']} {case['rows']}x{case['cols']} "
+              f"hormigas={case['num_ants']} escenario={case['scenario']}: "
+              f"{reg['metric']} {reg['baseline']:.4g} -> {reg['current']:.4g} "
+              f"({reg['change']:+.1%})")
+    if not regressions:
+        print(f"Sin regresiones (umbral {args.threshold:.0%})")
+    return 1 if regressions else 0
+
+
+def cmd_sweep(args):
+    """Comando 'sweep': barrido de parámetros con tabla ordenada"""
+    from sweep import run_sweep, parse_spec
+    
+    specs = {
+        'alpha': args.alpha,
+        'beta': args.beta,
+        'evaporation_rate': args.evaporation,
+        'num_ants': args.ants,
+        'q': args.q,
+    }
+    try:
+        space = {field: parse_spec(text) for field, text in specs.items() if text}
+        if not space:
+            raise ValueError("indique al menos un parámetro a barrer")
+            
+        def progress(done, total):
+            print(f"\r  {done}/{total} corridas", end="", file=sys.stderr, flush=True)
+            
+        ranked = run_sweep(
+            space,
+            scenarios=args.scenarios,
+            mode=args.mode,
+            samples=args.samples,
+            iterations=args.iterations,
+            engine=args.engine,
+            seed=args.seed,
+            repeats=args.repeats,
+            workers=args.workers,
+            cache_dir=args.cache,
+            progress=progress,
+        )
+        print(file=sys.stderr)
+    except ValueError as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 2
+        
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(ranked, f, indent=2)
+            
+    header = f"{'#':>3} {'alpha':>7} {'beta':>7} {'rho':>7} {'ants':>5} {'q':>7} " \
+             f"{'costo medio':>12} {'éxito':>6} {'tiempo':>8}"
+    print(header)
+    print("-" * len(header))
+    defaults = _param_defaults()
+    for rank, row in enumerate(ranked[:args.top], 1):
+        config = {**defaults, **row['config']}
+        cost = f"{row['mean_cost']:.2f}" if row['mean_cost'] is not None else "---"
+        print(f"{rank:>3} {config['alpha']:>7.3g} {config['beta']:>7.3g} "
+              f"{config['evaporation_rate']:>7.3g} {config['num_ants']:>5} {config['q']:>7.4g} "
+              f"{cost:>12} {row['success_rate']:>6.0%} {row['mean_time']:>7.2f}s")
+    return 0
+
+
+def _param_defaults():
+    """Valores por defecto de los campos barribles de ACOParams"""
+    from config import ACOParams
+    from sweep import SWEEP_FIELDS
+    
+    params = ACOParams()
+    return {field: getattr(params, field) for field in SWEEP_FIELDS}
+
+
+def build_parser():
+    """Construir el parser de argumentos"""
+    parser = argparse.ArgumentParser(
+        prog="python -m aco",
+        description="Simulador ACO sin interfaz gráfica (UNACH - Metaheurísticas)",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    run = subparsers.add_parser("run", help="Ejecutar el solver y mostrar resultados en JSON")
+    run.add_argument("--scenario", type=_scenario, default=0,
+                     help="Índice del escenario (0-6) o archivo de mapa (.npz, .npy, .pgm, .png)")
+    run.add_argument("--iterations", type=int, default=100, help="Número de iteraciones")
+    run.add_argument("--ants", type=int, default=30, help="Número de hormigas")
+    run.add_argument("--seed", type=int, default=None, help="Semilla aleatoria")
+    run.add_argument("--engine", choices=("ants", "vectorized", "parallel"), default="ants",
+                     help="Motor del solver")
+    run.add_argument("--workers", type=int, default=None,
+                     help="Procesos para el motor 'parallel' (por defecto, todos los núcleos)")
+    run.add_argument("--alpha", type=float, default=None, help="α - Importancia de feromona")
+    run.add_argument("--beta", type=float, default=None, help="β - Importancia heurística")
+    run.add_argument("--evaporation", type=float, default=None, help="ρ - Tasa de evaporación")
+    run.add_argument("--backtrack", type=int, default=0,
+                     help="Celdas que una hormiga atascada puede retroceder (0 = sin retroceso)")
+    run.add_argument("--patience", type=int, default=None,
+                     help="Detener tras N iteraciones sin mejora")
+    run.add_argument("--entropy-threshold", type=float, default=None,
+                     help="Detener si la entropía normalizada de feromonas baja de este valor (0-1)")
+    run.add_argument("--route-share", type=float, default=None,
+                     help="Detener si esta fracción de hormigas sigue la misma ruta (0-1)")
+    run.add_argument("--rows", type=int, default=None, help="Filas de la grilla")
+    run.add_argument("--cols", type=int, default=None, help="Columnas de la grilla")
+    run.add_argument("--storage", default=None,
+                     help="Directorio para guardar grilla y feromonas en disco (mapas grandes)")
+    run.add_argument("--profile", default=None,
+                     help="Perfilar las fases por iteración y guardarlas en este archivo (.json o .csv)")
+    run.add_argument("--indent", type=int, default=None, help="Indentación del JSON")
+    run.set_defaults(func=cmd_run)
+    
+    bench = subparsers.add_parser("bench", help="Ejecutar benchmarks y guardar resultados en JSON")
+    bench.add_argument("--scenarios", type=_int_list, default=None,
+                       help="Índices de escenarios, p. ej. 0,2,4 (por defecto todos)")
+    bench.add_argument("--sizes", type=_size_list, default=None,
+                       help="Tamaños de grilla, p. ej. 30x35,100x100,500x500")
+    bench.add_argument("--ants", type=_int_list, default=None,
+                       help="Tamaños de colonia, p. ej. 10,30,100")
+    bench.add_argument("--engines", default="ants,vectorized",
+                       help="Motores separados por coma (ants,vectorized,parallel)")
+    bench.add_argument("--iterations", type=int, default=5, help="Iteraciones por caso")
+    bench.add_argument("--seed", type=int, default=0, help="Semilla aleatoria")
+    bench.add_argument("--output", "-o", default=None, help="Archivo JSON de salida")
+    bench.set_defaults(func=cmd_bench)
+    
+    compare = subparsers.add_parser("compare", help="Comparar dos corridas de benchmarks")
+    compare.add_argument("baseline", help="JSON de referencia")
+    compare.add_argument("current", help="JSON a evaluar")
+    compare.add_argument("--threshold", type=float, default=0.1,
+                         help="Empeoramiento relativo tolerado (0.1 = 10%%)")
+    compare.set_defaults(func=cmd_compare)
+    
+    sweep = subparsers.add_parser("sweep", help="Barrido de parámetros (grilla o aleatorio)")
+    sweep.add_argument("--alpha", default=None, help="Valores 'a,b,c' o rango 'min:max[:n]'")
+    sweep.add_argument("--beta", default=None, help="Valores 'a,b,c' o rango 'min:max[:n]'")
+    sweep.add_argument("--evaporation", default=None, help="Valores o rango de ρ")
+    sweep.add_argument("--ants", default=None, help="Valores o rango del número de hormigas")
+    sweep.add_argument("--q", default=None, help="Valores o rango de q")
+    sweep.add_argument("--scenarios", type=_int_list, default=[0], help="Índices de escenarios")
+    sweep.add_argument("--mode", choices=("grid", "random"), default="grid",
+                       help="Búsqueda en grilla o aleatoria")
+    sweep.add_argument("--samples", type=int, default=20, help="Muestras en modo aleatorio")
+    sweep.add_argument("--iterations", type=int, default=50, help="Iteraciones por corrida")
+    sweep.add_argument("--engine", choices=("ants", "vectorized"), default="vectorized",
+                       help="Motor del solver")
+    sweep.add_argument("--seed", type=int, default=0, help="Semilla aleatoria")
+    sweep.add_argument("--repeats", type=int, default=1, help="Corridas por configuración")
+    sweep.add_argument("--workers", type=int, default=None, help="Procesos del pool")
+    sweep.add_argument("--cache", default=None, help="Directorio del caché de resultados")
+    sweep.add_argument("--top", type=int, default=20, help="Filas a mostrar")
+    sweep.add_argument("--output", "-o", default=None, help="Guardar la tabla completa en JSON")
+    sweep.set_defaults(func=cmd_sweep)
+    
+    record = subparsers.add_parser("record", help="Grabar una corrida sin pantalla en PNG o video")
+    record.add_argument("--output", "-o", required=True,
+                        help="Directorio para cuadros PNG o archivo de video (.mp4, .webm, .gif...)")
+    record.add_argument("--every", type=int, default=10,
+                        help="Grabar un cuadro cada N pasos o iteraciones")
+    record.add_argument("--per", choices=("step", "iteration"), default="step",
+                        help="Unidad de --every")
+    record.add_argument("--fps", type=int, default=30, help="Cuadros por segundo del video")
+    record.add_argument("--format", choices=("png", "bmp"), default="png",
+                        help="Formato de los cuadros en un directorio (bmp: sin comprimir, más rápido)")
+    record.add_argument("--max-frames", type=int, default=None,
+                        help="Detener tras grabar este número de cuadros")
+    record.add_argument("--scenario", type=_scenario, default=0,
+                        help="Índice del escenario (0-6) o archivo de mapa")
+    record.add_argument("--iterations", type=int, default=100, help="Número de iteraciones")
+    record.add_argument("--ants", type=int, default=30, help="Número de hormigas")
+    record.add_argument("--seed", type=int, default=None, help="Semilla aleatoria")
+    record.add_argument("--engine", choices=("ants", "vectorized"), default="ants",
+                        help="Motor del solver")
+    record.add_argument("--alpha", type=float, default=None, help="α - Importancia de feromona")
+    record.add_argument("--beta", type=float, default=None, help="β - Importancia heurística")
+    record.add_argument("--evaporation", type=float, default=None, help="ρ - Tasa de evaporación")
+    record.add_argument("--rows", type=int, default=None, help="Filas de la grilla")
+    record.add_argument("--cols", type=int, default=None, help="Columnas de la grilla")
+    record.add_argument("--indent", type=int, default=None, help="Indentación del JSON")
+    record.set_defaults(func=cmd_record)
+    
+    return parser
+
+
+def main(argv=None):
+    """Función principal de la CLI"""
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,46 +6,153 @@ Implementación del algoritmo Ant Colony Optimization para
 encontrar rutas óptimas en un espacio 2D con obstáculos.
 """
 
+import os
+from collections import Counter
 import numpy as np
-import random
-from config import ACOParams
+from array import array
+from multiprocessing import Pool, shared_memory
+from config import ACOParams, DIRECTIONS, COST_STRAIGHT, COST_DIAGONAL
+
+
+# Estados de una hormiga (motor vectorizado y ant_states)
+ANT_ACTIVE = 0
+ANT_REACHED = 1
+ANT_STUCK = 2
+
+# Ancho inicial (pasos) del buffer de caminos del motor vectorizado
+PATHS_INITIAL_WIDTH = 256
+
+# Tipo de los caminos y de los sellos de visita de Ant (enteros de 32 bits)
+PATH_TYPECODE = 'i'
+STAMP_TYPECODE = 'I'
+STAMP_MAX = 2 ** (8 * array(STAMP_TYPECODE).itemsize) - 1
+
+
+def make_seed_sequence(seed=None):
+    """
+    Normalizar una semilla a numpy.random.SeedSequence.
+    
+    Acepta None (entropía del sistema), un entero, una SeedSequence
+    o un numpy.random.Generator (del que se extrae entropía).
+    """
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    if isinstance(seed, np.random.Generator):
+        return np.random.SeedSequence(seed.integers(0, 2**63, size=4).tolist())
+    return np.random.SeedSequence(seed)
 
 
 class Ant:
     """
     Representa una hormiga individual en la colonia.
     
+    Las celdas se guardan como índices planos (fila * cols + columna).
+    El camino vive en un buffer de enteros de 32 bits que duplica su
+    tamaño al llenarse y las visitas se marcan con un sello de generación
+    de 32 bits por celda (4 bytes por celda y hormiga), de modo que
+    reiniciar la hormiga no reserva memoria y has_visited es O(1).
+    
+    Con sparse=True (mapas grandes) las visitas se guardan en un
+    diccionario, así que la memoria depende de las celdas recorridas y
+    no del tamaño del mapa.
+    
     Atributos:
-        position: Posición actual (fila, columna)
-        path: Lista de posiciones visitadas
+        cell: Índice plano de la posición actual
+        path_buffer: Buffer con las celdas visitadas (válido hasta path_length)
+        path_length: Número de celdas en el camino
         path_cost: Costo total del camino recorrido
         reached_goal: Si llegó al objetivo
+        stuck: Si quedó sin vecinos por visitar
+        backtracks: Celdas retrocedidas en la iteración actual
+        dead_end: Si llegó a un callejón sin salida en la iteración actual
+        rng: Generador aleatorio propio de la hormiga
     """
     
-    def __init__(self, start_position):
-        self.position = start_position
-        self.path = [start_position]
-        self.path_cost = 0.0
-        self.reached_goal = False
-        self.stuck = False
+    __slots__ = ('cols', 'num_cells', 'sparse', 'cell', 'path_buffer', 'path_length',
+                 'path_cost', 'reached_goal', 'stuck', 'backtracks', 'dead_end',
+                 'visit_stamps', 'generation', 'rng')
+    
+    def __init__(self, start_cell, num_cells, cols, rng=None, sparse=False):
+        self.cols = cols
+        self.num_cells = num_cells
+        self.sparse = sparse
+        self.rng = rng if rng is not None else np.random.default_rng()
+        typecode = PATH_TYPECODE if num_cells <= 2**31 else 'q'
+        self.path_buffer = array(typecode, [start_cell]) * 64
+        if sparse:
+            self.visit_stamps = {}
+        else:
+            self.visit_stamps = array(STAMP_TYPECODE, [0]) * num_cells
+        self.generation = 0
+        self.reset(start_cell)
+        
+    @property
+    def position(self):
+        """Posición actual como tupla (fila, columna)"""
+        return divmod(self.cell, self.cols)
+    
+    @property
+    def path(self):
+        """Camino recorrido como lista de tuplas (fila, columna)"""
+        return [divmod(cell, self.cols) for cell in self.path_buffer[:self.path_length]]
+    
+    def path_cells(self):
+        """Vista NumPy (sin copia) de los índices planos del camino"""
+        return np.frombuffer(self.path_buffer, dtype=self.path_buffer.typecode,
+                             count=self.path_length)
         
-    def move_to(self, new_position, cost):
-        """Mover la hormiga a una nueva posición"""
-        self.position = new_position
-        self.path.append(new_position)
+    def move_to(self, cell, cost):
+        """Mover la hormiga a una nueva celda"""
+        self.cell = cell
+        if self.path_length == len(self.path_buffer):
+            # Crecimiento geométrico: lo que sigue a path_length no importa
+            self.path_buffer.extend(self.path_buffer)
+        self.path_buffer[self.path_length] = cell
+        self.path_length += 1
+        self.visit_stamps[cell] = self.generation
         self.path_cost += cost
         
-    def reset(self, start_position):
+    def backtrack(self):
+        """
+        Retroceder una celda por el camino.
+        
+        La celda abandonada sigue marcada como visitada, así que la
+        hormiga no vuelve a entrar en el callejón.
+        """
+        left = self.cell
+        self.path_length -= 1
+        self.cell = self.path_buffer[self.path_length - 1]
+        diagonal = (left // self.cols != self.cell // self.cols and
+                    left % self.cols != self.cell % self.cols)
+        self.path_cost -= COST_DIAGONAL if diagonal else COST_STRAIGHT
+        self.backtracks += 1
+        self.stuck = False
+        
+    def reset(self, start_cell):
         """Reiniciar la hormiga al inicio"""
-        self.position = start_position
-        self.path = [start_position]
+        if self.sparse:
+            self.visit_stamps.clear()
+        elif self.generation == STAMP_MAX:
+            # Los sellos dan la vuelta: borrar las marcas antiguas
+            self.visit_stamps = array(STAMP_TYPECODE, [0]) * self.num_cells
+            self.generation = 0
+        self.generation += 1
+        self.cell = start_cell
+        self.path_buffer[0] = start_cell
+        self.path_length = 1
+        self.visit_stamps[start_cell] = self.generation
         self.path_cost = 0.0
         self.reached_goal = False
         self.stuck = False
+        self.backtracks = 0
+        self.dead_end = False
         
-    def has_visited(self, position):
-        """Verificar si ya visitó una posición"""
-        return position in self.path
+    def has_visited(self, cell):
+        """Verificar si ya visitó una celda"""
+        if self.sparse:
+            # get: consultar una celda no visitada no debe agregarla
+            return self.visit_stamps.get(cell) == self.generation
+        return self.visit_stamps[cell] == self.generation
 
 
 class ACOSolver:
@@ -57,12 +164,41 @@ class ACOSolver:
     - Actualización de feromonas
     - Evaporación
     - Seguimiento de mejores rutas
+    
+    La simulación termina al llegar a params.max_iterations o antes, si se
+    cumple alguno de los criterios de convergencia configurados en params
+    (estancamiento, entropía de feromonas o ruta compartida). Si el
+    objetivo no es alcanzable desde el nido termina sin iterar. El motivo
+    queda en self.stop_reason.
+    
+    Con params.backtrack_budget > 0 una hormiga atascada retrocede por su
+    camino, una celda por paso, hasta una celda con vecinos sin visitar y
+    sigue desde ahí, en lugar de descartarse. self.dead_end_ants cuenta
+    las hormigas de la última iteración que llegaron a un callejón sin
+    salida (las que habrían muerto sin retroceso).
+    
+    enable_profiling() registra el tiempo de cada fase y contadores por
+    iteración en self.profiler (ver profiling.py); desactivado no cuesta
+    nada.
+    
+    La aleatoriedad sale de una semilla (entero, SeedSequence o Generator).
+    De ella se derivan un flujo para la colonia (self.rng) y un flujo
+    independiente por hormiga, de modo que con la misma semilla, escenario
+    y parámetros el historial y la mejor ruta son idénticos.
     """
     
-    def __init__(self, environment, params=None):
+    def __init__(self, environment, params=None, seed=None):
         self.env = environment
         self.params = params if params else ACOParams()
         
+        # Flujos aleatorios reproducibles
+        self.seed_sequence = make_seed_sequence(seed)
+        self._reset_streams()
+        
+        # Heurística η^β cacheada por (objetivo, β)
+        self._heuristic = None
+        self._heuristic_key = None
+        
         # Colonia de hormigas
         self.ants = []
         self.initialize_ants()
@@ -72,26 +208,108 @@ class ACOSolver:
         self.best_cost = float('inf')
         self.iteration = 0
         self.history = []  # Historial de mejores costos
+        self.ant_steps = 0  # Pasos de hormiga ejecutados en total
+        self.dead_end_ants = 0  # Hormigas atascadas en la última iteración
+        self.iterations_without_improvement = 0
+        self.stop_reason = None  # Motivo de término de la simulación
+        self.profiler = None  # SolverProfiler activo (enable_profiling)
         
         # Estado de la simulación
         self.running = False
         self.completed = False
         
+    def _start_cell(self):
+        """Índice plano del nido"""
+        return self.env.start[0] * self.env.cols + self.env.start[1]
+    
+    def _end_cell(self):
+        """Índice plano del objetivo"""
+        return self.env.end[0] * self.env.cols + self.env.end[1]
+        
+    def _reset_streams(self):
+        """Reiniciar los flujos aleatorios desde la semilla original"""
+        self._seed_root = np.random.SeedSequence(
+            self.seed_sequence.entropy, spawn_key=self.seed_sequence.spawn_key
+        )
+        self.rng = np.random.default_rng(self._seed_root.spawn(1)[0])
+        
+    def spawn_rngs(self, count):
+        """Crear generadores independientes (para hormigas o procesos)"""
+        return [np.random.default_rng(seq) for seq in self._seed_root.spawn(count)]
+        
     def initialize_ants(self):
-        """Crear la colonia de hormigas"""
-        self.ants = [Ant(self.env.start) for _ in range(self.params.num_ants)]
+        """
+        Preparar la colonia de hormigas.
+        
+        Las hormigas existentes se reutilizan mientras el tamaño de la
+        grilla no cambie; solo se crean o descartan las que sobran.
+        Cada hormiga recibe un flujo aleatorio propio.
+        """
+        num_cells = self.env.rows * self.env.cols
+        start = self._start_cell()
+        sparse = not self.env.dense
+        
+        first = self.ants[0] if self.ants else None
+        if first is not None and (first.num_cells, first.cols, first.sparse) != (
+                num_cells, self.env.cols, sparse):
+            self.ants = []
+        del self.ants[self.params.num_ants:]
+        while len(self.ants) < self.params.num_ants:
+            self.ants.append(Ant(start, num_cells, self.env.cols, sparse=sparse))
+        for ant, rng in zip(self.ants, self.spawn_rngs(len(self.ants))):
+            ant.rng = rng
+        self._reset_ants()
         
+    def _reset_ants(self):
+        """Devolver todas las hormigas al nido para una nueva iteración"""
+        start = self._start_cell()
+        for ant in self.ants:
+            ant.reset(start)
+        self._active = list(self.ants)
+            
     def reset(self):
         """Reiniciar la simulación"""
         self.env.reset_pheromones(self.params.initial_pheromone)
+        self._reset_streams()
         self.initialize_ants()
         self.best_path = None
         self.best_cost = float('inf')
         self.iteration = 0
         self.history = []
+        self.ant_steps = 0
+        self.dead_end_ants = 0
+        self.iterations_without_improvement = 0
+        self.stop_reason = None
         self.running = False
         self.completed = False
         
+    def get_heuristic_weights(self):
+        """
+        Obtener η^β para todas las celdas (arreglo plano).
+        
+        η = 1 / (distancia al objetivo + 0.1). El resultado se recalcula
+        solo cuando cambia el objetivo del entorno o el parámetro β.
+        """
+        key = (self.env.rows, self.env.cols, self.env.end, self.params.beta)
+        if key != self._heuristic_key:
+            distance = self.env.get_distance_field().reshape(-1)
+            self._heuristic = (1.0 / (distance + 0.1)) ** self.params.beta
+            self._heuristic_key = key
+        return self._heuristic
+        
+    def _heuristic_at(self, cells):
+        """
+        Obtener η^β de algunas celdas (índices planos).
+        
+        En entornos densos se lee de get_heuristic_weights; en mapas
+        grandes se calcula solo para las celdas pedidas.
+        """
+        if self.env.dense:
+            return self.get_heuristic_weights()[cells]
+        rows, cols = np.divmod(np.asarray(cells), self.env.cols)
+        distance = np.sqrt((rows - self.env.end[0])**2 + (cols - self.env.end[1])**2)
+        return (1.0 / (distance + 0.1)) ** self.params.beta
+        
     def select_next_cell(self, ant):
         """
         Seleccionar la siguiente celda usando la regla de transición de ACO.
@@ -104,28 +322,30 @@ class ACOSolver:
         - η: heurística (1/distancia al objetivo)
         - α: importancia de la feromona
         - β: importancia de la heurística
+        
+        Returns:
+            Tupla (celda, costo) con el índice plano elegido, o None si
+            la hormiga quedó atascada
         """
-        current = ant.position
-        neighbors = self.env.get_neighbors(*current)
+        indices, costs = self.env.neighbor_cells(ant.cell)
         
         # Filtrar vecinos no visitados
-        unvisited = [(r, c, cost) for r, c, cost in neighbors 
-                     if not ant.has_visited((r, c))]
+        unvisited = []
+        cells = []
+        for neighbor, cost in zip(indices.tolist(), costs.tolist()):
+            if not ant.has_visited(neighbor):
+                unvisited.append((neighbor, cost))
+                cells.append(neighbor)
         
         if not unvisited:
             ant.stuck = True
             return None
-            
-        # Calcular probabilidades
-        probabilities = []
-        for row, col, cost in unvisited:
-            pheromone = self.env.get_pheromone(row, col)
-            heuristic = 1.0 / (self.env.get_heuristic(row, col) + 0.1)
-            
-            # Fórmula ACO
-            attractiveness = (pheromone ** self.params.alpha) * (heuristic ** self.params.beta)
-            probabilities.append(attractiveness)
-            
+        
+        # Calcular probabilidades (fórmula ACO con η^β precalculado)
+        pheromones = self.env.pheromone_values(cells)
+        heuristics = self._heuristic_at(cells)
+        probabilities = ((pheromones ** self.params.alpha) * heuristics).tolist()
+        
         # Normalizar probabilidades
         total = sum(probabilities)
         if total == 0:
@@ -134,7 +354,7 @@ class ACOSolver:
             probabilities = [p / total for p in probabilities]
             
         # Selección por ruleta
-        r = random.random()
+        r = ant.rng.random()
         cumulative = 0
         for i, prob in enumerate(probabilities):
             cumulative += prob
@@ -148,13 +368,15 @@ class ACOSolver:
         Mover una hormiga un paso.
         
         Returns:
-            True si la hormiga se movió, False si está atascada o llegó
+            True si la hormiga se movió o retrocedió, False si está
+            atascada o llegó
         """
         if ant.reached_goal or ant.stuck:
             return False
             
         # Verificar si llegó al objetivo
-        if ant.position == self.env.end:
+        end = self._end_cell()
+        if ant.cell == end:
             ant.reached_goal = True
             return False
             
@@ -162,33 +384,46 @@ class ACOSolver:
         next_cell = self.select_next_cell(ant)
         
         if next_cell is None:
+            ant.dead_end = True
+            # Retroceder hacia la última bifurcación si queda presupuesto
+            if ant.backtracks < self.params.backtrack_budget and ant.path_length > 1:
+                ant.backtrack()
+                return True
             return False
             
-        row, col, cost = next_cell
-        ant.move_to((row, col), cost)
+        cell, cost = next_cell
+        ant.move_to(cell, cost)
         
         # Verificar si llegó
-        if (row, col) == self.env.end:
+        if cell == end:
             ant.reached_goal = True
             
         return True
     
     def move_all_ants_one_step(self):
         """
-        Mover todas las hormigas un paso.
+        Mover todas las hormigas activas un paso.
+        
+        Solo se recorren las hormigas que no han llegado ni quedado
+        atascadas; las que terminan salen del índice de activas.
         
         Returns:
             True si al menos una hormiga se movió
         """
-        any_moved = False
-        for ant in self.ants:
+        moved = 0
+        active = []
+        for ant in self._active:
             if self.move_ant(ant):
-                any_moved = True
-        return any_moved
+                moved += 1
+            if not (ant.reached_goal or ant.stuck):
+                active.append(ant)
+        self._active = active
+        self.ant_steps += moved
+        return moved > 0
     
     def all_ants_finished(self):
         """Verificar si todas las hormigas terminaron"""
-        return all(ant.reached_goal or ant.stuck for ant in self.ants)
+        return not self._active
     
     def update_pheromones(self):
         """
@@ -196,25 +431,53 @@ class ACOSolver:
         
         Solo las hormigas que llegaron al objetivo depositan feromona.
         La cantidad depositada es inversamente proporcional al costo del camino.
+        
+        La evaporación y el depósito trabajan en el lugar sobre la matriz de
+        feromonas: todos los caminos se depositan con una sola suma dispersa.
         """
         # Evaporación
         self.env.evaporate_pheromones(self.params.evaporation_rate)
         
         # Depósito de feromonas
-        for ant in self.ants:
-            if ant.reached_goal:
-                # Cantidad de feromona a depositar
-                deposit = self.params.q / ant.path_cost
-                
-                # Depositar en cada celda del camino
-                for pos in ant.path:
-                    self.env.update_pheromone(pos[0], pos[1], deposit)
-                    
-                # Actualizar mejor camino
-                if ant.path_cost < self.best_cost:
-                    self.best_cost = ant.path_cost
-                    self.best_path = ant.path.copy()
-                    
+        self._deposit_tours(*self.completed_tours())
+        
+    def completed_tours(self):
+        """
+        Obtener los caminos de las hormigas que llegaron al objetivo.
+        
+        Returns:
+            Tupla (cells, lengths, costs): índices planos de todos los
+            caminos concatenados, longitud y costo de cada camino
+        """
+        finished = [ant for ant in self.ants if ant.reached_goal]
+        if not finished:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+        cells = np.concatenate([ant.path_cells() for ant in finished])
+        lengths = np.array([ant.path_length for ant in finished], dtype=np.int64)
+        costs = np.array([ant.path_cost for ant in finished])
+        return cells, lengths, costs
+        
+    def _deposit_tours(self, cells, lengths, costs):
+        """
+        Depositar q / costo en caminos dados como índices planos
+        concatenados y actualizar el mejor camino.
+        """
+        if lengths.size == 0:
+            return
+            
+        # Depósito: índices planos de todos los caminos exitosos
+        amounts = np.repeat(self.params.q / costs, lengths)
+        self.env.deposit_pheromones(cells, amounts)
+        
+        # Actualizar mejor camino
+        best = int(np.argmin(costs))
+        if costs[best] < self.best_cost:
+            self.best_cost = float(costs[best])
+            offset = int(lengths[:best].sum())
+            path = cells[offset:offset + lengths[best]]
+            rows, cols = np.divmod(path, self.env.cols)
+            self.best_path = list(zip(rows.tolist(), cols.tolist()))
+            
     def run_iteration(self):
         """
         Ejecutar una iteración completa del algoritmo.
@@ -223,6 +486,9 @@ class ACOSolver:
         2. Actualizar feromonas
         3. Reiniciar hormigas para siguiente iteración
         """
+        if not self._check_reachable():
+            return
+            
         # Mover hormigas hasta que todas terminen
         max_steps = self.env.rows * self.env.cols * 2  # Límite de pasos
         steps = 0
@@ -231,23 +497,100 @@ class ACOSolver:
             self.move_all_ants_one_step()
             steps += 1
             
+        self._finish_iteration()
+        
+    def _check_reachable(self):
+        """
+        Terminar la simulación si el objetivo no es alcanzable desde el nido.
+        
+        La consulta usa las componentes conexas del entorno y no recorre
+        la grilla, así que se puede hacer en cada paso.
+        
+        Returns:
+            True si existe un camino
+        """
+        if self.env.path_exists():
+            return True
+        self.stop_reason = 'unreachable'
+        self.completed = True
+        self.running = False
+        return False
+        
+    def _finish_iteration(self):
+        """
+        Cerrar la iteración actual: feromonas, historial, reinicio de
+        hormigas y verificación de convergencia.
+        
+        Returns:
+            True si la simulación terminó
+        """
+        # La ruta compartida se mide antes de reiniciar a las hormigas
+        route_share = None
+        if self.params.route_share_threshold is not None:
+            route_share = self.route_share()
+            
+        self.dead_end_ants = self._dead_end_count()
+        
         # Actualizar feromonas
+        previous_best = self.best_cost
         self.update_pheromones()
         
         # Registrar historial
         self.history.append(self.best_cost if self.best_path else float('inf'))
-        
-        # Reiniciar hormigas
-        for ant in self.ants:
-            ant.reset(self.env.start)
+        if self.best_cost < previous_best:
+            self.iterations_without_improvement = 0
+        else:
+            self.iterations_without_improvement += 1
             
+        # Reiniciar hormigas
+        self._reset_ants()
+        
         self.iteration += 1
         
         # Verificar convergencia
-        if self.iteration >= self.params.max_iterations:
+        self.stop_reason = self._check_convergence(route_share)
+        if self.stop_reason:
             self.completed = True
             self.running = False
-            
+        return self.completed
+        
+    def _check_convergence(self, route_share=None):
+        """
+        Evaluar los criterios de término.
+        
+        Returns:
+            'stagnation', 'entropy', 'route_share', 'max_iterations' o None
+        """
+        params = self.params
+        if (params.stagnation_iterations is not None and self.best_path
+                and self.iterations_without_improvement >= params.stagnation_iterations):
+            return 'stagnation'
+        if (params.entropy_threshold is not None
+                and self.pheromone_entropy() <= params.entropy_threshold):
+            return 'entropy'
+        if route_share is not None and route_share >= params.route_share_threshold:
+            return 'route_share'
+        if self.iteration >= params.max_iterations:
+            return 'max_iterations'
+        return None
+        
+    def pheromone_entropy(self):
+        """
+        Entropía de Shannon normalizada (0-1) de las feromonas en celdas libres.
+        
+        Vale 1 con feromona uniforme y tiende a 0 cuando se concentra en
+        pocas celdas.
+        """
+        return self.env.pheromone_entropy()
+        
+    def route_share(self):
+        """Fracción de la colonia que recorrió exactamente la misma ruta"""
+        cells, lengths, _ = self.completed_tours()
+        if lengths.size == 0:
+            return 0.0
+        routes = Counter(route.tobytes() for route in np.split(cells, np.cumsum(lengths)[:-1]))
+        return max(routes.values()) / self._colony_counts()[1]
+        
     def step(self):
         """
         Ejecutar un paso de simulación (para animación paso a paso).
@@ -256,39 +599,538 @@ class ACOSolver:
             'moving' - Hormigas moviéndose
             'updating' - Actualizando feromonas
             'new_iteration' - Nueva iteración iniciada
-            'completed' - Simulación terminada
+            'completed' - Simulación terminada (ver stop_reason)
         """
-        if self.completed:
+        if self.completed or not self._check_reachable():
             return 'completed'
             
         if not self.all_ants_finished():
             self.move_all_ants_one_step()
             return 'moving'
         else:
-            self.update_pheromones()
-            self.history.append(self.best_cost if self.best_path else float('inf'))
-            
-            # Reiniciar hormigas
-            for ant in self.ants:
-                ant.reset(self.env.start)
-                
-            self.iteration += 1
-            
-            if self.iteration >= self.params.max_iterations:
-                self.completed = True
+            if self._finish_iteration():
                 return 'completed'
                 
             return 'new_iteration'
             
+    def ant_states(self):
+        """
+        Posición y estado de cada hormiga como arreglos nuevos.
+        
+        Returns:
+            Tupla (positions, status): índices planos de celda y
+            ANT_ACTIVE, ANT_REACHED o ANT_STUCK
+        """
+        positions = np.fromiter((ant.cell for ant in self.ants), dtype=np.int64, count=len(self.ants))
+        status = np.fromiter(
+            (ANT_REACHED if ant.reached_goal else ANT_STUCK if ant.stuck else ANT_ACTIVE
+             for ant in self.ants),
+            dtype=np.int8, count=len(self.ants)
+        )
+        return positions, status
+        
+    def _colony_counts(self):
+        """Obtener (hormigas que llegaron, total de hormigas)"""
+        return sum(1 for ant in self.ants if ant.reached_goal), len(self.ants)
+        
+    def _dead_end_count(self):
+        """Hormigas de la iteración actual que llegaron a un callejón sin salida"""
+        return sum(1 for ant in self.ants if ant.dead_end)
+        
+    def enable_profiling(self):
+        """
+        Activar el perfilado por fases.
+        
+        Returns:
+            El SolverProfiler con los registros por iteración
+        """
+        if self.profiler is None:
+            from profiling import SolverProfiler
+            self.profiler = SolverProfiler(self)
+            self.profiler.install()
+        return self.profiler
+        
+    def disable_profiling(self):
+        """
+        Desactivar el perfilado por fases.
+        
+        Returns:
+            El SolverProfiler que estaba activo (con sus registros) o None
+        """
+        profiler, self.profiler = self.profiler, None
+        if profiler is not None:
+            profiler.uninstall()
+        return profiler
+        
+    def close(self):
+        """Liberar recursos del motor (procesos, memoria compartida)"""
+        
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, *exc_info):
+        self.close()
+        
     def get_statistics(self):
         """Obtener estadísticas actuales"""
-        successful_ants = sum(1 for ant in self.ants if ant.reached_goal)
+        successful_ants, total_ants = self._colony_counts()
         return {
             'iteration': self.iteration,
             'best_cost': self.best_cost if self.best_path else None,
             'best_path_length': len(self.best_path) if self.best_path else 0,
             'successful_ants': successful_ants,
-            'total_ants': len(self.ants),
+            'total_ants': total_ants,
             'max_pheromone': self.env.get_max_pheromone(),
-            'avg_pheromone': np.mean(self.env.pheromones),
+            'avg_pheromone': self.env.get_mean_pheromone(),
+            'dead_end_ants': self.dead_end_ants,
+            'iterations_without_improvement': self.iterations_without_improvement,
+            'stop_reason': self.stop_reason,
         }
+
+
+class VectorizedACOSolver(ACOSolver):
+    """
+    Motor ACO alternativo donde toda la colonia se guarda como arreglos NumPy.
+    
+    En lugar de un objeto Ant por hormiga, el estado de la colonia es:
+        positions: Índice plano (fila * cols + columna) de cada hormiga
+        costs: Costo acumulado del camino de cada hormiga
+        status: ANT_ACTIVE, ANT_REACHED o ANT_STUCK
+        visited: Máscara (hormigas x celdas) de celdas visitadas
+        paths: Buffer int32 (hormigas x pasos) con el camino de cada
+            hormiga; empieza angosto y duplica su ancho (hasta el número
+            de celdas) cuando un camino lo llena
+        path_lengths: Longitud actual del camino de cada hormiga
+        backtracks: Celdas retrocedidas por cada hormiga en la iteración
+        dead_end: Si cada hormiga llegó a un callejón sin salida
+    
+    Cada paso avanza a todas las hormigas activas con una sola operación
+    por lotes usando el flujo aleatorio de la colonia (self.rng).
+    Las estadísticas son las mismas que las de ACOSolver.
+    """
+    
+    def __init__(self, environment, params=None, seed=None):
+        if not environment.dense:
+            raise ValueError("El motor vectorizado necesita un entorno denso; use el motor 'ants'")
+        self._slots = np.arange(len(DIRECTIONS))
+        super().__init__(environment, params, seed)
+        
+    def initialize_ants(self):
+        """Reservar los arreglos de la colonia"""
+        num_ants = self.params.num_ants
+        num_cells = self.env.rows * self.env.cols
+        
+        self.ants = []
+        self.positions = np.zeros(num_ants, dtype=np.int64)
+        self.costs = np.zeros(num_ants)
+        self.status = np.zeros(num_ants, dtype=np.int8)
+        self.visited = np.zeros((num_ants, num_cells), dtype=bool)
+        self.paths = np.zeros((num_ants, min(num_cells, PATHS_INITIAL_WIDTH)), dtype=np.int32)
+        self.path_lengths = np.zeros(num_ants, dtype=np.int64)
+        self.backtracks = np.zeros(num_ants, dtype=np.int64)
+        self.dead_end = np.zeros(num_ants, dtype=bool)
+        self._reset_ants()
+        
+    def _reset_ants(self):
+        """Devolver toda la colonia al nido"""
+        start = self._start_cell()
+        
+        self.positions.fill(start)
+        self.costs.fill(0.0)
+        self.status.fill(ANT_ACTIVE)
+        self.visited.fill(False)
+        self.visited[:, start] = True
+        self.paths[:, 0] = start
+        self.path_lengths.fill(1)
+        self.backtracks.fill(0)
+        self.dead_end.fill(False)
+        self._active = np.arange(self.status.size)
+        
+    def move_all_ants_one_step(self):
+        """
+        Mover todas las hormigas activas un paso de forma vectorizada.
+        
+        Solo se procesan las hormigas del índice de activas, que se
+        compacta al final de cada paso.
+        
+        Returns:
+            True si al menos una hormiga se movió
+        """
+        active = self._active
+        if active.size == 0:
+            return False
+        moved = self._advance(active)
+        self._active = active[self.status[active] == ANT_ACTIVE]
+        return moved
+        
+    def _advance(self, active):
+        """Avanzar un paso a las hormigas indicadas (índices de activas)"""
+        env = self.env
+        
+        # Hormigas que ya están en el objetivo
+        end = self._end_cell()
+        at_end = self.positions[active] == end
+        if at_end.any():
+            self.status[active[at_end]] = ANT_REACHED
+            active = active[~at_end]
+            if active.size == 0:
+                return False
+                
+        # Vecinos candidatos desde la tabla CSR (hormigas x 8 ranuras)
+        indptr, indices, move_costs = env.get_adjacency()
+        if indices.size == 0:
+            self.status[active] = ANT_STUCK
+            return False
+        positions = self.positions[active]
+        first = indptr[positions]
+        degree = indptr[positions + 1] - first
+        valid = self._slots < degree[:, None]
+        slots = np.where(valid, first[:, None] + self._slots, 0)
+        candidates = indices[slots]
+        candidate_costs = move_costs[slots]
+        valid &= ~self.visited[active[:, None], candidates]
+        
+        # Hormigas sin vecinos disponibles retroceden o quedan atascadas
+        stuck = ~valid.any(axis=1)
+        if stuck.any():
+            backed = self._backtrack(active[stuck])
+            active = active[~stuck]
+            if active.size == 0:
+                return backed
+            candidates = candidates[~stuck]
+            candidate_costs = candidate_costs[~stuck]
+            valid = valid[~stuck]
+            
+        # Fórmula ACO: τ^α * η^β
+        pheromone = env.pheromones.reshape(-1)[candidates]
+        heuristic = self.get_heuristic_weights()[candidates]
+        weights = (pheromone ** self.params.alpha) * heuristic
+        weights = np.where(valid, weights, 0.0)
+        
+        # Si todos los pesos son cero, elegir uniformemente entre los válidos
+        cumulative = np.cumsum(weights, axis=1)
+        zero = cumulative[:, -1] == 0
+        if zero.any():
+            weights[zero] = valid[zero]
+            cumulative[zero] = np.cumsum(weights[zero], axis=1)
+            
+        # Selección por ruleta para todas las hormigas a la vez. El total
+        # es la última suma acumulada (la misma con la que se compara) y
+        # la elección no pasa de la última ranura con peso: un redondeo de
+        # r hacia el total no puede caer en una ranura de peso cero
+        r = self.rng.random(active.size) * cumulative[:, -1]
+        choice = (cumulative <= r[:, None]).sum(axis=1)
+        last = len(DIRECTIONS) - 1 - np.argmax(weights[:, ::-1] > 0, axis=1)
+        choice = np.minimum(choice, last)
+        
+        picked = np.arange(active.size)
+        new_positions = candidates[picked, choice]
+        
+        # Mover hormigas
+        self.positions[active] = new_positions
+        self.costs[active] += candidate_costs[picked, choice]
+        self.visited[active, new_positions] = True
+        lengths = self.path_lengths[active]
+        if lengths.max() >= self.paths.shape[1]:
+            self._grow_paths()
+        self.paths[active, lengths] = new_positions
+        self.path_lengths[active] += 1
+        self.status[active[new_positions == end]] = ANT_REACHED
+        self.ant_steps += active.size
+        
+        return True
+    
+    def _grow_paths(self):
+        """Duplicar el ancho del buffer de caminos (sin pasar de las celdas)"""
+        num_ants, width = self.paths.shape
+        grown = np.zeros((num_ants, min(2 * width, self.env.rows * self.env.cols)),
+                         dtype=self.paths.dtype)
+        grown[:, :width] = self.paths
+        self.paths = grown
+        
+    def _backtrack(self, ants):
+        """
+        Retroceder una celda a las hormigas atascadas con presupuesto.
+        
+        Las que no tienen presupuesto (o siguen en el nido) quedan
+        atascadas.
+        
+        Returns:
+            True si alguna hormiga retrocedió
+        """
+        self.dead_end[ants] = True
+        can = (self.backtracks[ants] < self.params.backtrack_budget) & (self.path_lengths[ants] > 1)
+        self.status[ants[~can]] = ANT_STUCK
+        ants = ants[can]
+        if ants.size == 0:
+            return False
+            
+        left = self.positions[ants]
+        self.path_lengths[ants] -= 1
+        previous = self.paths[ants, self.path_lengths[ants] - 1]
+        diagonal = ((left // self.env.cols != previous // self.env.cols) &
+                    (left % self.env.cols != previous % self.env.cols))
+        self.costs[ants] -= np.where(diagonal, COST_DIAGONAL, COST_STRAIGHT)
+        self.positions[ants] = previous
+        self.backtracks[ants] += 1
+        self.ant_steps += ants.size
+        return True
+        
+    def all_ants_finished(self):
+        """Verificar si todas las hormigas terminaron"""
+        return self._active.size == 0
+    
+    def completed_tours(self):
+        """Obtener los caminos de las hormigas que llegaron al objetivo"""
+        reached = np.flatnonzero(self.status == ANT_REACHED)
+        lengths = self.path_lengths[reached]
+        
+        # Fila y posición dentro del camino de cada celda, sin recorrer
+        # la parte vacía de los buffers
+        rows = np.repeat(reached, lengths)
+        starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        offsets = np.arange(rows.size) - starts
+        return self.paths[rows, offsets], lengths, self.costs[reached]
+        
+    def ant_states(self):
+        """Posición y estado de cada hormiga como arreglos nuevos"""
+        return self.positions.copy(), self.status.copy()
+        
+    def _colony_counts(self):
+        """Obtener (hormigas que llegaron, total de hormigas)"""
+        return int((self.status == ANT_REACHED).sum()), len(self.status)
+        
+    def _dead_end_count(self):
+        """Hormigas de la iteración actual que llegaron a un callejón sin salida"""
+        return int(self.dead_end.sum())
+
+
+# Estado de cada proceso trabajador del motor paralelo
+_worker_state = {}
+
+
+def _attach_shared_array(name, shape, dtype):
+    """Abrir un bloque de memoria compartida como arreglo NumPy"""
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _init_worker(grid_name, pheromone_name, rows, cols):
+    """Inicializar un proceso trabajador sobre la memoria compartida"""
+    from environment import Environment
+    
+    grid_block, grid = _attach_shared_array(grid_name, (rows, cols), np.int64)
+    pher_block, pheromones = _attach_shared_array(pheromone_name, (rows, cols), np.float64)
+    
+    env = Environment(rows, cols)
+    env.grid = grid
+    env.pheromones = pheromones
+    
+    _worker_state.clear()
+    _worker_state.update(
+        blocks=(grid_block, pher_block), env=env, version=None, solvers={}
+    )
+
+
+def _construct_chunk(task):
+    """
+    Construir los caminos de un grupo de hormigas en un proceso trabajador.
+    
+    Lee la grilla y las feromonas directamente de la memoria compartida;
+    solo devuelve los caminos completados.
+    """
+    version, start, end, alpha, beta, backtrack_budget, num_ants, seed, max_steps = task
+    env = _worker_state['env']
+    
+    # Sincronizar entorno con el proceso principal
+    if version != _worker_state['version']:
+        env._invalidate()
+        _worker_state['version'] = version
+    env.start = start
+    if env.end != end:
+        env.end = end
+        env._distance_field = None
+        
+    solvers = _worker_state['solvers']
+    if num_ants not in solvers:
+        params = ACOParams()
+        params.num_ants = num_ants
+        solvers[num_ants] = VectorizedACOSolver(env, params)
+    solver = solvers[num_ants]
+    solver.params.alpha = alpha
+    solver.params.beta = beta
+    solver.params.backtrack_budget = backtrack_budget
+    solver.rng = np.random.default_rng(seed)
+    solver.ant_steps = 0
+    solver._reset_ants()
+    
+    steps = 0
+    while not solver.all_ants_finished() and steps < max_steps:
+        solver.move_all_ants_one_step()
+        steps += 1
+        
+    cells, lengths, costs = solver.completed_tours()
+    return cells.astype(np.int32), lengths, costs, solver.ant_steps, solver._dead_end_count()
+
+
+class ParallelACOSolver(ACOSolver):
+    """
+    Motor ACO que reparte la colonia entre varios procesos.
+    
+    La construcción de caminos dentro de una iteración es independiente
+    para cada hormiga: solo lee las feromonas. La grilla y la matriz de
+    feromonas viven en multiprocessing.shared_memory, cada proceso
+    construye los caminos de su grupo con el motor vectorizado y el
+    proceso principal evapora y deposita con todos los resultados.
+    
+    Cada grupo recibe en cada iteración un flujo aleatorio derivado de la
+    semilla, así que el resultado no depende de qué proceso lo ejecute.
+    Llamar a close() (o usar el solver como context manager) para liberar
+    los procesos y la memoria compartida.
+    """
+    
+    def __init__(self, environment, params=None, seed=None, workers=None):
+        if not environment.dense:
+            raise ValueError("El motor paralelo necesita un entorno denso; use el motor 'ants'")
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = None
+        self._blocks = []
+        self._synced_version = None
+        self._tours = None
+        self._dead_ends = 0
+        super().__init__(environment, params, seed)
+        
+    def _start_pool(self):
+        """Crear la memoria compartida y el pool de procesos"""
+        env = self.env
+        grid_block = shared_memory.SharedMemory(create=True, size=env.rows * env.cols * 8)
+        pher_block = shared_memory.SharedMemory(create=True, size=env.rows * env.cols * 8)
+        self._blocks = [grid_block, pher_block]
+        self._shared_grid = np.ndarray((env.rows, env.cols), dtype=np.int64, buffer=grid_block.buf)
+        self._shared_pheromones = np.ndarray((env.rows, env.cols), dtype=np.float64,
+                                             buffer=pher_block.buf)
+        self._pool = Pool(
+            self.workers, initializer=_init_worker,
+            initargs=(grid_block.name, pher_block.name, env.rows, env.cols),
+        )
+        
+    def _sync_shared(self):
+        """Llevar grilla y feromonas del entorno a la memoria compartida"""
+        env = self.env
+        if self._pool is not None and self._shared_grid.shape != (env.rows, env.cols):
+            # set_grid cambió el tamaño: bloques y procesos nuevos
+            self.close()
+        if self._pool is None:
+            self._start_pool()
+        if self._synced_version != self.env.version:
+            np.copyto(self._shared_grid, self.env.grid)
+            self._synced_version = self.env.version
+        if self.env.pheromones is not self._shared_pheromones:
+            np.copyto(self._shared_pheromones, self.env.pheromones)
+            self.env.pheromones = self._shared_pheromones
+            
+    def close(self):
+        """Terminar los procesos y liberar la memoria compartida"""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+        if self._blocks:
+            # El entorno conserva una copia privada de las feromonas
+            if self.env.pheromones is self._shared_pheromones:
+                self.env.pheromones = self._shared_pheromones.copy()
+            self._shared_grid = self._shared_pheromones = None
+            for block in self._blocks:
+                block.close()
+                block.unlink()
+            self._blocks = []
+            self._synced_version = None
+            
+    def _chunk_sizes(self):
+        """Repartir las hormigas en grupos lo más parejos posible"""
+        groups = min(self.workers, self.params.num_ants)
+        base, extra = divmod(self.params.num_ants, groups)
+        return [base + (1 if i < extra else 0) for i in range(groups)]
+        
+    def initialize_ants(self):
+        """La colonia vive en los procesos; aquí solo se reinicia el estado"""
+        self.ants = []
+        self._reset_ants()
+        
+    def _reset_ants(self):
+        """Descartar los caminos de la iteración anterior"""
+        self._tours = None
+        self._dead_ends = 0
+        
+    def move_all_ants_one_step(self):
+        """
+        Construir en paralelo los caminos completos de toda la colonia.
+        
+        Returns:
+            True si al menos una hormiga se movió
+        """
+        self._sync_shared()
+        env = self.env
+        max_steps = env.rows * env.cols * 2
+        sizes = self._chunk_sizes()
+        seeds = self._seed_root.spawn(len(sizes))
+        tasks = [
+            (env.version, env.start, env.end, self.params.alpha, self.params.beta,
+             self.params.backtrack_budget, size, seed, max_steps)
+            for size, seed in zip(sizes, seeds)
+        ]
+        results = self._pool.map(_construct_chunk, tasks)
+        
+        self._tours = (
+            np.concatenate([r[0] for r in results]).astype(np.int64),
+            np.concatenate([r[1] for r in results]),
+            np.concatenate([r[2] for r in results]),
+        )
+        moved = sum(r[3] for r in results)
+        self._dead_ends = sum(r[4] for r in results)
+        self.ant_steps += moved
+        return moved > 0
+        
+    def all_ants_finished(self):
+        """La colonia termina en cuanto se construyen los caminos"""
+        return self._tours is not None
+        
+    def update_pheromones(self):
+        """Evaporar y depositar con los caminos de todos los procesos"""
+        self._sync_shared()
+        super().update_pheromones()
+        
+    def completed_tours(self):
+        """Obtener los caminos devueltos por los procesos"""
+        if self._tours is None:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+        return self._tours
+        
+    def _colony_counts(self):
+        """Obtener (hormigas que llegaron, total de hormigas)"""
+        reached = self._tours[1].size if self._tours is not None else 0
+        return reached, self.params.num_ants
+        
+    def _dead_end_count(self):
+        """Hormigas de la iteración que llegaron a un callejón sin salida"""
+        return self._dead_ends
+
+
+# Motores disponibles para construir soluciones
+ENGINES = {
+    'ants': ACOSolver,
+    'vectorized': VectorizedACOSolver,
+    'parallel': ParallelACOSolver,
+}
+
+
+def create_solver(environment, params=None, engine='ants', seed=None, **options):
+    """
+    Crear un solver ACO con el motor indicado.
+    
+    engine puede ser 'ants', 'vectorized' o 'parallel'; options se pasan
+    al constructor del motor (por ejemplo workers=8 para 'parallel').
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Motor desconocido: {engine!r}. Opciones: {', '.join(ENGINES)}")
+    return ENGINES[engine](environment, params, seed, **options)
@@ -0,0 +1,207 @@
+"""
+Benchmarks del Simulador ACO
+Universidad Nacional de Chimborazo - Metaheurísticas
+
+Mide el rendimiento de ACOSolver en todos los escenarios de
+scenarios.SCENARIOS, con varios tamaños de grilla y de colonia.
+
+Métricas por caso:
+    ant_steps_per_sec: Pasos de hormiga por segundo
+    iterations_per_sec: Iteraciones por segundo
+    time_to_first_solution: Segundos hasta la primera ruta válida
+    time_to_best: Segundos hasta la última mejora del mejor costo
+    peak_memory_mb: Memoria máxima reservada (tracemalloc) en una iteración
+
+Los resultados se guardan en JSON para compararlos entre versiones:
+    python -m aco bench --output actual.json
+    python -m aco compare base.json actual.json --threshold 0.1
+"""
+
+import json
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+
+from config import ACOParams, GRID_ROWS, GRID_COLS
+from environment import Environment
+from aco_algorithm import create_solver
+from scenarios import SCENARIOS, load_scenario
+
+
+# Configuración por defecto: desde la grilla estándar hasta 500x500
+DEFAULT_SIZES = [(GRID_ROWS, GRID_COLS), (100, 100), (250, 250), (500, 500)]
+DEFAULT_COLONIES = [10, 30, 100]
+DEFAULT_ENGINES = ['ants', 'vectorized']
+
+# Métricas donde un valor mayor es mejor; en el resto, menor es mejor
+HIGHER_IS_BETTER = ('ant_steps_per_sec', 'iterations_per_sec')
+COMPARED_METRICS = HIGHER_IS_BETTER + ('time_to_first_solution', 'time_to_best', 'peak_memory_mb')
+
+
+def _build_solver(scenario, rows, cols, num_ants, engine, seed, iterations):
+    """Crear entorno y solver listos para ejecutar"""
+    env = Environment(rows, cols)
+    load_scenario(env, scenario, seed=seed)
+    
+    params = ACOParams()
+    params.num_ants = num_ants
+    params.max_iterations = iterations
+    
+    solver = create_solver(env, params, engine, seed=seed)
+    solver.reset()
+    return solver
+
+
+def benchmark_case(scenario, rows, cols, num_ants, engine='vectorized', iterations=5, seed=0):
+    """
+    Medir un caso (escenario, tamaño, colonia, motor).
+    
+    La corrida cronometrada se hace sin tracemalloc; la memoria máxima se
+    mide aparte con una iteración bajo tracemalloc para no distorsionar
+    los tiempos.
+    
+    Returns:
+        Diccionario con la configuración y las métricas del caso
+    """
+    time_to_first = None
+    time_to_best = None
+    best_cost = float('inf')
+    
+    with _build_solver(scenario, rows, cols, num_ants, engine, seed, iterations) as solver:
+        start = time.perf_counter()
+        while not solver.completed:
+            solver.run_iteration()
+            elapsed = time.perf_counter() - start
+            if solver.best_path and time_to_first is None:
+                time_to_first = elapsed
+            if solver.best_cost < best_cost:
+                best_cost = solver.best_cost
+                time_to_best = elapsed
+        total = time.perf_counter() - start
+        
+    # Memoria máxima de construir el solver y ejecutar una iteración
+    tracemalloc.start()
+    with _build_solver(scenario, rows, cols, num_ants, engine, seed, 1) as probe:
+        probe.run_iteration()
+        _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    return {
+        'scenario': scenario,
+        'scenario_name': SCENARIOS[scenario][0],
+        'rows': rows,
+        'cols': cols,
+        'num_ants': num_ants,
+        'engine': engine,
+        'iterations': solver.iteration,
+        'seed': seed,
+        'wall_time': total,
+        'ant_steps': solver.ant_steps,
+        'ant_steps_per_sec': solver.ant_steps / total if total > 0 else None,
+        'iterations_per_sec': solver.iteration / total if total > 0 else None,
+        'time_to_first_solution': time_to_first,
+        'time_to_best': time_to_best,
+        'best_cost': best_cost if best_cost != float('inf') else None,
+        'peak_memory_mb': peak / 2**20,
+    }
+
+
+def run_benchmarks(scenarios=None, sizes=None, colonies=None, engines=None,
+                   iterations=5, seed=0, progress=None):
+    """
+    Ejecutar la matriz completa de benchmarks.
+    
+    Args:
+        scenarios: Índices de escenarios (por defecto todos)
+        sizes: Lista de tuplas (filas, columnas)
+        colonies: Lista de tamaños de colonia
+        engines: Lista de motores ('ants', 'vectorized', 'parallel')
+        progress: Función opcional llamada con cada resultado
+        
+    Returns:
+        Diccionario con metadatos y la lista de resultados
+    """
+    scenarios = range(len(SCENARIOS)) if scenarios is None else scenarios
+    sizes = sizes or DEFAULT_SIZES
+    colonies = colonies or DEFAULT_COLONIES
+    engines = engines or DEFAULT_ENGINES
+    
+    results = []
+    for engine in engines:
+        for rows, cols in sizes:
+            for num_ants in colonies:
+                for scenario in scenarios:
+                    result = benchmark_case(scenario, rows, cols, num_ants,
+                                            engine, iterations, seed)
+                    results.append(result)
+                    if progress:
+                        progress(result)
+                        
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'iterations': iterations,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+def _case_key(result):
+    """Clave que identifica un caso para comparar entre corridas"""
+    return (result['scenario'], result['rows'], result['cols'],
+            result['num_ants'], result['engine'])
+
+
+def compare_results(baseline, current, threshold=0.1):
+    """
+    Comparar dos corridas de benchmarks.
+    
+    Un caso es una regresión si alguna métrica empeora más que threshold
+    (fracción relativa, 0.1 = 10%) respecto a la línea base.
+    
+    Returns:
+        Lista de regresiones, cada una un diccionario con el caso,
+        la métrica, ambos valores y el cambio relativo
+    """
+    base_by_key = {_case_key(r): r for r in baseline['results']}
+    regressions = []
+    
+    for result in current['results']:
+        base = base_by_key.get(_case_key(result))
+        if base is None:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = base.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            if worse > threshold:
+                regressions.append({
+                    'case': dict(zip(('scenario', 'rows', 'cols', 'num_ants', 'engine'),
+                                     _case_key(result))),
+                    'metric': metric,
+                    'baseline': old,
+                    'current': new,
+                    'change': change,
+                })
+                
+    return regressions
+
+
+def load_results(path):
+    """Leer resultados de benchmarks desde un archivo JSON"""
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_results(results, path):
+    """Guardar resultados de benchmarks en un archivo JSON"""
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
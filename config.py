@@ -68,6 +68,12 @@ class ACOParams:
         self.q = 100                 # Cantidad de feromona depositada
         self.initial_pheromone = 0.1 # Feromona inicial
         self.max_iterations = 500    # Máximo de iteraciones
+        self.backtrack_budget = 0    # Retrocesos por hormiga al quedar atascada (0 = sin retroceso)
+        
+        # Criterios de convergencia (None = desactivado)
+        self.stagnation_iterations = None  # Iteraciones seguidas sin mejora
+        self.entropy_threshold = None      # Entropía normalizada mínima de feromonas (0-1)
+        self.route_share_threshold = None  # Fracción de hormigas en la misma ruta (0-1)
         
     def reset(self):
         """Resetear a valores por defecto"""
@@ -3,10 +3,77 @@ Entorno de Simulación para ACO
 Universidad Nacional de Chimborazo - Metaheurísticas
 """
 
+import heapq
+import math
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+
 import numpy as np
 from config import GRID_ROWS, GRID_COLS, DIRECTIONS, COST_STRAIGHT, COST_DIAGONAL
 
 
+def line_cells(row1, col1, row2, col2):
+    """
+    Celdas de un segmento según el algoritmo de Bresenham, sin bucles.
+    
+    La fila (o columna) del paso k sale de contar cuántas veces el error
+    acumulado dx/2 - k*dy se hizo negativo, en aritmética entera.
+    
+    Returns:
+        Tupla (rows, cols) de arreglos, incluidos ambos extremos
+    """
+    dx = abs(col2 - col1)
+    dy = abs(row2 - row1)
+    sx = 1 if col1 < col2 else -1
+    sy = 1 if row1 < row2 else -1
+    
+    # Eje principal (avanza una celda por paso) y eje secundario
+    major, minor = (dx, dy) if dx > dy else (dy, dx)
+    steps = np.arange(major, dtype=np.int64)
+    # Correcciones tras k pasos: max(0, ceil((2*k*minor - major) / (2*major)))
+    corrections = np.maximum(0, -((major - 2 * steps * minor) // max(2 * major, 1)))
+    
+    if dx > dy:
+        rows, cols = row1 + sy * corrections, col1 + sx * steps
+    else:
+        rows, cols = row1 + sy * steps, col1 + sx * corrections
+    return np.append(rows, row2), np.append(cols, col2)
+
+
+def polygon_cells(vertices, fill=True):
+    """
+    Celdas cubiertas por un polígono de vértices (fila, columna).
+    
+    El contorno se traza con line_cells; el interior se rellena con la
+    regla par-impar evaluada para todas las celdas de la caja que lo
+    contiene a la vez.
+    
+    Returns:
+        Tupla (rows, cols) de arreglos (pueden repetirse celdas)
+    """
+    vertices = np.asarray(vertices, dtype=np.int64).reshape(-1, 2)
+    edges = list(zip(vertices.tolist(), np.roll(vertices, -1, axis=0).tolist()))
+    outline = [line_cells(r1, c1, r2, c2) for (r1, c1), (r2, c2) in edges]
+    rows = [line[0] for line in outline]
+    cols = [line[1] for line in outline]
+    
+    if fill and len(vertices) >= 3:
+        (r0, c0), (r1, c1) = vertices.min(axis=0), vertices.max(axis=0)
+        box_rows, box_cols = np.mgrid[r0:r1 + 1, c0:c1 + 1]
+        inside = np.zeros(box_rows.shape, dtype=bool)
+        for (ri, ci), (rj, cj) in edges:
+            if ri == rj:
+                continue
+            crosses = (ri > box_rows) != (rj > box_rows)
+            inside ^= crosses & (box_cols < (cj - ci) * (box_rows - ri) / (rj - ri) + ci)
+        rows.append(box_rows[inside])
+        cols.append(box_cols[inside])
+        
+    return np.concatenate(rows), np.concatenate(cols)
+
+
 class Environment:
     """
     Representa el entorno 2D donde las hormigas buscan rutas.
@@ -16,8 +83,21 @@ class Environment:
         start: Tupla (fila, columna) del punto de inicio (nido)
         end: Tupla (fila, columna) del objetivo (comida)
         pheromones: Matriz 2D con niveles de feromona
+    
+    Las celdas también se identifican por su índice plano
+    (fila * cols + columna), que es el que usa la tabla de adyacencia.
+    
+    Las componentes conexas de celdas libres se mantienen al editar
+    obstáculos de a uno, de modo que consultar si dos celdas se conectan
+    (path_exists, connected) no recorre la grilla.
     """
     
+    # Grilla y feromonas completas en memoria (ver MappedEnvironment)
+    dense = True
+    
+    # Vecindario de una celda en orden circular (para detectar cortes)
+    _RING = ((-1, -1), (-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1))
+    
     def __init__(self, rows=GRID_ROWS, cols=GRID_COLS):
         self.rows = rows
         self.cols = cols
@@ -25,11 +105,19 @@ class Environment:
         self.start = (1, 1)
         self.end = (rows - 2, cols - 2)
         self.pheromones = None
+        self.version = 0  # Se incrementa con cada cambio de obstáculos
+        self._adjacency = None
+        self._distance_field = None  # Depende solo de self.end
+        self._labels = None  # Componente de cada celda libre (-1 = obstáculo)
+        self._label_parent = None  # Unión de componentes fusionadas
         self.reset_pheromones()
         
     def reset_pheromones(self, initial_value=0.1):
-        """Inicializar matriz de feromonas"""
-        self.pheromones = np.full((self.rows, self.cols), initial_value)
+        """Inicializar matriz de feromonas (reutiliza la matriz si ya existe)"""
+        if self.pheromones is not None and self.pheromones.shape == (self.rows, self.cols):
+            self.pheromones.fill(initial_value)
+        else:
+            self.pheromones = np.full((self.rows, self.cols), initial_value)
         
     def is_valid_cell(self, row, col):
         """Verificar si una celda es válida y transitable"""
@@ -37,6 +125,82 @@ class Environment:
             return self.grid[row, col] == 0
         return False
     
+    def _invalidate(self, components=True):
+        """
+        Descartar estructuras derivadas de la grilla tras un cambio.
+        
+        components=False conserva las componentes conexas cuando quien
+        llama ya las actualizó.
+        """
+        self.version += 1
+        self._adjacency = None
+        if components:
+            self._labels = None
+            self._label_parent = None
+        
+    def get_adjacency(self):
+        """
+        Obtener la tabla de adyacencia comprimida (formato CSR).
+        
+        Los vecinos transitables de la celda i son
+        indices[indptr[i]:indptr[i + 1]], con sus costos de movimiento en
+        costs[indptr[i]:indptr[i + 1]], en el orden de DIRECTIONS.
+        La tabla se construye una sola vez y se reconstruye solo cuando
+        cambian los obstáculos.
+        
+        Returns:
+            Tupla (indptr, indices, costs)
+        """
+        if self._adjacency is None:
+            self._adjacency = self._build_adjacency()
+        return self._adjacency
+    
+    def _build_adjacency(self, row_range=None, col_range=None):
+        """
+        Construir la tabla CSR de vecinos.
+        
+        Por defecto cubre toda la grilla; row_range y col_range (inicio,
+        fin) limitan la tabla a una ventana, numerada fila por fila dentro
+        de ella. Los vecinos siempre se dan como índices planos globales.
+        """
+        r0, r1 = row_range or (0, self.rows)
+        c0, c1 = col_range or (0, self.cols)
+        # Ventana con un borde de una celda para ver a los vecinos
+        h0, g0 = max(r0 - 1, 0), max(c0 - 1, 0)
+        free = np.asarray(self.grid[h0:r1 + 1, g0:c1 + 1]) == 0
+        rows, cols = np.divmod(np.arange((r1 - r0) * (c1 - c0)), c1 - c0)
+        rows += r0
+        cols += c0
+        
+        table = np.full((rows.size, len(DIRECTIONS)), -1, dtype=np.int64)
+        move_costs = np.empty(len(DIRECTIONS))
+        for i, (dr, dc) in enumerate(DIRECTIONS):
+            new_rows, new_cols = rows + dr, cols + dc
+            inside = ((new_rows >= 0) & (new_rows < self.rows) &
+                      (new_cols >= 0) & (new_cols < self.cols))
+            inside[inside] &= free[new_rows[inside] - h0, new_cols[inside] - g0]
+            table[inside, i] = (new_rows * self.cols + new_cols)[inside]
+            # Costo diagonal o recto
+            move_costs[i] = COST_DIAGONAL if abs(dr) + abs(dc) == 2 else COST_STRAIGHT
+            
+        mask = table >= 0
+        indptr = np.zeros(rows.size + 1, dtype=np.int64)
+        np.cumsum(mask.sum(axis=1), out=indptr[1:])
+        indices = table[mask]
+        costs = np.broadcast_to(move_costs, table.shape)[mask]
+        return indptr, indices, costs
+    
+    def neighbor_cells(self, cell):
+        """
+        Obtener los vecinos transitables de una celda por índice plano.
+        
+        Returns:
+            Tupla (indices, costs) de arreglos NumPy, en el orden de DIRECTIONS
+        """
+        indptr, indices, costs = self.get_adjacency()
+        lo, hi = indptr[cell], indptr[cell + 1]
+        return indices[lo:hi], costs[lo:hi]
+        
     def get_neighbors(self, row, col):
         """
         Obtener vecinos válidos de una celda.
@@ -44,68 +208,280 @@ class Environment:
         Returns:
             Lista de tuplas (fila, columna, costo)
         """
-        neighbors = []
-        for i, (dr, dc) in enumerate(DIRECTIONS):
-            new_row, new_col = row + dr, col + dc
-            if self.is_valid_cell(new_row, new_col):
-                # Costo diagonal o recto
-                cost = COST_DIAGONAL if abs(dr) + abs(dc) == 2 else COST_STRAIGHT
-                neighbors.append((new_row, new_col, cost))
-        return neighbors
+        indices, costs = self.neighbor_cells(row * self.cols + col)
+        return [(n // self.cols, n % self.cols, cost)
+                for n, cost in zip(indices.tolist(), costs.tolist())]
     
     def get_heuristic(self, row, col):
         """
         Calcular heurística (distancia al objetivo).
         Usa distancia euclidiana.
         """
-        return np.sqrt((row - self.end[0])**2 + (col - self.end[1])**2)
+        return self.get_distance_field()[row, col]
+    
+    def get_distance_field(self):
+        """
+        Obtener la matriz de distancias euclidianas de cada celda al objetivo.
+        
+        Se calcula una sola vez y se recalcula solo cuando cambia el objetivo.
+        """
+        if self._distance_field is None:
+            rows, cols = np.indices((self.rows, self.cols))
+            self._distance_field = np.sqrt((rows - self.end[0])**2 + (cols - self.end[1])**2)
+        return self._distance_field
     
     def add_obstacle(self, row, col):
         """Agregar un obstáculo en una celda"""
         if (row, col) != self.start and (row, col) != self.end:
-            self.grid[row, col] = 1
+            if self.grid[row, col] != 1:
+                self.grid[row, col] = 1
+                self._invalidate(components=not self._block_cell(row, col))
             
     def remove_obstacle(self, row, col):
         """Remover un obstáculo de una celda"""
-        self.grid[row, col] = 0
+        if self.grid[row, col] != 0:
+            self.grid[row, col] = 0
+            self._invalidate(components=not self._free_cell(row, col))
+            
+    def _ring_free(self, row, col):
+        """Celdas libres alrededor de (row, col), en el orden de _RING"""
+        free = []
+        for dr, dc in self._RING:
+            r, c = row + dr, col + dc
+            free.append(0 <= r < self.rows and 0 <= c < self.cols and self.grid[r, c] == 0)
+        return free
         
-    def add_obstacle_rect(self, row1, col1, row2, col2):
-        """Agregar un rectángulo de obstáculos"""
-        for r in range(min(row1, row2), max(row1, row2) + 1):
-            for c in range(min(col1, col2), max(col1, col2) + 1):
-                self.add_obstacle(r, c)
+    def _block_cell(self, row, col):
+        """
+        Actualizar las componentes tras bloquear una celda libre.
+        
+        Si los vecinos libres de la celda siguen unidos entre sí sin pasar
+        por ella, la componente no se parte y basta con marcarla. Si no,
+        se devuelve False para que se vuelvan a etiquetar más tarde.
+        
+        Returns:
+            True si las componentes quedaron actualizadas
+        """
+        if self._labels is None:
+            return False
+            
+        free = self._ring_free(row, col)
+        # Grupos de vecinos unidos alrededor de la celda: dos posiciones
+        # consecutivas del anillo se tocan, y también dos laterales
+        # separadas por una esquina
+        group = list(range(8))
+        
+        def find(i):
+            while group[i] != i:
+                i = group[i]
+            return i
+            
+        for i in range(8):
+            for j in (i + 1, i + 2) if i % 2 else (i + 1,):
+                j %= 8
+                if free[i] and free[j]:
+                    group[find(j)] = find(i)
+                    
+        if len({find(i) for i in range(8) if free[i]}) > 1:
+            return False
+            
+        self._labels[row * self.cols + col] = -1
+        return True
+        
+    def _free_cell(self, row, col):
+        """
+        Actualizar las componentes tras liberar una celda.
+        
+        La celda se une a las componentes de sus vecinos libres, que
+        quedan fusionadas en una sola.
+        
+        Returns:
+            True si las componentes quedaron actualizadas
+        """
+        if self._labels is None:
+            return False
+            
+        roots = set()
+        for (dr, dc), free in zip(self._RING, self._ring_free(row, col)):
+            if free:
+                roots.add(self._find_label(self._labels[(row + dr) * self.cols + col + dc]))
                 
+        if roots:
+            root = min(roots)
+            for other in roots:
+                self._label_parent[other] = root
+        else:
+            root = len(self._label_parent)
+            self._label_parent.append(root)
+        self._labels[row * self.cols + col] = root
+        return True
+        
+    def _find_label(self, label):
+        """Componente representativa de una etiqueta (con compresión de caminos)"""
+        parent = self._label_parent
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]
+            label = parent[label]
+        return label
+        
+    def _label_components(self):
+        """
+        Etiquetar las componentes conexas de celdas libres sobre la tabla CSR.
+        
+        Cada ronda cuelga la raíz de cada arista de la raíz menor de su
+        vecino y luego acorta los punteros hasta que todas las celdas
+        apuntan a su raíz; basta con O(log n) rondas vectorizadas.
+        """
+        indptr, indices, _ = self.get_adjacency()
+        size = self.rows * self.cols
+        free = (self.grid == 0).reshape(-1)
+        # La tabla también lista vecinos de los obstáculos; se descartan
+        sources = np.repeat(np.arange(size), np.diff(indptr))
+        keep = free[sources]
+        sources, targets = sources[keep], indices[keep]
+        parent = np.arange(size)
+        
+        while True:
+            a, b = parent[sources], parent[targets]
+            differ = a != b
+            if not differ.any():
+                break
+            np.minimum.at(parent, np.maximum(a[differ], b[differ]),
+                          np.minimum(a[differ], b[differ]))
+            while True:
+                grand = parent[parent]
+                if np.array_equal(grand, parent):
+                    break
+                parent = grand
+                
+        roots, labels = np.unique(parent[free], return_inverse=True)
+        self._labels = np.full(size, -1, dtype=np.int64)
+        self._labels[free] = labels
+        self._label_parent = list(range(roots.size))
+        
+    def get_components(self):
+        """
+        Obtener la componente conexa de cada celda.
+        
+        Returns:
+            Matriz (rows, cols) con el número de componente de cada celda
+            libre y -1 en los obstáculos
+        """
+        if self._labels is None:
+            self._label_components()
+        roots = np.array([self._find_label(label) for label in range(len(self._label_parent))]
+                         + [-1])
+        return roots[self._labels].reshape(self.rows, self.cols)
+        
+    def connected(self, a, b):
+        """Verificar si dos celdas (row, col) libres están conectadas"""
+        if not (self.is_valid_cell(*a) and self.is_valid_cell(*b)):
+            return False
+        if self._labels is None:
+            self._label_components()
+        label_a = self._labels[a[0] * self.cols + a[1]]
+        label_b = self._labels[b[0] * self.cols + b[1]]
+        return self._find_label(label_a) == self._find_label(label_b)
+        
+    def _write_cells(self, index, value):
+        """
+        Escribir value en grid[index] de una sola vez.
+        
+        index es cualquier índice de NumPy (rebanadas, máscara o arreglos
+        de filas y columnas). Con value=1 el inicio y el objetivo no se
+        bloquean. Las estructuras derivadas se invalidan una sola vez y
+        solo si algo cambió.
+        
+        Returns:
+            True si la grilla cambió
+        """
+        if not np.any(self.grid[index] != value):
+            return False
+        protected = [(cell, self.grid[cell]) for cell in (self.start, self.end)] if value else []
+        self.grid[index] = value
+        for cell, previous in protected:
+            self.grid[cell] = previous
+        self._invalidate()
+        return True
+        
+    def _inside(self, rows, cols):
+        """Filtrar coordenadas fuera de la grilla"""
+        rows, cols = np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)
+        inside = (rows >= 0) & (rows < self.rows) & (cols >= 0) & (cols < self.cols)
+        return rows[inside], cols[inside]
+        
+    def set_cells(self, cells, value=1):
+        """
+        Marcar muchas celdas a la vez (value=1 obstáculo, 0 libre).
+        
+        cells es una secuencia de (fila, columna) o un arreglo (N, 2);
+        las celdas fuera de la grilla se ignoran.
+        
+        Returns:
+            True si la grilla cambió
+        """
+        cells = np.asarray(cells, dtype=np.int64).reshape(-1, 2)
+        return self._write_cells(self._inside(cells[:, 0], cells[:, 1]), value)
+        
+    def apply_mask(self, mask, value=1):
+        """
+        Marcar las celdas donde mask es True (value=1 obstáculo, 0 libre).
+        
+        mask es un arreglo booleano del tamaño de la grilla, por ejemplo
+        una capa de obstáculos de otro planificador.
+        
+        Returns:
+            True si la grilla cambió
+        """
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape != (self.rows, self.cols):
+            raise ValueError(f"La máscara {mask.shape} no coincide con la grilla "
+                             f"{(self.rows, self.cols)}")
+        return self._write_cells(mask, value)
+        
+    def add_obstacle_rect(self, row1, col1, row2, col2):
+        """Agregar un rectángulo de obstáculos (esquinas incluidas)"""
+        rows = slice(max(min(row1, row2), 0), max(row1, row2) + 1)
+        cols = slice(max(min(col1, col2), 0), max(col1, col2) + 1)
+        self._write_cells((rows, cols), 1)
+        
     def add_obstacle_line(self, row1, col1, row2, col2):
         """Agregar una línea de obstáculos usando algoritmo de Bresenham"""
-        dx = abs(col2 - col1)
-        dy = abs(row2 - row1)
-        x, y = col1, row1
-        sx = 1 if col1 < col2 else -1
-        sy = 1 if row1 < row2 else -1
-        
-        if dx > dy:
-            err = dx / 2
-            while x != col2:
-                self.add_obstacle(y, x)
-                err -= dy
-                if err < 0:
-                    y += sy
-                    err += dx
-                x += sx
-        else:
-            err = dy / 2
-            while y != row2:
-                self.add_obstacle(y, x)
-                err -= dx
-                if err < 0:
-                    x += sx
-                    err += dy
-                y += sy
-        self.add_obstacle(row2, col2)
+        self._write_cells(self._inside(*line_cells(row1, col1, row2, col2)), 1)
+        
+    def add_obstacle_polygon(self, vertices, fill=True):
+        """
+        Agregar un polígono de obstáculos.
+        
+        Args:
+            vertices: Secuencia de vértices (fila, columna)
+            fill: Rellenar el interior (False = solo el contorno)
+        """
+        rows, cols = polygon_cells(vertices, fill)
+        self._write_cells(self._inside(rows, cols), 1)
         
     def clear_obstacles(self):
-        """Limpiar todos los obstáculos"""
-        self.grid = np.zeros((self.rows, self.cols), dtype=int)
+        """Limpiar todos los obstáculos (en el lugar)"""
+        self.grid.fill(0)
+        self._invalidate()
+        
+    def set_grid(self, grid, start=None, end=None):
+        """
+        Reemplazar la grilla completa (0=libre, 1=obstáculo).
+        
+        El arreglo se usa tal cual, sin copiarlo (puede ser un np.memmap),
+        y el entorno toma su tamaño; las feromonas solo se reinician si el
+        tamaño cambia. start y end por defecto son las esquinas estándar
+        (1, 1) y (rows - 2, cols - 2).
+        """
+        self.rows, self.cols = grid.shape
+        self.grid = grid
+        self.start = tuple(start) if start is not None else (1, 1)
+        self.end = tuple(end) if end is not None else (self.rows - 2, self.cols - 2)
+        self._distance_field = None
+        self._invalidate()
+        if self.pheromones.shape != grid.shape:
+            self.reset_pheromones()
         
     def set_start(self, position):
         """Establecer punto de inicio (acepta tupla (row, col))"""
@@ -117,17 +493,33 @@ class Environment:
         """Establecer punto objetivo (acepta tupla (row, col))"""
         row, col = position
         if self.is_valid_cell(row, col) and (row, col) != self.start:
-            self.end = (row, col)
+            if (row, col) != self.end:
+                self.end = (row, col)
+                self._distance_field = None
             
+    def pheromone_values(self, cells):
+        """Obtener la feromona de muchas celdas (índices planos)"""
+        return self.pheromones.reshape(-1)[cells]
+        
     def update_pheromone(self, row, col, amount):
         """Actualizar feromona en una celda"""
         self.pheromones[row, col] += amount
         
+    def deposit_pheromones(self, cells, amounts):
+        """
+        Depositar feromona en muchas celdas a la vez (en el lugar).
+        
+        Args:
+            cells: Índices planos de las celdas (pueden repetirse)
+            amounts: Cantidad a depositar en cada celda, o un escalar
+        """
+        np.add.at(self.pheromones.reshape(-1), cells, amounts)
+        
     def evaporate_pheromones(self, evaporation_rate):
-        """Aplicar evaporación a todas las feromonas"""
-        self.pheromones *= (1 - evaporation_rate)
+        """Aplicar evaporación a todas las feromonas (en el lugar)"""
+        np.multiply(self.pheromones, 1 - evaporation_rate, out=self.pheromones)
         # Mantener un mínimo de feromona
-        self.pheromones = np.maximum(self.pheromones, 0.01)
+        np.maximum(self.pheromones, 0.01, out=self.pheromones)
         
     def get_pheromone(self, row, col):
         """Obtener nivel de feromona en una celda"""
@@ -137,34 +529,411 @@ class Environment:
         """Obtener el máximo nivel de feromona actual"""
         return np.max(self.pheromones)
     
-    def path_exists(self):
+    def get_mean_pheromone(self):
+        """Obtener el nivel promedio de feromona"""
+        return np.mean(self.pheromones)
+        
+    def pheromone_entropy(self):
         """
-        Verificar si existe un camino del inicio al fin usando BFS.
+        Entropía de Shannon normalizada (0-1) de las feromonas en celdas libres.
+        
+        Vale 1 con feromona uniforme y tiende a 0 cuando se concentra en
+        pocas celdas.
         """
-        from collections import deque
+        tau = self.pheromones[self.grid == 0]
+        total = tau.sum()
+        if tau.size < 2 or total <= 0:
+            return 0.0
+        p = tau[tau > 0] / total
+        return float(-(p * np.log(p)).sum() / np.log(tau.size))
         
-        visited = set()
-        queue = deque([self.start])
-        visited.add(self.start)
+    def pheromone_matrix(self, copy=True):
+        """Matriz de feromonas para dibujar (copy=False = la del entorno)"""
+        return self.pheromones.copy() if copy else self.pheromones
         
-        while queue:
-            current = queue.popleft()
-            if current == self.end:
-                return True
-                
-            for neighbor in self.get_neighbors(*current):
-                pos = (neighbor[0], neighbor[1])
-                if pos not in visited:
-                    visited.add(pos)
-                    queue.append(pos)
-                    
-        return False
+    def path_exists(self):
+        """
+        Verificar si existe un camino del inicio al fin.
+        
+        Compara las componentes conexas de ambos puntos, que solo se
+        recalculan por completo tras ediciones masivas.
+        """
+        return self.connected(self.start, self.end)
     
     def copy(self):
         """Crear una copia del entorno"""
         new_env = Environment(self.rows, self.cols)
         new_env.grid = self.grid.copy()
+        new_env._adjacency = self._adjacency
+        if self._labels is not None:
+            new_env._labels = self._labels.copy()
+            new_env._label_parent = list(self._label_parent)
         new_env.start = self.start
         new_env.end = self.end
         new_env.pheromones = self.pheromones.copy()
         return new_env
+
+
+class MappedEnvironment(Environment):
+    """
+    Entorno para mapas grandes con grilla y feromonas en disco (np.memmap).
+    
+    Los arreglos se guardan como grid.npy y pheromones.npy en directory y
+    el sistema operativo solo carga las páginas que se leen. El mapa se
+    divide en bloques de tile_size x tile_size celdas:
+    
+    - La tabla de vecinos se construye por bloque cuando una hormiga entra
+      en él; se conservan a lo sumo max_tiles bloques.
+    - La evaporación y el reinicio de feromonas se registran de forma
+      global y se aplican a cada bloque recién cuando se lee o se deposita
+      en él. Los bloques que nadie usó desde el último reinicio tienen
+      todos el mismo valor, que se calcula sin tocarlos: las estadísticas
+      (get_max_pheromone, get_mean_pheromone, pheromone_entropy) y
+      pheromone_matrix solo ponen al día los bloques usados. La propiedad
+      pheromones, flush y close aplican lo pendiente en todo el mapa.
+      
+    La interfaz es la de Environment (is_valid_cell, get_neighbors,
+    get_pheromone, path_exists...), así que ACOSolver funciona sin
+    cambios. Los motores 'vectorized' y 'parallel' necesitan un entorno
+    denso.
+    
+    Si directory ya contiene grid.npy se reabre el mapa guardado (rows y
+    cols se toman del archivo). Con directory=None se usa un directorio
+    temporal que se borra al llamar a close().
+    """
+    
+    dense = False
+    
+    def __init__(self, rows=GRID_ROWS, cols=GRID_COLS, directory=None,
+                 tile_size=128, max_tiles=128):
+        self._temporary = directory is None
+        self.directory = tempfile.mkdtemp(prefix='aco-map-') if directory is None else directory
+        os.makedirs(self.directory, exist_ok=True)
+        
+        grid_path = os.path.join(self.directory, 'grid.npy')
+        pheromone_path = os.path.join(self.directory, 'pheromones.npy')
+        reopened = os.path.exists(grid_path)
+        if reopened:
+            self.grid = np.lib.format.open_memmap(grid_path, mode='r+')
+            rows, cols = self.grid.shape
+        else:
+            self.grid = np.lib.format.open_memmap(grid_path, mode='w+', dtype=np.int8,
+                                                  shape=(rows, cols))
+        reopened = reopened and os.path.exists(pheromone_path)
+        if reopened:
+            self._pheromones = np.lib.format.open_memmap(pheromone_path, mode='r+')
+            reopened = self._pheromones.shape == (rows, cols)
+        if not reopened:
+            self._pheromones = np.lib.format.open_memmap(pheromone_path, mode='w+',
+                                                         dtype=np.float64, shape=(rows, cols))
+        self._flat_pheromones = self._pheromones.reshape(-1).view(np.ndarray)
+        
+        self.rows = rows
+        self.cols = cols
+        self.start = (1, 1)
+        self.end = (rows - 2, cols - 2)
+        self.version = 0
+        self._adjacency = None
+        self._distance_field = None
+        self._labels = None
+        self._label_parent = None
+        self._reachable = {}  # (a, b) -> bool, válido hasta el próximo cambio
+        self._free_count = None  # Celdas libres, hasta el próximo cambio
+        
+        # Bloques: tablas de vecinos en caché y estado de sus feromonas
+        self.tile_size = tile_size
+        self.max_tiles = max_tiles
+        self._tiles = OrderedDict()
+        tiles_shape = (-(-rows // tile_size), -(-cols // tile_size))
+        self._tile_epoch = np.zeros(tiles_shape, dtype=np.int64)
+        self._tile_evaporations = np.zeros(tiles_shape, dtype=np.int64)
+        self._tile_log_decay = np.zeros(tiles_shape)
+        
+        # Operaciones globales de feromona pendientes de aplicar
+        self._epoch = 0
+        self._initial_pheromone = 0.1
+        self._evaporations = 0
+        self._log_decay = 0.0
+        self._reset_evaporations = 0
+        self._reset_log_decay = 0.0
+        if not reopened:
+            self.reset_pheromones()
+            
+    @property
+    def pheromones(self):
+        """
+        Matriz de feromonas completa (aplica lo pendiente en todo el mapa).
+        
+        Para estadísticas o para dibujar, get_max_pheromone,
+        get_mean_pheromone, pheromone_entropy y pheromone_matrix evitan
+        ese costo.
+        """
+        self._sync_all()
+        return self._pheromones
+        
+    def reset_pheromones(self, initial_value=0.1):
+        """Reiniciar feromonas; cada bloque se rellena al usarlo"""
+        self._epoch += 1
+        self._initial_pheromone = initial_value
+        self._reset_evaporations = self._evaporations
+        self._reset_log_decay = self._log_decay
+        
+    def evaporate_pheromones(self, evaporation_rate):
+        """Registrar una evaporación; se aplica a cada bloque al usarlo"""
+        self._evaporations += 1
+        # Con ρ = 1 el factor es cero; se registra como uno despreciable
+        self._log_decay += math.log1p(-evaporation_rate) if evaporation_rate < 1 else -1000.0
+        
+    def _sync_tile(self, tile_row, tile_col):
+        """Aplicar el reinicio y las evaporaciones pendientes de un bloque"""
+        size = self.tile_size
+        block = self._pheromones[tile_row * size:(tile_row + 1) * size,
+                                 tile_col * size:(tile_col + 1) * size]
+        if self._tile_epoch[tile_row, tile_col] != self._epoch:
+            block.fill(self._initial_pheromone)
+            self._tile_epoch[tile_row, tile_col] = self._epoch
+            self._tile_evaporations[tile_row, tile_col] = self._reset_evaporations
+            self._tile_log_decay[tile_row, tile_col] = self._reset_log_decay
+        if self._tile_evaporations[tile_row, tile_col] != self._evaporations:
+            # k evaporaciones seguidas equivalen a un solo factor y un solo mínimo
+            factor = math.exp(self._log_decay - self._tile_log_decay[tile_row, tile_col])
+            np.multiply(block, factor, out=block)
+            np.maximum(block, 0.01, out=block)
+            self._tile_evaporations[tile_row, tile_col] = self._evaporations
+            self._tile_log_decay[tile_row, tile_col] = self._log_decay
+            
+    def _stale_tiles(self):
+        """Máscara de bloques con operaciones de feromona pendientes"""
+        return ((self._tile_epoch != self._epoch) |
+                (self._tile_evaporations != self._evaporations))
+                
+    def _sync_cells(self, cells):
+        """Poner al día los bloques que contienen las celdas (índices planos)"""
+        rows, cols = np.divmod(np.asarray(cells), self.cols)
+        tiles = np.unique((rows // self.tile_size) * self._tile_epoch.shape[1]
+                          + cols // self.tile_size)
+        stale = tiles[self._stale_tiles().reshape(-1)[tiles]]
+        for tile in stale.tolist():
+            self._sync_tile(*divmod(tile, self._tile_epoch.shape[1]))
+            
+    def _sync_all(self):
+        """Poner al día todos los bloques"""
+        for tile_row, tile_col in zip(*np.nonzero(self._stale_tiles())):
+            self._sync_tile(tile_row, tile_col)
+            
+    def _untouched_pheromone(self):
+        """Feromona (uniforme) de los bloques no usados desde el último reinicio"""
+        if self._evaporations == self._reset_evaporations:
+            return self._initial_pheromone
+        factor = math.exp(self._log_decay - self._reset_log_decay)
+        return max(self._initial_pheromone * factor, 0.01)
+        
+    def _touched_tiles(self):
+        """
+        Poner al día los bloques usados desde el último reinicio.
+        
+        Returns:
+            Lista de ventanas (filas, columnas) como rebanadas
+        """
+        size = self.tile_size
+        windows = []
+        for tile_row, tile_col in zip(*np.nonzero(self._tile_epoch == self._epoch)):
+            self._sync_tile(tile_row, tile_col)
+            windows.append((slice(tile_row * size, (tile_row + 1) * size),
+                            slice(tile_col * size, (tile_col + 1) * size)))
+        return windows
+        
+    def _count_free(self):
+        """Celdas libres del mapa (se recorre la grilla por bloques de filas)"""
+        if self._free_count is None:
+            self._free_count = sum(
+                int(np.count_nonzero(self.grid[row:row + self.tile_size] == 0))
+                for row in range(0, self.rows, self.tile_size)
+            )
+        return self._free_count
+        
+    def get_max_pheromone(self):
+        """Obtener el máximo nivel de feromona sin poner al día todo el mapa"""
+        windows = self._touched_tiles()
+        values = [self._pheromones[window].max() for window in windows]
+        if sum(self._pheromones[window].size for window in windows) < self.rows * self.cols:
+            values.append(self._untouched_pheromone())
+        return max(values)
+        
+    def get_mean_pheromone(self):
+        """Obtener el nivel promedio de feromona sin poner al día todo el mapa"""
+        total = 0.0
+        touched = 0
+        for window in self._touched_tiles():
+            block = self._pheromones[window]
+            total += block.sum()
+            touched += block.size
+        untouched = self.rows * self.cols - touched
+        return (total + untouched * self._untouched_pheromone()) / (self.rows * self.cols)
+        
+    def pheromone_entropy(self):
+        """
+        Entropía de Shannon normalizada (0-1) de las feromonas en celdas libres.
+        
+        Los bloques no usados aportan sus celdas libres con el valor
+        uniforme, sin leer sus feromonas.
+        """
+        values = [np.asarray(self._pheromones[window])[self.grid[window] == 0]
+                  for window in self._touched_tiles()]
+        uniform = self._untouched_pheromone()
+        size = self._count_free()
+        untouched = size - sum(tau.size for tau in values)
+        total = sum(tau.sum() for tau in values) + untouched * uniform
+        if size < 2 or total <= 0:
+            return 0.0
+        entropy = 0.0
+        for tau in values:
+            p = tau[tau > 0] / total
+            entropy -= (p * np.log(p)).sum()
+        if untouched and uniform > 0:
+            p = uniform / total
+            entropy -= untouched * p * math.log(p)
+        return float(entropy / math.log(size))
+        
+    def pheromone_matrix(self, copy=True):
+        """
+        Matriz de feromonas nueva (copy no aplica: siempre es una copia).
+        
+        Solo se ponen al día los bloques usados; el resto se rellena con
+        el valor uniforme sin escribir en el archivo.
+        """
+        matrix = np.full((self.rows, self.cols), self._untouched_pheromone())
+        for window in self._touched_tiles():
+            matrix[window] = self._pheromones[window]
+        return matrix
+        
+    def pheromone_values(self, cells):
+        """Obtener la feromona de muchas celdas (índices planos)"""
+        self._sync_cells(cells)
+        return self._flat_pheromones[cells]
+        
+    def get_pheromone(self, row, col):
+        """Obtener nivel de feromona en una celda"""
+        self._sync_cells(row * self.cols + col)
+        return self._pheromones[row, col]
+        
+    def update_pheromone(self, row, col, amount):
+        """Actualizar feromona en una celda"""
+        self._sync_cells(row * self.cols + col)
+        self._pheromones[row, col] += amount
+        
+    def deposit_pheromones(self, cells, amounts):
+        """Depositar feromona en muchas celdas a la vez (en el lugar)"""
+        self._sync_cells(cells)
+        np.add.at(self._flat_pheromones, cells, amounts)
+        
+    def _invalidate(self, components=True):
+        """Descartar estructuras derivadas de la grilla tras un cambio"""
+        super()._invalidate(components)
+        self._tiles.clear()
+        self._reachable.clear()
+        self._free_count = None
+        
+    def get_adjacency(self):
+        """La tabla completa no se construye en mapas grandes"""
+        raise ValueError("MappedEnvironment no tiene tabla de vecinos completa; use neighbor_cells")
+        
+    def neighbor_cells(self, cell):
+        """
+        Obtener los vecinos transitables de una celda por índice plano.
+        
+        Usa la tabla de vecinos del bloque de la celda, que se construye
+        la primera vez que se necesita.
+        
+        Returns:
+            Tupla (indices, costs) de arreglos NumPy, en el orden de DIRECTIONS
+        """
+        row, col = divmod(int(cell), self.cols)
+        key = (row // self.tile_size, col // self.tile_size)
+        tile = self._tiles.get(key)
+        if tile is None:
+            r0, c0 = key[0] * self.tile_size, key[1] * self.tile_size
+            r1, c1 = min(r0 + self.tile_size, self.rows), min(c0 + self.tile_size, self.cols)
+            tile = (r0, c0, c1 - c0) + self._build_adjacency((r0, r1), (c0, c1))
+            self._tiles[key] = tile
+            if len(self._tiles) > self.max_tiles:
+                self._tiles.popitem(last=False)
+        else:
+            self._tiles.move_to_end(key)
+            
+        r0, c0, width, indptr, indices, costs = tile
+        local = (row - r0) * width + col - c0
+        lo, hi = indptr[local], indptr[local + 1]
+        return indices[lo:hi], costs[lo:hi]
+        
+    def get_heuristic(self, row, col):
+        """Distancia euclidiana al objetivo (sin matriz de distancias)"""
+        return math.sqrt((row - self.end[0])**2 + (col - self.end[1])**2)
+        
+    def set_grid(self, grid, start=None, end=None):
+        """Copiar una grilla del mismo tamaño al archivo del mapa"""
+        if grid.shape != (self.rows, self.cols):
+            raise ValueError(f"La grilla {grid.shape} no coincide con el mapa "
+                             f"{(self.rows, self.cols)}")
+        if grid is not self.grid:
+            np.copyto(self.grid, grid)
+        self.start = tuple(start) if start is not None else (1, 1)
+        self.end = tuple(end) if end is not None else (self.rows - 2, self.cols - 2)
+        self._invalidate()
+        
+    def connected(self, a, b):
+        """
+        Verificar si dos celdas (row, col) libres están conectadas.
+        
+        Hace una búsqueda primero-el-mejor hacia b, que en mapas abiertos
+        solo recorre una franja entre ambas celdas. El resultado se guarda
+        hasta el próximo cambio de obstáculos.
+        """
+        if not (self.is_valid_cell(*a) and self.is_valid_cell(*b)):
+            return False
+        key = (tuple(a), tuple(b))
+        if key not in self._reachable:
+            self._reachable[key] = self._search(a, b)
+        return self._reachable[key]
+        
+    def _search(self, a, b):
+        """Búsqueda primero-el-mejor de b desde a"""
+        start = a[0] * self.cols + a[1]
+        target = b[0] * self.cols + b[1]
+        seen = {start}
+        queue = [(0, start)]
+        while queue:
+            _, cell = heapq.heappop(queue)
+            if cell == target:
+                return True
+            for neighbor in self.neighbor_cells(cell)[0].tolist():
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    row, col = divmod(neighbor, self.cols)
+                    heapq.heappush(queue, ((row - b[0])**2 + (col - b[1])**2, neighbor))
+        return False
+        
+    def get_components(self):
+        """El etiquetado completo no está disponible en mapas grandes"""
+        raise ValueError("MappedEnvironment no etiqueta componentes; use connected")
+        
+    def flush(self):
+        """Aplicar lo pendiente y escribir grilla y feromonas a disco"""
+        self._sync_all()
+        self.grid.flush()
+        self._pheromones.flush()
+        
+    def close(self):
+        """Escribir a disco y, si el directorio es temporal, borrarlo"""
+        if self.grid is None:
+            return
+        self.flush()
+        self.grid = self._pheromones = self._flat_pheromones = None
+        if self._temporary:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, *exc_info):
+        self.close()
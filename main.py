@@ -12,6 +12,7 @@
 
     Uso:
         python main.py
+        python main.py --threaded   # solver en un hilo aparte
 
     Controles:
         ESPACIO - Iniciar/Pausar simulación
@@ -19,6 +20,9 @@
         S       - Cambiar escenario
         P       - Mostrar/ocultar feromonas
         B       - Mostrar/ocultar mejor ruta
+        M       - Velocidad máxima
+        T       - Mostrar/ocultar rastro de hormigas
+        F       - Mostrar/ocultar perfil por fases
 
 =============================================================================
 """
@@ -110,7 +114,7 @@ def main():
     
     # Crear visualización
     print("  ✓ Iniciando visualización...\n")
-    viz = Visualization(env, solver)
+    viz = Visualization(env, solver, threaded='--threaded' in sys.argv[1:])
     
     print("  ╔════════════════════════════════════════════╗")
     print("  ║  Simulador listo. ¡Presiona ESPACIO para   ║")
@@ -0,0 +1,250 @@
+"""
+Importación y Exportación de Mapas
+Universidad Nacional de Chimborazo - Metaheurísticas
+
+Guarda y carga un Environment (grilla, inicio, objetivo y opcionalmente
+feromonas) en archivos, además de importar mapas de ocupación en imagen.
+
+Formatos según la extensión:
+    .npz: grid, start, end y pheromones (opcional), sin comprimir
+    .npy: solo la grilla (inicio y objetivo por defecto)
+    .pgm: imagen en escala de grises (P2 o P5); oscuro = obstáculo
+    .png: imagen (requiere pygame); oscuro = obstáculo
+
+Los arreglos de .npz y .npy se abren con np.memmap en modo copia al
+escribir: no se copian al cargar y las ediciones posteriores no
+modifican el archivo.
+
+Uso:
+    from maps import save_map, load_map
+    save_map(env, 'mapa.npz', include_pheromones=True)
+    env = load_map('mapa.npz')
+    load_map('ocupacion.pgm', env)       # reemplaza la grilla de env
+"""
+
+import os
+import struct
+import zipfile
+
+import numpy as np
+
+
+MAP_EXTENSIONS = ('.npz', '.npy', '.pgm', '.png')
+
+
+def _extension(path):
+    """Extensión en minúsculas de una ruta"""
+    return os.path.splitext(os.fspath(path))[1].lower()
+
+
+def is_map_path(value):
+    """Verificar si un valor es una ruta a un archivo de mapa"""
+    return isinstance(value, (str, os.PathLike)) and _extension(value) in MAP_EXTENSIONS
+
+
+def map_name(path):
+    """Nombre legible de un mapa (nombre del archivo sin extensión)"""
+    return os.path.splitext(os.path.basename(os.fspath(path)))[0]
+
+
+def _as_grid(array):
+    """Usar el arreglo como grilla 0/1 sin copiarlo si ya es entero"""
+    if array.ndim != 2:
+        raise ValueError(f"La grilla debe ser 2D, tiene forma {array.shape}")
+    if np.issubdtype(array.dtype, np.integer):
+        return array
+    return (array != 0).astype(np.int8)
+
+
+def _mmap_npz(path):
+    """
+    Abrir los arreglos de un .npz sin copiarlos.
+    
+    np.savez guarda cada arreglo como un .npy sin comprimir dentro del
+    zip, así que basta con ubicar sus datos y mapearlos. Los miembros
+    comprimidos se leen de forma normal.
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as f:
+        for info in archive.infolist():
+            name = info.filename[:-4] if info.filename.endswith('.npy') else info.filename
+            if info.compress_type != zipfile.ZIP_STORED:
+                with archive.open(info) as member:
+                    arrays[name] = np.load(member)
+                continue
+                
+            # Encabezado local del zip: 30 bytes + nombre + campo extra
+            f.seek(info.header_offset)
+            local_header = f.read(30)
+            name_length, extra_length = struct.unpack('<HH', local_header[26:30])
+            f.seek(info.header_offset + 30 + name_length + extra_length)
+            
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            if not shape:
+                arrays[name] = np.fromfile(f, dtype=dtype, count=1)[0]
+                continue
+            arrays[name] = np.memmap(path, dtype=dtype, mode='c', shape=shape,
+                                     order='F' if fortran_order else 'C', offset=f.tell())
+    return arrays
+
+
+def _read_pgm(path):
+    """
+    Leer una imagen PGM (P2 texto o P5 binario).
+    
+    Returns:
+        Tupla (pixels, maxval); en P5 los píxeles se mapean sin copiarlos
+    """
+    with open(path, 'rb') as f:
+        data = f.read(4096)
+        
+    # Encabezado: magia, ancho, alto y valor máximo, con comentarios '#'
+    tokens = []
+    pos = 0
+    while len(tokens) < 4:
+        while pos < len(data) and data[pos:pos + 1].isspace():
+            pos += 1
+        if data[pos:pos + 1] == b'#':
+            pos = data.index(b'\n', pos)
+            continue
+        end = pos
+        while end < len(data) and not data[end:end + 1].isspace():
+            end += 1
+        if end == pos:
+            raise ValueError(f"Encabezado PGM inválido en {path}")
+        tokens.append(data[pos:end])
+        pos = end
+        
+    magic, width, height, maxval = tokens[0], int(tokens[1]), int(tokens[2]), int(tokens[3])
+    if magic == b'P5':
+        dtype = np.uint8 if maxval < 256 else np.dtype('>u2')
+        # Un único espacio separa el encabezado de los datos
+        pixels = np.memmap(path, dtype=dtype, mode='r', shape=(height, width), offset=pos + 1)
+    elif magic == b'P2':
+        with open(path, 'rb') as f:
+            f.seek(pos)
+            pixels = np.array(f.read().split(), dtype=np.int64)[:width * height]
+        pixels = pixels.reshape(height, width)
+    else:
+        raise ValueError(f"Formato PGM no soportado: {magic.decode(errors='replace')}")
+    return pixels, maxval
+
+
+def _read_png(path):
+    """Leer una imagen PNG como escala de grises (requiere pygame)"""
+    try:
+        import pygame
+    except ImportError as error:
+        raise ImportError("Importar mapas PNG requiere pygame (pip install pygame)") from error
+    surface = pygame.image.load(os.fspath(path))
+    pixels = pygame.surfarray.array3d(surface)  # (ancho, alto, 3)
+    return pixels.mean(axis=2).T, 255
+
+
+def _occupancy(pixels, maxval, threshold, negate):
+    """Convertir píxeles en grilla: oscuro (<= threshold * maxval) = obstáculo"""
+    dark = np.asarray(pixels) <= threshold * maxval
+    return (~dark if negate else dark).astype(np.int8)
+
+
+def _nearest_free(grid, target):
+    """Celda libre más cercana a target (él mismo si está libre)"""
+    row, col = target
+    if 0 <= row < grid.shape[0] and 0 <= col < grid.shape[1] and grid[row, col] == 0:
+        return (row, col)
+    free = np.flatnonzero(np.asarray(grid).reshape(-1) == 0)
+    if free.size == 0:
+        raise ValueError("El mapa no tiene celdas libres")
+    rows, cols = np.divmod(free, grid.shape[1])
+    best = int(np.argmin((rows - row)**2 + (cols - col)**2))
+    return (int(rows[best]), int(cols[best]))
+
+
+def load_map(path, env=None, threshold=0.5, negate=False, start=None, end=None):
+    """
+    Cargar un mapa desde un archivo.
+    
+    Args:
+        path: Ruta .npz, .npy, .pgm o .png
+        env: Entorno a reemplazar (None = crear uno del tamaño del mapa)
+        threshold: En imágenes, fracción del valor máximo hasta la que un
+            píxel es obstáculo
+        negate: En imágenes, invertir (claro = obstáculo)
+        start, end: Inicio y objetivo; por defecto los del archivo o la
+            celda libre más cercana a las esquinas estándar
+            
+    Returns:
+        El entorno con el mapa cargado
+    """
+    from environment import Environment
+    
+    extension = _extension(path)
+    pheromones = None
+    if extension == '.npz':
+        arrays = _mmap_npz(path)
+        grid = _as_grid(arrays['grid'])
+        if start is None and 'start' in arrays:
+            start = tuple(int(v) for v in arrays['start'])
+        if end is None and 'end' in arrays:
+            end = tuple(int(v) for v in arrays['end'])
+        pheromones = arrays.get('pheromones')
+    elif extension == '.npy':
+        grid = _as_grid(np.load(path, mmap_mode='c'))
+    elif extension == '.pgm':
+        grid = _occupancy(*_read_pgm(path), threshold, negate)
+    elif extension == '.png':
+        grid = _occupancy(*_read_png(path), threshold, negate)
+    else:
+        raise ValueError(f"Formato de mapa no soportado: {extension or path!r}")
+        
+    rows, cols = grid.shape
+    start = _nearest_free(grid, start if start is not None else (1, 1))
+    end = _nearest_free(grid, end if end is not None else (rows - 2, cols - 2))
+    
+    if env is None:
+        env = Environment(rows, cols)
+    env.set_grid(grid, start, end)
+    if pheromones is not None and pheromones.shape == grid.shape:
+        if env.dense:
+            env.pheromones = pheromones
+        else:
+            env.pheromones[...] = pheromones
+    return env
+
+
+def save_map(env, path, include_pheromones=False):
+    """
+    Guardar el mapa de un entorno.
+    
+    .npz guarda grilla, inicio, objetivo y, si se pide, feromonas;
+    .npy solo la grilla; .pgm y .png una imagen (negro = obstáculo).
+    """
+    extension = _extension(path)
+    grid = np.asarray(env.grid, dtype=np.int8)
+    if extension == '.npz':
+        arrays = {'grid': grid, 'start': np.array(env.start), 'end': np.array(env.end)}
+        if include_pheromones:
+            arrays['pheromones'] = np.asarray(env.pheromones)
+        # Sin comprimir, para que load_map pueda mapear los arreglos
+        np.savez(path, **arrays)
+    elif extension == '.npy':
+        np.save(path, grid)
+    elif extension == '.pgm':
+        pixels = np.where(grid == 0, 255, 0).astype(np.uint8)
+        with open(path, 'wb') as f:
+            f.write(b'P5\n%d %d\n255\n' % (env.cols, env.rows))
+            f.write(pixels.tobytes())
+    elif extension == '.png':
+        try:
+            import pygame
+        except ImportError as error:
+            raise ImportError("Exportar mapas PNG requiere pygame (pip install pygame)") from error
+        pixels = np.where(grid == 0, 255, 0).astype(np.uint8).T
+        surface = pygame.surfarray.make_surface(np.dstack([pixels] * 3))
+        pygame.image.save(surface, os.fspath(path))
+    else:
+        raise ValueError(f"Formato de mapa no soportado: {extension or path!r}")
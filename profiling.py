@@ -0,0 +1,204 @@
+"""
+Perfilado por Fases del Solver ACO
+Universidad Nacional de Chimborazo - Metaheurísticas
+
+Mide, por iteración, el tiempo de cada fase del solver (construcción de
+caminos, select_next_cell, evaporación, depósito y el resto del cierre
+de la iteración) junto con contadores de pasos de hormiga, hormigas que
+no llegaron y memoria reservada.
+
+La medición se instala envolviendo los métodos de la instancia del
+solver (y del entorno) solo mientras está activa; desactivada no queda
+ningún envoltorio y el costo es nulo.
+
+Uso:
+    profiler = solver.enable_profiling()
+    solver.run_iteration()
+    profiler.records[-1]      # {'iteration': 0, 'construction': ..., ...}
+    profiler.save('perfil.csv')
+    solver.disable_profiling()
+"""
+
+import csv
+import gc
+import json
+import os
+import sys
+import time
+
+
+# Métodos medidos: (objeto, método, fase). 'solver' o 'env'
+PHASES = (
+    ('solver', 'move_all_ants_one_step', 'construction'),
+    ('solver', 'select_next_cell', 'select_next_cell'),
+    ('env', 'evaporate_pheromones', 'evaporation'),
+    ('solver', 'completed_tours', 'completed_tours'),
+    ('solver', '_deposit_tours', 'deposit'),
+)
+
+# Columnas de cada registro, en el orden de la exportación CSV
+FIELDS = (
+    'iteration', 'total', 'construction', 'select_next_cell', 'evaporation',
+    'completed_tours', 'deposit', 'bookkeeping', 'select_calls', 'ant_steps',
+    'unfinished_ants', 'dead_end_ants', 'allocated_blocks', 'gc_collections',
+)
+
+
+def _gc_collections():
+    """Recolecciones del recolector de basura hasta ahora (todas las generaciones)"""
+    return sum(stats['collections'] for stats in gc.get_stats())
+
+
+class SolverProfiler:
+    """
+    Registro por iteración de tiempos (segundos) y contadores.
+    
+    Cada registro tiene las columnas de FIELDS:
+        total: Tiempo desde el primer paso de la iteración hasta su cierre
+        construction: Movimiento de hormigas (incluye select_next_cell)
+        bookkeeping: Cierre de la iteración sin evaporación ni depósito
+            (historial, reinicio de hormigas, convergencia)
+        select_calls: Llamadas a select_next_cell
+        unfinished_ants: Hormigas que no llegaron al objetivo
+        allocated_blocks: Variación de bloques de memoria reservados
+            por Python (sys.getallocatedblocks) en la iteración
+        gc_collections: Recolecciones de basura durante la iteración
+    """
+    
+    def __init__(self, solver):
+        self.solver = solver
+        self.records = []
+        self._installed = []
+        self._times = dict.fromkeys((phase for _, _, phase in PHASES), 0.0)
+        self._new_iteration()
+        
+    @property
+    def last(self):
+        """Último registro (None si aún no termina ninguna iteración)"""
+        return self.records[-1] if self.records else None
+        
+    def _new_iteration(self):
+        """Preparar los acumuladores de la siguiente iteración"""
+        # En el lugar: los envoltorios guardan una referencia al diccionario
+        for phase in self._times:
+            self._times[phase] = 0.0
+        self._select_calls = 0
+        self._started = None
+        self._ant_steps = self.solver.ant_steps
+        self._blocks = sys.getallocatedblocks()
+        self._collections = _gc_collections()
+        
+    def _begin(self):
+        """Marcar el inicio de la iteración en la primera fase medida"""
+        if self._started is None:
+            self._started = time.perf_counter()
+            
+    def _timed(self, method, phase):
+        """Envolver un método acumulando su tiempo en phase"""
+        times = self._times
+        
+        def wrapper(*args, **kwargs):
+            self._begin()
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                times[phase] += time.perf_counter() - start
+                
+        return wrapper
+        
+    def _timed_select(self, method):
+        """Como _timed, contando además las llamadas"""
+        wrapper = self._timed(method, 'select_next_cell')
+        
+        def counted(*args, **kwargs):
+            self._select_calls += 1
+            return wrapper(*args, **kwargs)
+            
+        return counted
+        
+    def _timed_finish(self, method):
+        """Envolver _finish_iteration para cerrar el registro de la iteración"""
+        def wrapper(*args, **kwargs):
+            self._begin()
+            solver = self.solver
+            reached, total = solver._colony_counts()
+            iteration = solver.iteration
+            start = time.perf_counter()
+            result = method(*args, **kwargs)
+            end = time.perf_counter()
+            
+            times = self._times
+            record = {
+                'iteration': iteration,
+                'total': end - self._started,
+                **times,
+                'bookkeeping': max(0.0, end - start - times['evaporation']
+                                   - times['completed_tours'] - times['deposit']),
+                'select_calls': self._select_calls,
+                'ant_steps': solver.ant_steps - self._ant_steps,
+                'unfinished_ants': total - reached,
+                'dead_end_ants': solver.dead_end_ants,
+                'allocated_blocks': sys.getallocatedblocks() - self._blocks,
+                'gc_collections': _gc_collections() - self._collections,
+            }
+            self.records.append(record)
+            self._new_iteration()
+            return result
+            
+        return wrapper
+        
+    def install(self):
+        """Envolver los métodos medidos del solver y del entorno"""
+        if self._installed:
+            return
+        targets = {'solver': self.solver, 'env': self.solver.env}
+        for owner, name, phase in PHASES:
+            target = targets[owner]
+            method = getattr(target, name)
+            if name == 'select_next_cell':
+                wrapped = self._timed_select(method)
+            else:
+                wrapped = self._timed(method, phase)
+            setattr(target, name, wrapped)
+            self._installed.append((target, name))
+        self.solver._finish_iteration = self._timed_finish(self.solver._finish_iteration)
+        self._installed.append((self.solver, '_finish_iteration'))
+        
+    def uninstall(self):
+        """Quitar los envoltorios (los métodos vuelven a los de la clase)"""
+        for target, name in self._installed:
+            delattr(target, name)
+        self._installed = []
+        
+    def totals(self):
+        """
+        Resumen de todas las iteraciones registradas.
+        
+        Returns:
+            Diccionario con la suma de cada columna (menos 'iteration') y
+            el número de iteraciones
+        """
+        summary = {field: sum(record[field] for record in self.records)
+                   for field in FIELDS if field != 'iteration'}
+        summary['iterations'] = len(self.records)
+        return summary
+        
+    def to_json(self, path):
+        """Guardar registros y resumen en JSON"""
+        with open(path, 'w') as f:
+            json.dump({'records': self.records, 'totals': self.totals()}, f, indent=2)
+            
+    def to_csv(self, path):
+        """Guardar un registro por fila en CSV"""
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(self.records)
+            
+    def save(self, path):
+        """Guardar en JSON o CSV según la extensión de path"""
+        if os.path.splitext(os.fspath(path))[1].lower() == '.csv':
+            self.to_csv(path)
+        else:
+            self.to_json(path)
@@ -0,0 +1,223 @@
+"""
+Grabación de la Simulación sin Pantalla
+Universidad Nacional de Chimborazo - Metaheurísticas
+
+Dibuja la visualización fuera de pantalla (driver 'dummy' de SDL) cada
+N pasos o iteraciones del solver y guarda los cuadros como una
+secuencia de PNG o los envía a ffmpeg para generar un video. Entre
+cuadros el solver avanza sin dibujar, así que grabar cuesta poco frente
+al tiempo de resolución. Cada cuadro se copia de la pantalla a un único
+buffer RGB reutilizado (surfarray.pixels3d), que se escribe tal cual en
+la tubería de ffmpeg o se comprime como PNG con zlib en nivel rápido.
+
+Uso:
+    python -m aco record --scenario 3 --iterations 100 --every 20 --output cuadros/
+    python -m aco record --per iteration --output corrida.mp4 --fps 30
+"""
+
+import os
+import shutil
+import struct
+import subprocess
+import time
+import zlib
+
+import numpy as np
+
+
+# Extensiones que se graban como video con ffmpeg; el resto es un directorio
+VIDEO_EXTENSIONS = ('.mp4', '.mkv', '.webm', '.avi', '.mov', '.gif')
+
+# Nivel de zlib de los PNG: el más rápido (los cuadros son planos y
+# comprimen bien igual)
+PNG_COMPRESSION = 1
+
+
+def _png_chunk(kind, data):
+    """Bloque PNG: longitud, tipo, datos y CRC"""
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+
+def _write_png(path, rows, width, height):
+    """
+    Guardar un PNG RGB de 8 bits.
+    
+    rows es un arreglo (alto, 1 + 3 * ancho) contiguo: un byte de filtro
+    (0 = ninguno) seguido de los píxeles de cada fila, que es justo lo
+    que comprime el bloque IDAT.
+    """
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(_png_chunk(b'IHDR', header))
+        f.write(_png_chunk(b'IDAT', zlib.compress(rows, PNG_COMPRESSION)))
+        f.write(_png_chunk(b'IEND', b''))
+
+
+def _write_bmp(path, rows, width, height):
+    """
+    Guardar un BMP de 24 bits sin comprimir.
+    
+    rows es un arreglo (alto, ancho de fila) contiguo con las filas de
+    abajo hacia arriba, en BGR y rellenas hasta múltiplos de 4 bytes.
+    """
+    header = struct.pack('<2sIHHI', b'BM', 54 + rows.nbytes, 0, 0, 54)
+    info = struct.pack('<IiiHHIIiiII', 40, width, height, 1, 24, 0, rows.nbytes,
+                       2835, 2835, 0, 0)
+    with open(path, 'wb') as f:
+        f.write(header + info)
+        f.write(rows)
+
+
+class FrameWriter:
+    """
+    Destino de los cuadros grabados.
+    
+    Si output termina en una extensión de VIDEO_EXTENSIONS, los cuadros
+    se envían crudos (RGB) a un proceso ffmpeg, que codifica en paralelo;
+    si no, output es un directorio donde se guarda frame_000000.png,
+    frame_000001.png, ... Comprimir un PNG cuesta más que dibujar el
+    cuadro; image_format='bmp' guarda sin comprimir.
+    
+    Los píxeles de cada cuadro se copian a un mismo buffer (_rows) ya
+    ordenado como lo espera el destino, a través de una vista (_frame)
+    de forma (alto, ancho, 3) en RGB; no se crean bytes ni superficies
+    nuevas por cuadro.
+    """
+    
+    def __init__(self, output, size, fps=30, image_format='png'):
+        self.output = os.fspath(output)
+        self.size = size
+        self.image_format = image_format
+        self.frames = 0
+        self._process = None
+        
+        width, height = size
+        extension = os.path.splitext(self.output)[1].lower()
+        video = extension in VIDEO_EXTENSIONS
+        if video:
+            # RGB crudo, fila por fila
+            self._rows = np.zeros((height, 3 * width), dtype=np.uint8)
+            self._frame = self._rows.reshape(height, width, 3)
+        elif image_format == 'png':
+            # Columna 0: byte de filtro PNG de cada fila (siempre 0)
+            self._rows = np.zeros((height, 1 + 3 * width), dtype=np.uint8)
+            self._frame = self._rows[:, 1:].reshape(height, width, 3)
+        elif image_format == 'bmp':
+            # De abajo hacia arriba, en BGR y con filas múltiplo de 4 bytes
+            self._rows = np.zeros((height, (3 * width + 3) & ~3), dtype=np.uint8)
+            self._frame = self._rows[::-1, :3 * width].reshape(height, width, 3)[..., ::-1]
+        else:
+            raise ValueError(f"image_format debe ser 'png' o 'bmp', no {image_format!r}")
+            
+        if video:
+            ffmpeg = shutil.which('ffmpeg')
+            if ffmpeg is None:
+                raise OSError("Grabar video requiere ffmpeg en el PATH; "
+                              "use un directorio para guardar cuadros PNG")
+            command = [
+                ffmpeg, '-y', '-loglevel', 'error',
+                '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f'{width}x{height}',
+                '-r', str(fps), '-i', '-',
+            ]
+            if extension != '.gif':
+                command += ['-pix_fmt', 'yuv420p']
+            self._process = subprocess.Popen(command + [self.output], stdin=subprocess.PIPE)
+        else:
+            os.makedirs(self.output, exist_ok=True)
+            
+    def write(self, surface):
+        """Agregar un cuadro (una Surface del tamaño indicado)"""
+        import pygame
+        
+        # surfarray indexa (x, y): se transpone a (fila, columna)
+        np.copyto(self._frame, pygame.surfarray.pixels3d(surface).transpose(1, 0, 2))
+        if self._process is not None:
+            self._process.stdin.write(self._rows)
+        else:
+            path = os.path.join(self.output, f'frame_{self.frames:06d}.{self.image_format}')
+            write = _write_png if self.image_format == 'png' else _write_bmp
+            write(path, self._rows, *self.size)
+        self.frames += 1
+        
+    def close(self):
+        """Terminar la grabación (espera a que ffmpeg cierre el video)"""
+        if self._process is None:
+            return
+        process, self._process = self._process, None
+        process.stdin.close()
+        if process.wait() != 0:
+            raise OSError(f"ffmpeg terminó con código {process.returncode}")
+            
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def record_run(env, solver, output, every=10, per='step', fps=30, max_frames=None,
+               image_format='png'):
+    """
+    Ejecutar el solver hasta terminar grabando un cuadro cada every
+    pasos (per='step') o iteraciones (per='iteration').
+    
+    También se graban el primer y el último cuadro. El solver se
+    reinicia antes de empezar.
+    
+    Returns:
+        Diccionario con cuadros, pasos, iteraciones y los tiempos de
+        resolución y de grabación
+    """
+    from visualization import Visualization
+    
+    if per not in ('step', 'iteration'):
+        raise ValueError(f"per debe ser 'step' o 'iteration', no {per!r}")
+    if every < 1:
+        raise ValueError("every debe ser al menos 1")
+        
+    viz = Visualization(env, solver, headless=True)
+    solver.reset()
+    viz._set_active(True)
+    
+    steps = 0
+    solve_time = 0.0
+    record_time = 0.0
+    
+    with FrameWriter(output, viz.screen.get_size(), fps, image_format) as writer:
+        def capture():
+            viz._update_particles()
+            viz._render()
+            writer.write(viz.screen)
+            
+        start = time.perf_counter()
+        capture()
+        record_time += time.perf_counter() - start
+        
+        while not solver.completed:
+            if max_frames is not None and writer.frames >= max_frames:
+                break
+            start = time.perf_counter()
+            result = solver.step()
+            steps += 1
+            solve_time += time.perf_counter() - start
+            
+            start = time.perf_counter()
+            viz._handle_step_result(result, solver.best_path)
+            if per == 'step':
+                due = steps % every == 0
+            else:
+                due = result == 'new_iteration' and solver.iteration % every == 0
+            if due or result == 'completed':
+                capture()
+            record_time += time.perf_counter() - start
+            
+    return {
+        'output': writer.output,
+        'frames': writer.frames,
+        'steps': steps,
+        'iterations': solver.iteration,
+        'best_cost': solver.best_cost if solver.best_path else None,
+        'solve_time': solve_time,
+        'record_time': record_time,
+    }
@@ -1,9 +1,49 @@
 """
 Escenarios Predefinidos para Simulación ACO
 Universidad Nacional de Chimborazo - Metaheurísticas
+
+Cada escenario construye su grilla con operaciones sobre rebanadas de
+NumPy y la carga en el entorno de una sola vez. load_scenario guarda las
+grillas terminadas (int8) por (escenario, filas, columnas, semilla), así
+que volver a cargar un escenario es una sola copia de arreglo. En un
+MappedEnvironment la grilla se construye directamente en el archivo y no
+pasa por el caché.
 """
 
+from collections import OrderedDict
+
+import numpy as np
 from environment import Environment
+from maps import is_map_path, load_map, map_name
+
+
+def _empty_grid(env):
+    """
+    Grilla sin obstáculos del tamaño del entorno.
+    
+    En un entorno no denso es la grilla del propio archivo, vaciada en el
+    lugar, para no reservar una copia del mapa en memoria.
+    """
+    if not env.dense:
+        env.grid[...] = 0
+        return env.grid
+    return np.zeros((env.rows, env.cols), dtype=np.int8)
+
+
+def _span(start, stop):
+    """Rebanada equivalente a range(start, stop) (vacía si stop <= start)"""
+    return slice(start, max(start, stop))
+
+
+def _apply_grid(env, grid, start, end):
+    """
+    Cargar una grilla construida en el entorno de una sola vez.
+    
+    Como add_obstacle, nunca bloquea el inicio ni el objetivo.
+    """
+    grid[start] = 0
+    grid[end] = 0
+    env.set_grid(grid, start, end)
 
 
 def create_simple_maze(env):
@@ -11,18 +51,15 @@ def create_simple_maze(env):
     Escenario 1: Laberinto Simple
     Un camino con algunos obstáculos básicos.
     """
-    env.clear_obstacles()
-    env.set_start((2, 2))
-    env.set_end((env.rows - 3, env.cols - 3))
+    grid = _empty_grid(env)
     
     # Pared vertical en el centro
-    for r in range(5, env.rows - 8):
-        env.add_obstacle(r, env.cols // 2)
+    grid[_span(5, env.rows - 8), env.cols // 2] = 1
     
     # Pared horizontal
-    for c in range(8, env.cols - 12):
-        env.add_obstacle(env.rows // 2, c)
-        
+    grid[env.rows // 2, _span(8, env.cols - 12)] = 1
+    
+    _apply_grid(env, grid, (2, 2), (env.rows - 3, env.cols - 3))
     return "Laberinto Simple"
 
 
@@ -31,9 +68,7 @@ def create_complex_maze(env):
     Escenario 2: Laberinto Complejo
     Múltiples caminos posibles con varios obstáculos.
     """
-    env.clear_obstacles()
-    env.set_start((2, 2))
-    env.set_end((env.rows - 3, env.cols - 3))
+    grid = _empty_grid(env)
     
     # Múltiples paredes verticales
     for i in range(3):
@@ -41,17 +76,14 @@ def create_complex_maze(env):
         if col < env.cols - 3:
             start_row = 3 if i % 2 == 0 else 8
             end_row = env.rows - 8 if i % 2 == 0 else env.rows - 3
-            for r in range(start_row, end_row):
-                env.add_obstacle(r, col)
+            grid[_span(start_row, end_row), col] = 1
     
     # Paredes horizontales
-    for c in range(5, 15):
-        env.add_obstacle(10, c)
-    for c in range(20, 30):
-        env.add_obstacle(15, c)
-    for c in range(8, 18):
-        env.add_obstacle(22, c)
-        
+    grid[10, 5:15] = 1
+    grid[15, 20:30] = 1
+    grid[22, 8:18] = 1
+    
+    _apply_grid(env, grid, (2, 2), (env.rows - 3, env.cols - 3))
     return "Laberinto Complejo"
 
 
@@ -60,10 +92,7 @@ def create_open_field(env):
     Escenario 3: Campo Abierto
     Sin obstáculos para visualizar la convergencia de feromonas.
     """
-    env.clear_obstacles()
-    env.set_start((env.rows // 2, 3))
-    env.set_end((env.rows // 2, env.cols - 4))
-    
+    _apply_grid(env, _empty_grid(env), (env.rows // 2, 3), (env.rows // 2, env.cols - 4))
     return "Campo Abierto"
 
 
@@ -73,29 +102,23 @@ def create_trap_scenario(env):
     Un camino aparentemente corto pero que es un callejón sin salida.
     Las hormigas deben encontrar el camino largo pero viable.
     """
-    env.clear_obstacles()
-    env.set_start((env.rows // 2, 3))
-    env.set_end((env.rows // 2, env.cols - 4))
+    grid = _empty_grid(env)
     
     # Camino directo bloqueado casi al final
     wall_col = env.cols - 8
-    for r in range(3, env.rows - 3):
-        env.add_obstacle(r, wall_col)
+    grid[_span(3, env.rows - 3), wall_col] = 1
     
     # Pequeña abertura arriba
-    env.remove_obstacle(4, wall_col)
-    env.remove_obstacle(5, wall_col)
+    grid[4:6, wall_col] = 0
     
     # Trampa: parece un atajo pero es un callejón
     trap_row = env.rows // 2
-    for c in range(12, wall_col - 2):
-        env.add_obstacle(trap_row - 3, c)
-        env.add_obstacle(trap_row + 3, c)
+    grid[[trap_row - 3, trap_row + 3], _span(12, wall_col - 2)] = 1
     
     # Cerrar la trampa
-    for r in range(trap_row - 3, trap_row + 4):
-        env.add_obstacle(r, wall_col - 2)
-        
+    grid[_span(trap_row - 3, trap_row + 4), wall_col - 2] = 1
+    
+    _apply_grid(env, grid, (env.rows // 2, 3), (env.rows // 2, env.cols - 4))
     return "La Trampa"
 
 
@@ -104,58 +127,53 @@ def create_spiral(env):
     Escenario 5: Espiral
     Las hormigas deben seguir un camino en espiral.
     """
-    env.clear_obstacles()
-    env.set_start((env.rows // 2, env.cols // 2))
-    env.set_end((2, 2))
+    grid = _empty_grid(env)
     
     # Crear espiral desde afuera hacia adentro
     margin = 3
     
     # Capa exterior
-    for c in range(margin, env.cols - margin):
-        env.add_obstacle(margin, c)
-    for r in range(margin, env.rows - margin):
-        env.add_obstacle(r, env.cols - margin - 1)
-    for c in range(margin, env.cols - margin):
-        env.add_obstacle(env.rows - margin - 1, c)
-    for r in range(margin + 5, env.rows - margin):
-        env.add_obstacle(r, margin)
-        
+    grid[margin, _span(margin, env.cols - margin)] = 1
+    grid[_span(margin, env.rows - margin), env.cols - margin - 1] = 1
+    grid[env.rows - margin - 1, _span(margin, env.cols - margin)] = 1
+    grid[_span(margin + 5, env.rows - margin), margin] = 1
+    
     # Segunda capa
     margin2 = 7
-    for c in range(margin2, env.cols - margin2):
-        env.add_obstacle(margin2, c)
-    for r in range(margin2, env.rows - margin2):
-        env.add_obstacle(r, env.cols - margin2 - 1)
-    for c in range(margin2 + 5, env.cols - margin2):
-        env.add_obstacle(env.rows - margin2 - 1, c)
-        
+    grid[margin2, _span(margin2, env.cols - margin2)] = 1
+    grid[_span(margin2, env.rows - margin2), env.cols - margin2 - 1] = 1
+    grid[env.rows - margin2 - 1, _span(margin2 + 5, env.cols - margin2)] = 1
+    
     # Abrir entradas
-    env.remove_obstacle(margin, margin + 3)
-    env.remove_obstacle(margin + 1, margin + 3)
+    grid[margin:margin + 2, margin + 3] = 0
     
+    _apply_grid(env, grid, (env.rows // 2, env.cols // 2), (2, 2))
     return "Espiral"
 
 
-def create_random_obstacles(env, density=0.25):
+def create_random_obstacles(env, density=0.25, seed=None):
     """
     Escenario 6: Obstáculos Aleatorios
     Obstáculos distribuidos aleatoriamente.
-    """
-    import random
     
-    env.clear_obstacles()
-    env.set_start((2, 2))
-    env.set_end((env.rows - 3, env.cols - 3))
+    seed puede ser un entero o un numpy.random.Generator; con la misma
+    semilla se obtiene siempre el mismo mapa.
+    """
+    rng = np.random.default_rng(seed)
+    start = (2, 2)
+    end = (env.rows - 3, env.cols - 3)
     
-    # Añadir obstáculos aleatorios
-    for r in range(env.rows):
-        for c in range(env.cols):
-            if random.random() < density:
-                # No bloquear cerca del inicio o fin
-                if abs(r - env.start[0]) > 3 or abs(c - env.start[1]) > 3:
-                    if abs(r - env.end[0]) > 3 or abs(c - env.end[1]) > 3:
-                        env.add_obstacle(r, c)
+    # Añadir obstáculos aleatorios, sin bloquear cerca del inicio o fin
+    # Por bloques de filas: el flujo aleatorio es el mismo que con una
+    # sola llamada y no se reserva una matriz de flotantes del mapa entero
+    grid = _empty_grid(env)
+    block = max(1, 2**20 // env.cols)
+    for row in range(0, env.rows, block):
+        rows = grid[row:row + block]
+        rows[...] = rng.random(rows.shape) < density
+    grid[max(start[0] - 3, 0):start[0] + 4, max(start[1] - 3, 0):start[1] + 4] = 0
+    grid[max(end[0] - 3, 0):end[0] + 4, max(end[1] - 3, 0):end[1] + 4] = 0
+    _apply_grid(env, grid, start, end)
     
     # Verificar que existe un camino
     if not env.path_exists():
@@ -170,36 +188,23 @@ def create_university_logo(env):
     Escenario 7: Logo UNACH
     Obstáculos formando las letras U-N-A-C-H de forma simplificada.
     """
-    env.clear_obstacles()
-    env.set_start((env.rows - 3, 2))
-    env.set_end((env.rows - 3, env.cols - 3))
+    grid = _empty_grid(env)
     
     # Crear marco
-    for c in range(env.cols):
-        env.add_obstacle(0, c)
-        env.add_obstacle(env.rows - 1, c)
-    for r in range(env.rows):
-        env.add_obstacle(r, 0)
-        env.add_obstacle(r, env.cols - 1)
+    grid[[0, -1], :] = 1
+    grid[:, [0, -1]] = 1
     
     # Letra U (simplificada)
     start_col = 5
-    for r in range(5, 15):
-        env.add_obstacle(r, start_col)
-        env.add_obstacle(r, start_col + 4)
-    for c in range(start_col, start_col + 5):
-        env.add_obstacle(15, c)
-        
+    grid[5:15, [start_col, start_col + 4]] = 1
+    grid[15, start_col:start_col + 5] = 1
+    
     # Letra N
     start_col = 12
-    for r in range(5, 16):
-        env.add_obstacle(r, start_col)
-        env.add_obstacle(r, start_col + 5)
-    env.add_obstacle(7, start_col + 1)
-    env.add_obstacle(9, start_col + 2)
-    env.add_obstacle(11, start_col + 3)
-    env.add_obstacle(13, start_col + 4)
+    grid[5:16, [start_col, start_col + 5]] = 1
+    grid[[7, 9, 11, 13], [start_col + 1, start_col + 2, start_col + 3, start_col + 4]] = 1
     
+    _apply_grid(env, grid, (env.rows - 3, 2), (env.rows - 3, env.cols - 3))
     return "Logo UNACH"
 
 
@@ -215,15 +220,60 @@ SCENARIOS = [
 ]
 
 
+# Grillas construidas: (índice, filas, columnas, semilla) -> (grilla, inicio, objetivo)
+SCENARIO_CACHE_BYTES = 64 * 2**20
+_compiled = OrderedDict()
+
+
+def clear_scenario_cache():
+    """Vaciar el caché de escenarios construidos"""
+    _compiled.clear()
+
+
 def get_scenario_names():
     """Obtener lista de nombres de escenarios"""
     return [name for name, _ in SCENARIOS]
 
 
-def load_scenario(env, index):
-    """Cargar un escenario por su índice"""
+def load_scenario(env, index, seed=None):
+    """
+    Cargar un escenario por su índice o desde un archivo de mapa.
+    
+    index puede ser un entero o una ruta .npz, .npy, .pgm o .png (ver
+    maps.load_map); en ese caso el nombre es el del archivo.
+    seed (entero o numpy.random.Generator) solo afecta a los escenarios
+    aleatorios.
+    
+    En entornos densos, los escenarios reproducibles (los fijos, y los
+    aleatorios con semilla entera) se toman del caché si ya se
+    construyeron con ese tamaño. El caché descarta los más antiguos al
+    pasar de SCENARIO_CACHE_BYTES.
+    """
+    if is_map_path(index):
+        load_map(index, env)
+        return map_name(index)
     if 0 <= index < len(SCENARIOS):
         name, func = SCENARIOS[index]
-        func(env)
+        random = func is create_random_obstacles
+        cacheable = env.dense and (not random or isinstance(seed, (int, np.integer)))
+        key = (index, env.rows, env.cols, seed if random else None)
+        
+        if cacheable and key in _compiled:
+            _compiled.move_to_end(key)
+            grid, start, end = _compiled[key]
+            env.set_grid(grid.copy(), start, end)
+            return name
+            
+        if random:
+            func(env, seed=seed)
+        else:
+            func(env)
+            
+        if cacheable:
+            grid = np.array(env.grid, dtype=np.int8)
+            if grid.nbytes <= SCENARIO_CACHE_BYTES:
+                _compiled[key] = (grid, env.start, env.end)
+                while sum(entry[0].nbytes for entry in _compiled.values()) > SCENARIO_CACHE_BYTES:
+                    _compiled.popitem(last=False)
         return name
     return None
@@ -0,0 +1,147 @@
+"""
+Ejecución del Solver en Segundo Plano
+Universidad Nacional de Chimborazo - Metaheurísticas
+
+Ejecuta solver.step() en un hilo aparte, independiente de la tasa de
+cuadros de la interfaz. El hilo publica instantáneas (Snapshot) del
+estado cada cierto tiempo; la interfaz lee la última publicada sin
+bloquearse, porque publicar es reemplazar una referencia.
+
+Uso:
+    runner = SolverThread(solver, steps_per_second=300)
+    runner.start()
+    runner.resume()
+    ...
+    snapshot = runner.snapshot        # estado consistente para dibujar
+    with runner.lock:                 # para modificar solver o entorno
+        solver.reset()
+        runner.publish()
+    runner.stop()
+"""
+
+import threading
+import time
+from collections import deque
+
+
+class Snapshot:
+    """
+    Estado del solver en un instante, de solo lectura para la interfaz.
+    
+    Atributos:
+        positions: Índice plano de la celda de cada hormiga
+        status: ANT_ACTIVE, ANT_REACHED o ANT_STUCK de cada hormiga
+        best_path: Mejor ruta como lista de (fila, columna)
+        pheromones: Matriz de feromonas (env.pheromone_matrix)
+        max_pheromone: Máximo de pheromones
+        statistics: Resultado de solver.get_statistics()
+        completed: Si el solver terminó
+    """
+    
+    __slots__ = ('positions', 'status', 'best_path', 'pheromones', 'max_pheromone',
+                 'statistics', 'completed')
+                 
+    def __init__(self, solver, copy=True):
+        """
+        Args:
+            solver: Solver del que se toma el estado
+            copy: Copiar las feromonas (False = referenciar las del
+                entorno, solo si nadie las modifica mientras se usan)
+        """
+        self.positions, self.status = solver.ant_states()
+        self.best_path = list(solver.best_path or ())
+        self.pheromones = solver.env.pheromone_matrix(copy)
+        self.max_pheromone = float(self.pheromones.max())
+        self.statistics = solver.get_statistics()
+        self.completed = solver.completed
+
+
+class SolverThread:
+    """
+    Hilo que avanza el solver paso a paso.
+    
+    Con max_speed=False se ejecutan steps_per_second pasos por segundo;
+    con max_speed=True tan rápido como permita la CPU. Los resultados
+    'new_iteration' y 'completed' de step() se encolan en events para
+    que la interfaz reaccione (partículas, fin de la simulación).
+    
+    lock protege al solver y al entorno: el hilo lo toma en cada paso y
+    quien quiera modificarlos (reiniciar, cambiar escenario) debe
+    tomarlo también. Leer snapshot no requiere el lock.
+    """
+    
+    def __init__(self, solver, steps_per_second=300, publish_interval=1 / 60):
+        self.solver = solver
+        self.steps_per_second = steps_per_second
+        self.publish_interval = publish_interval
+        self.max_speed = False
+        
+        self.lock = threading.Lock()
+        self.events = deque()
+        self.snapshot = Snapshot(solver)
+        
+        self._running = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='aco-solver', daemon=True)
+        
+    @property
+    def running(self):
+        """Si el hilo está avanzando el solver"""
+        return self._running.is_set()
+        
+    def start(self):
+        """Arrancar el hilo (queda en pausa hasta resume)"""
+        self._thread.start()
+        
+    def resume(self):
+        """Reanudar la ejecución"""
+        self._running.set()
+        
+    def pause(self):
+        """Pausar la ejecución (el paso en curso termina)"""
+        self._running.clear()
+        
+    def stop(self):
+        """Detener el hilo y esperar a que termine"""
+        self._stopping.set()
+        self._running.set()
+        if self._thread.is_alive():
+            self._thread.join()
+            
+    def publish(self):
+        """Publicar el estado actual (llamar con el lock tomado)"""
+        self.snapshot = Snapshot(self.solver)
+        
+    def _run(self):
+        """Bucle del hilo"""
+        last_publish = time.perf_counter()
+        next_step = last_publish
+        
+        while not self._stopping.is_set():
+            if not self._running.wait(0.1):
+                continue
+            if self._stopping.is_set():
+                break
+                
+            with self.lock:
+                # Una pausa o un stop pueden llegar mientras se espera el lock
+                if not self._running.is_set():
+                    continue
+                result = self.solver.step()
+                if result in ('new_iteration', 'completed'):
+                    self.events.append(result)
+                if result == 'completed':
+                    self._running.clear()
+                    
+                now = time.perf_counter()
+                if result == 'completed' or now - last_publish >= self.publish_interval:
+                    self.publish()
+                    last_publish = now
+                    
+            if self.max_speed:
+                next_step = now
+            else:
+                # Ritmo fijo; tras una pausa larga no se intenta recuperar
+                next_step = max(next_step + 1 / self.steps_per_second, now - 0.1)
+                if next_step > now:
+                    time.sleep(next_step - now)
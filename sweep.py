@@ -0,0 +1,268 @@
+"""
+Barrido de Parámetros del Algoritmo ACO
+Universidad Nacional de Chimborazo - Metaheurísticas
+
+Ejecuta búsquedas en grilla o aleatorias sobre los campos de ACOParams
+(alpha, beta, evaporation_rate, num_ants, q) en varios escenarios,
+usando un pool de procesos, y devuelve una tabla ordenada por costo.
+
+Cada corrida terminada se guarda en un caché en disco (un JSON por
+línea), de modo que un barrido interrumpido o ampliado no repite las
+configuraciones ya evaluadas.
+
+Uso:
+    python -m aco sweep --alpha 0.5,1,2 --beta 1:5:5 --scenarios 0,3 --cache barrido
+    python -m aco sweep --mode random --samples 50 --alpha 0.1:5 --beta 0.1:5
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+from config import ACOParams, GRID_ROWS, GRID_COLS
+
+
+# Campos de ACOParams que se pueden barrer
+SWEEP_FIELDS = ('alpha', 'beta', 'evaporation_rate', 'num_ants', 'q')
+INTEGER_FIELDS = ('num_ants',)
+
+CACHE_FILE = 'results.jsonl'
+
+
+class Range:
+    """Rango continuo [low, high]; en búsqueda en grilla se toman num puntos"""
+    
+    def __init__(self, low, high, num=5):
+        self.low = low
+        self.high = high
+        self.num = num
+        
+    def grid_values(self):
+        """Valores equiespaciados del rango"""
+        return np.linspace(self.low, self.high, self.num).tolist()
+        
+    def sample(self, rng):
+        """Valor uniforme dentro del rango"""
+        return float(rng.uniform(self.low, self.high))
+        
+    def __repr__(self):
+        return f"Range({self.low}, {self.high}, {self.num})"
+
+
+def parse_spec(text):
+    """
+    Interpretar la especificación de un parámetro.
+    
+    'a,b,c' -> lista de valores
+    'low:high' o 'low:high:num' -> Range
+    """
+    if ':' in text:
+        parts = [float(p) for p in text.split(':')]
+        if len(parts) == 2:
+            return Range(parts[0], parts[1])
+        return Range(parts[0], parts[1], int(parts[2]))
+    return [float(p) for p in text.split(',') if p]
+
+
+def _normalize(field, value):
+    """Redondear enteros y limpiar flotantes para que la clave sea estable"""
+    if field in INTEGER_FIELDS:
+        return int(round(value))
+    return round(float(value), 10)
+
+
+def grid_configs(space):
+    """Todas las combinaciones de los valores de cada campo"""
+    fields = sorted(space)
+    values = []
+    for field in fields:
+        spec = space[field]
+        options = spec.grid_values() if isinstance(spec, Range) else list(spec)
+        values.append(sorted({_normalize(field, v) for v in options}))
+    return [dict(zip(fields, combo)) for combo in itertools.product(*values)]
+
+
+def random_configs(space, samples, seed=None):
+    """Configuraciones muestreadas al azar (reproducibles con seed)"""
+    rng = np.random.default_rng(seed)
+    configs = []
+    for _ in range(samples):
+        config = {}
+        for field in sorted(space):
+            spec = space[field]
+            if isinstance(spec, Range):
+                value = spec.sample(rng)
+            else:
+                value = spec[rng.integers(len(spec))]
+            config[field] = _normalize(field, value)
+        configs.append(config)
+    return configs
+
+
+def _task_key(task):
+    """Clave estable de una corrida para el caché"""
+    text = json.dumps(task, sort_keys=True)
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def evaluate(task):
+    """
+    Ejecutar una corrida del solver para una configuración y un escenario.
+    
+    Se ejecuta en los procesos del pool; solo importa módulos con numpy.
+    """
+    from environment import Environment
+    from aco_algorithm import create_solver
+    from scenarios import load_scenario
+    
+    env = Environment(task['rows'], task['cols'])
+    load_scenario(env, task['scenario'], seed=task['seed'])
+    
+    params = ACOParams()
+    for field, value in task['config'].items():
+        setattr(params, field, value)
+    params.max_iterations = task['iterations']
+    
+    with create_solver(env, params, task['engine'], seed=task['seed']) as solver:
+        solver.reset()
+        start = time.perf_counter()
+        while not solver.completed:
+            solver.run_iteration()
+        wall_time = time.perf_counter() - start
+        
+    result = dict(task)
+    result['best_cost'] = solver.best_cost if solver.best_path else None
+    result['iterations_run'] = solver.iteration
+    result['wall_time'] = wall_time
+    return _task_key(task), result
+
+
+def load_cache(cache_dir):
+    """Leer las corridas guardadas en el caché"""
+    cache = {}
+    path = os.path.join(cache_dir, CACHE_FILE)
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Línea truncada por una interrupción
+                cache[entry['key']] = entry['result']
+    return cache
+
+
+def run_sweep(space, scenarios=(0,), mode='grid', samples=20, iterations=50,
+              engine='vectorized', seed=0, repeats=1, workers=None,
+              cache_dir=None, rows=GRID_ROWS, cols=GRID_COLS, progress=None):
+    """
+    Ejecutar un barrido de parámetros.
+    
+    Args:
+        space: Diccionario campo -> lista de valores o Range
+        scenarios: Índices de escenarios a evaluar
+        mode: 'grid' (todas las combinaciones) o 'random' (samples muestras)
+        repeats: Corridas por configuración y escenario (semillas seed..seed+repeats-1)
+        workers: Procesos del pool (por defecto todos los núcleos)
+        cache_dir: Directorio del caché en disco (None = sin caché)
+        progress: Función opcional llamada con (hechas, total)
+        
+    Returns:
+        Lista de filas ordenadas de mejor a peor (ver rank_results)
+    """
+    unknown = set(space) - set(SWEEP_FIELDS)
+    if unknown:
+        raise ValueError(f"Campos no barribles: {', '.join(sorted(unknown))}")
+    if engine == 'parallel':
+        raise ValueError("El barrido ya reparte corridas entre procesos; use 'ants' o 'vectorized'")
+        
+    if mode == 'grid':
+        configs = grid_configs(space)
+    elif mode == 'random':
+        configs = random_configs(space, samples, seed)
+    else:
+        raise ValueError(f"Modo desconocido: {mode!r}")
+        
+    tasks = [
+        {'config': config, 'scenario': scenario, 'seed': seed + r,
+         'iterations': iterations, 'engine': engine, 'rows': rows, 'cols': cols}
+        for config in configs for scenario in scenarios for r in range(repeats)
+    ]
+    
+    cache = load_cache(cache_dir) if cache_dir else {}
+    pending = [task for task in tasks if _task_key(task) not in cache]
+    done = len(tasks) - len(pending)
+    if progress:
+        progress(done, len(tasks))
+        
+    cache_file = None
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        cache_file = open(os.path.join(cache_dir, CACHE_FILE), 'a')
+        
+    pool = Pool(workers) if workers != 1 and len(pending) > 1 else None
+    try:
+        if pool is None:
+            outcomes = map(evaluate, pending)
+        else:
+            outcomes = pool.imap_unordered(evaluate, pending)
+            
+        for key, result in outcomes:
+            cache[key] = result
+            if cache_file:
+                cache_file.write(json.dumps({'key': key, 'result': result}) + "\n")
+                cache_file.flush()
+            done += 1
+            if progress:
+                progress(done, len(tasks))
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+        if cache_file:
+            cache_file.close()
+            
+    return rank_results([cache[_task_key(task)] for task in tasks])
+
+
+def rank_results(results):
+    """
+    Agrupar corridas por configuración y ordenarlas.
+    
+    El orden es: mayor tasa de éxito, menor costo medio, menor tiempo medio.
+    
+    Returns:
+        Lista de diccionarios con config, mean_cost, best_cost,
+        success_rate, mean_time y runs
+    """
+    groups = {}
+    for result in results:
+        key = json.dumps(result['config'], sort_keys=True)
+        groups.setdefault(key, []).append(result)
+        
+    rows = []
+    for runs in groups.values():
+        costs = [r['best_cost'] for r in runs if r['best_cost'] is not None]
+        rows.append({
+            'config': runs[0]['config'],
+            'mean_cost': float(np.mean(costs)) if costs else None,
+            'best_cost': min(costs) if costs else None,
+            'success_rate': len(costs) / len(runs),
+            'mean_time': float(np.mean([r['wall_time'] for r in runs])),
+            'runs': len(runs),
+        })
+        
+    rows.sort(key=lambda row: (
+        -row['success_rate'],
+        row['mean_cost'] if row['mean_cost'] is not None else float('inf'),
+        row['mean_time'],
+    ))
+    return rows
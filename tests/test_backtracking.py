@@ -0,0 +1,69 @@
+"""
+Pruebas del retroceso de hormigas atascadas: los caminos completados
+siguen siendo válidos y más hormigas llegan al objetivo.
+"""
+
+import pytest
+
+from aco_algorithm import ACOParams, create_solver
+from config import COST_DIAGONAL, COST_STRAIGHT
+from environment import Environment
+from scenarios import load_scenario
+
+
+def _construct(engine, scenario, budget):
+    """Construir los caminos de una iteración sin depositar feromona"""
+    env = Environment()
+    load_scenario(env, scenario)
+    params = ACOParams()
+    params.num_ants = 30
+    params.backtrack_budget = budget
+    solver = create_solver(env, params, engine, seed=0)
+    while not solver.all_ants_finished():
+        solver.move_all_ants_one_step()
+    return solver
+
+
+def _tours(solver):
+    """Caminos completados como listas de (fila, columna) con su costo"""
+    cells, lengths, costs = solver.completed_tours()
+    offset = 0
+    for length, cost in zip(lengths.tolist(), costs.tolist()):
+        path = [divmod(cell, solver.env.cols) for cell in cells[offset:offset + length].tolist()]
+        offset += length
+        yield path, cost
+
+
+@pytest.mark.parametrize('engine', ['ants', 'vectorized'])
+@pytest.mark.parametrize('scenario', [3, 4])
+def test_backtracked_paths_are_valid(engine, scenario):
+    solver = _construct(engine, scenario, budget=200)
+    env = solver.env
+    tours = list(_tours(solver))
+    assert tours
+    for path, cost in tours:
+        assert path[0] == env.start
+        assert path[-1] == env.end
+        assert len(set(path)) == len(path)
+        assert all(env.is_valid_cell(row, col) for row, col in path)
+        expected = 0.0
+        for (r1, c1), (r2, c2) in zip(path, path[1:]):
+            assert max(abs(r1 - r2), abs(c1 - c2)) == 1
+            expected += COST_DIAGONAL if r1 != r2 and c1 != c2 else COST_STRAIGHT
+        assert cost == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('engine', ['ants', 'vectorized'])
+@pytest.mark.parametrize('scenario', [3, 4])
+def test_backtracking_saves_ants(engine, scenario):
+    without = _construct(engine, scenario, budget=0)
+    with_budget = _construct(engine, scenario, budget=200)
+    assert with_budget._colony_counts()[0] > without._colony_counts()[0]
+    # Las que habrían muerto se cuentan aunque retrocedan
+    assert with_budget._dead_end_count() > 0
+
+
+def test_dead_end_statistic():
+    solver = _construct('ants', 3, budget=200)
+    solver._finish_iteration()
+    assert solver.get_statistics()['dead_end_ants'] > 0
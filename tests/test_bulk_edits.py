@@ -0,0 +1,112 @@
+"""
+Pruebas de las ediciones de obstáculos en bloque: line_cells contra un
+Bresenham de referencia, polygon_cells y los métodos de Environment que
+escriben muchas celdas con una sola invalidación.
+"""
+
+import numpy as np
+import pytest
+
+from environment import Environment, line_cells, polygon_cells
+
+
+def _bresenham(row1, col1, row2, col2):
+    """Bresenham clásico, celda por celda"""
+    cells = []
+    dx, dy = abs(col2 - col1), abs(row2 - row1)
+    sx = 1 if col1 < col2 else -1
+    sy = 1 if row1 < row2 else -1
+    err = dx - dy
+    row, col = row1, col1
+    while True:
+        cells.append((row, col))
+        if (row, col) == (row2, col2):
+            return cells
+        e2 = 2 * err
+        if e2 > -dy:
+            err -= dy
+            col += sx
+        if e2 < dx:
+            err += dx
+            row += sy
+
+
+def test_line_cells_matches_bresenham():
+    rng = np.random.default_rng(0)
+    segments = [(0, 0, 0, 0), (0, 0, 0, 9), (0, 0, 9, 0), (0, 0, 7, 7), (9, 9, 0, 0)]
+    segments += [tuple(rng.integers(-20, 40, size=4).tolist()) for _ in range(300)]
+    for segment in segments:
+        rows, cols = line_cells(*segment)
+        assert list(zip(rows.tolist(), cols.tolist())) == _bresenham(*segment)
+
+
+def test_polygon_rectangle_is_filled():
+    rows, cols = polygon_cells([(2, 3), (2, 8), (6, 8), (6, 3)])
+    expected = {(r, c) for r in range(2, 7) for c in range(3, 9)}
+    assert set(zip(rows.tolist(), cols.tolist())) == expected
+
+
+def test_polygon_outline_only():
+    vertices = [(0, 0), (0, 10), (10, 0)]
+    rows, cols = polygon_cells(vertices, fill=False)
+    outline = set()
+    for (r1, c1), (r2, c2) in zip(vertices, vertices[1:] + vertices[:1]):
+        outline.update(_bresenham(r1, c1, r2, c2))
+    assert set(zip(rows.tolist(), cols.tolist())) == outline
+    filled = set(zip(*(a.tolist() for a in polygon_cells(vertices))))
+    assert outline < filled
+    assert (3, 3) in filled and (8, 8) not in filled
+
+
+def test_set_cells_single_invalidation():
+    env = Environment(20, 20)
+    version = env.version
+    assert env.set_cells([(5, 5), (5, 6), (30, 30), (-1, 2)])
+    assert env.version == version + 1
+    assert env.grid[5, 5] == env.grid[5, 6] == 1
+    assert env.grid.sum() == 2
+    # Sin cambios no se invalida nada
+    assert not env.set_cells([(5, 5)])
+    assert env.version == version + 1
+    assert env.set_cells([(5, 5)], 0)
+    assert env.grid[5, 5] == 0
+
+
+def test_start_and_end_are_protected():
+    env = Environment(20, 20)
+    mask = np.ones((20, 20), dtype=bool)
+    assert env.apply_mask(mask)
+    assert env.grid[env.start] == 0 and env.grid[env.end] == 0
+    assert env.grid.sum() == 20 * 20 - 2
+    assert env.apply_mask(mask, 0)
+    assert env.grid.sum() == 0
+
+
+def test_apply_mask_shape():
+    with pytest.raises(ValueError):
+        Environment(20, 20).apply_mask(np.zeros((10, 10), dtype=bool))
+
+
+def test_rect_and_line_match_cell_by_cell():
+    bulk = Environment(30, 30)
+    single = Environment(30, 30)
+    bulk.add_obstacle_rect(12, 25, 4, 40)
+    bulk.add_obstacle_line(29, 0, 0, 17)
+    for row in range(4, 13):
+        for col in range(25, 30):
+            single.add_obstacle(row, col)
+    for row, col in _bresenham(29, 0, 0, 17):
+        single.add_obstacle(row, col)
+    assert np.array_equal(bulk.grid, single.grid)
+    assert np.array_equal(bulk.get_components(), single.get_components())
+
+
+def test_clear_obstacles_in_place():
+    env = Environment(20, 20)
+    env.add_obstacle_polygon([(3, 3), (3, 12), (12, 3)])
+    grid = env.grid
+    version = env.version
+    env.clear_obstacles()
+    assert env.grid is grid
+    assert not env.grid.any()
+    assert env.version == version + 1
@@ -0,0 +1,110 @@
+"""
+Pruebas de las componentes conexas incrementales contra una búsqueda en
+anchura de referencia, tras ediciones de a una celda y en bloque.
+"""
+
+from collections import deque
+
+import numpy as np
+import pytest
+
+from aco_algorithm import ACOParams, create_solver
+from environment import Environment
+from scenarios import load_scenario
+
+
+def _bfs_components(env):
+    """Componentes de celdas libres por BFS sobre get_neighbors (-1 = obstáculo)"""
+    labels = np.full((env.rows, env.cols), -1)
+    count = 0
+    for row in range(env.rows):
+        for col in range(env.cols):
+            if env.grid[row, col] != 0 or labels[row, col] >= 0:
+                continue
+            labels[row, col] = count
+            queue = deque([(row, col)])
+            while queue:
+                r, c = queue.popleft()
+                for nr, nc, _ in env.get_neighbors(r, c):
+                    if labels[nr, nc] < 0:
+                        labels[nr, nc] = count
+                        queue.append((nr, nc))
+            count += 1
+    return labels
+
+
+def _same_partition(a, b):
+    """Verificar que dos etiquetados agrupan las celdas igual"""
+    assert np.array_equal(a < 0, b < 0)
+    pairs = set(zip(a[a >= 0].tolist(), b[b >= 0].tolist()))
+    return len(pairs) == len(set(a[a >= 0].tolist())) == len(set(b[b >= 0].tolist()))
+
+
+def _check(env, rng, queries=30):
+    """Comparar componentes y consultas connected con la referencia"""
+    reference = _bfs_components(env)
+    assert _same_partition(env.get_components(), reference)
+    free = np.argwhere(reference >= 0)
+    for _ in range(queries):
+        a, b = (tuple(cell) for cell in free[rng.integers(len(free), size=2)].tolist())
+        assert env.connected(a, b) == (reference[a] == reference[b])
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_single_cell_edits(seed):
+    rng = np.random.default_rng(seed)
+    env = Environment(20, 24)
+    env.get_components()
+    for _ in range(400):
+        row, col = rng.integers(env.rows), rng.integers(env.cols)
+        if rng.random() < 0.75:
+            env.add_obstacle(row, col)
+        else:
+            env.remove_obstacle(row, col)
+        if rng.random() < 0.1:
+            _check(env, rng, queries=5)
+    _check(env, rng)
+
+
+def test_wall_split_and_join():
+    rng = np.random.default_rng(0)
+    env = Environment(12, 15)
+    env.get_components()
+    # Un muro celda por celda parte el mapa; abrir una celda lo vuelve a unir
+    for row in range(env.rows):
+        env.add_obstacle(row, 7)
+    _check(env, rng)
+    assert not env.connected((1, 1), (10, 13))
+    env.remove_obstacle(5, 7)
+    _check(env, rng)
+    assert env.connected((1, 1), (10, 13))
+
+
+def test_bulk_edits():
+    rng = np.random.default_rng(0)
+    env = Environment(25, 30)
+    env.add_obstacle_line(0, 12, 24, 12)
+    _check(env, rng)
+    assert not env.path_exists()
+    env.set_cells([(10, 12), (11, 12)], 0)
+    _check(env, rng)
+    assert env.path_exists()
+    env.apply_mask(rng.random((env.rows, env.cols)) < 0.3)
+    _check(env, rng)
+
+
+@pytest.mark.parametrize('scenario', range(7))
+def test_scenarios(scenario):
+    env = Environment()
+    load_scenario(env, scenario, seed=0)
+    _check(env, np.random.default_rng(scenario))
+    assert env.path_exists()
+
+
+def test_solver_stops_when_unreachable():
+    env = Environment()
+    env.add_obstacle_rect(0, 10, env.rows - 1, 11)
+    solver = create_solver(env, ACOParams(), 'ants', seed=0)
+    assert solver.step() == 'completed'
+    assert solver.stop_reason == 'unreachable'
+    assert solver.iteration == 0
@@ -0,0 +1,74 @@
+"""
+Pruebas de los criterios de término: estancamiento, entropía de
+feromonas, ruta compartida y máximo de iteraciones, tanto con
+run_iteration como con step.
+"""
+
+import pytest
+
+from aco_algorithm import ACOParams, create_solver
+from environment import Environment
+from scenarios import load_scenario
+
+
+def _solver(engine='ants', **settings):
+    """Solver sobre el escenario Campo Abierto con los parámetros dados"""
+    env = Environment()
+    load_scenario(env, 2)
+    params = ACOParams()
+    params.num_ants = 10
+    params.max_iterations = 60
+    for name, value in settings.items():
+        setattr(params, name, value)
+    return create_solver(env, params, engine, seed=1)
+
+
+def _run(solver):
+    """Ejecutar iteraciones hasta que el solver termine"""
+    while not solver.completed:
+        solver.run_iteration()
+    return solver
+
+
+def test_max_iterations():
+    solver = _run(_solver(max_iterations=4))
+    assert solver.iteration == 4
+    assert solver.stop_reason == 'max_iterations'
+    assert solver.get_statistics()['stop_reason'] == 'max_iterations'
+
+
+@pytest.mark.parametrize('engine', ['ants', 'vectorized'])
+def test_stagnation(engine):
+    solver = _run(_solver(engine, stagnation_iterations=3))
+    assert solver.stop_reason == 'stagnation'
+    assert solver.iteration < 60
+    assert solver.iterations_without_improvement == 3
+    assert solver.history[-4] == solver.history[-1]
+
+
+def test_entropy_threshold():
+    # La feromona uniforme tiene entropía 1; tras depositar baja
+    solver = _solver(entropy_threshold=0.9999)
+    assert solver.pheromone_entropy() == pytest.approx(1.0)
+    _run(solver)
+    assert solver.stop_reason == 'entropy'
+    assert solver.pheromone_entropy() <= 0.9999
+
+
+def test_route_share_threshold():
+    solver = _run(_solver(route_share_threshold=0.0))
+    assert solver.stop_reason == 'route_share'
+    assert solver.iteration == 1
+
+
+@pytest.mark.parametrize('engine', ['ants', 'vectorized'])
+def test_step_matches_run_iteration(engine):
+    by_iteration = _run(_solver(engine, stagnation_iterations=3))
+    
+    by_step = _solver(engine, stagnation_iterations=3)
+    while by_step.step() != 'completed':
+        pass
+        
+    assert by_step.stop_reason == by_iteration.stop_reason
+    assert by_step.history == by_iteration.history
+    assert by_step.step() == 'completed'
@@ -0,0 +1,124 @@
+"""
+Pruebas de MappedEnvironment: con la misma grilla se comporta igual que
+un Environment denso (vecinos, conectividad, feromonas y solver), con
+bloques pequeños para forzar la caché de bloques y la evaporación
+diferida.
+"""
+
+import numpy as np
+import pytest
+
+from aco_algorithm import ACOParams, create_solver
+from environment import Environment, MappedEnvironment
+from scenarios import load_scenario
+
+
+@pytest.fixture
+def pair(tmp_path):
+    """Un entorno denso y uno mapeado con el escenario La Trampa"""
+    dense = Environment()
+    load_scenario(dense, 3)
+    mapped = MappedEnvironment(dense.rows, dense.cols, directory=tmp_path / 'mapa',
+                               tile_size=8, max_tiles=4)
+    mapped.set_grid(np.array(dense.grid), dense.start, dense.end)
+    yield dense, mapped
+    mapped.close()
+
+
+def test_neighbors_and_connectivity(pair):
+    dense, mapped = pair
+    for row in range(dense.rows):
+        for col in range(dense.cols):
+            assert mapped.is_valid_cell(row, col) == dense.is_valid_cell(row, col)
+            assert mapped.get_neighbors(row, col) == dense.get_neighbors(row, col)
+    rng = np.random.default_rng(0)
+    free = np.argwhere(dense.grid == 0)
+    for _ in range(40):
+        a, b = (tuple(cell) for cell in free[rng.integers(len(free), size=2)].tolist())
+        assert mapped.connected(a, b) == dense.connected(a, b)
+    assert mapped.path_exists() == dense.path_exists()
+
+
+def test_pheromone_operations(pair):
+    dense, mapped = pair
+    rng = np.random.default_rng(1)
+    cells = rng.integers(dense.rows * dense.cols, size=50)
+    for env in (dense, mapped):
+        env.reset_pheromones(0.5)
+        for _ in range(3):
+            env.evaporate_pheromones(0.2)
+        env.deposit_pheromones(cells, np.full(cells.size, 2.0))
+        env.evaporate_pheromones(0.9)
+        env.update_pheromone(3, 4, 1.0)
+    assert mapped.get_pheromone(3, 4) == pytest.approx(dense.get_pheromone(3, 4))
+    assert np.allclose(mapped.pheromone_values(cells), dense.pheromone_values(cells))
+    assert np.allclose(mapped.pheromones, dense.pheromones)
+    assert mapped.get_max_pheromone() == pytest.approx(dense.get_max_pheromone())
+
+
+def test_statistics_without_full_sync(pair):
+    dense, mapped = pair
+    cells = np.array([2 * dense.cols + 3, 4 * dense.cols + 5])
+    for env in (dense, mapped):
+        env.reset_pheromones(0.3)
+        for _ in range(4):
+            env.evaporate_pheromones(0.25)
+        env.deposit_pheromones(cells, np.array([5.0, 1.0]))
+        env.evaporate_pheromones(0.1)
+        
+    assert mapped.get_max_pheromone() == pytest.approx(dense.get_max_pheromone())
+    assert mapped.get_mean_pheromone() == pytest.approx(dense.get_mean_pheromone())
+    assert mapped.pheromone_entropy() == pytest.approx(dense.pheromone_entropy())
+    assert np.allclose(mapped.pheromone_matrix(), dense.pheromones)
+    # Solo se puso al día el bloque donde se depositó
+    assert mapped._stale_tiles().sum() == mapped._stale_tiles().size - 1
+
+
+def test_solver_matches_dense(pair):
+    params = ACOParams()
+    params.num_ants = 10
+    params.max_iterations = 6
+    params.backtrack_budget = 50
+    runs = []
+    for env in pair:
+        solver = create_solver(env, params, 'ants', seed=3)
+        while not solver.completed:
+            solver.run_iteration()
+        runs.append((solver.history, solver.best_path, solver.get_statistics()))
+    (dense_history, dense_path, dense_stats), (history, path, stats) = runs
+    assert history == dense_history
+    assert path == dense_path
+    assert stats['avg_pheromone'] == pytest.approx(dense_stats['avg_pheromone'])
+    assert stats['max_pheromone'] == pytest.approx(dense_stats['max_pheromone'])
+    assert pair[1].pheromone_entropy() == pytest.approx(pair[0].pheromone_entropy())
+    assert np.allclose(pair[1].pheromones, pair[0].pheromones)
+
+
+def test_sparse_ants_store_only_visited_cells(pair):
+    params = ACOParams()
+    params.num_ants = 10
+    params.backtrack_budget = 50
+    solver = create_solver(pair[1], params, 'ants', seed=3)
+    for _ in range(40):
+        solver.move_all_ants_one_step()
+    for ant in solver.ants:
+        # Celdas del camino más las abandonadas al retroceder
+        assert len(ant.visit_stamps) == ant.path_length + ant.backtracks
+
+
+def test_reopen_saved_map(pair, tmp_path):
+    dense, mapped = pair
+    mapped.evaporate_pheromones(0.5)
+    mapped.flush()
+    reopened = MappedEnvironment(directory=tmp_path / 'mapa')
+    try:
+        assert (reopened.rows, reopened.cols) == (dense.rows, dense.cols)
+        assert np.array_equal(reopened.grid, dense.grid)
+        assert np.allclose(reopened.pheromones, 0.05)
+    finally:
+        reopened.close()
+
+
+def test_dense_engines_rejected(pair):
+    with pytest.raises(ValueError):
+        create_solver(pair[1], ACOParams(), 'vectorized')
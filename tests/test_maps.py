@@ -0,0 +1,84 @@
+"""
+Pruebas de guardar y cargar mapas (.npz, .npy, .pgm, .png) y de
+load_scenario con rutas de archivo.
+"""
+
+import numpy as np
+import pytest
+
+from environment import Environment
+from maps import load_map, save_map
+from scenarios import load_scenario
+
+
+@pytest.fixture
+def env():
+    """Entorno con el escenario Laberinto Complejo y feromonas no uniformes"""
+    env = Environment()
+    load_scenario(env, 1)
+    env.start, env.end = (3, 4), (25, 30)
+    env.pheromones[...] = np.random.default_rng(0).random(env.pheromones.shape)
+    return env
+
+
+def test_npz_round_trip(env, tmp_path):
+    path = tmp_path / 'mapa.npz'
+    save_map(env, path, include_pheromones=True)
+    loaded = load_map(path)
+    assert np.array_equal(loaded.grid, env.grid)
+    assert (loaded.start, loaded.end) == (env.start, env.end)
+    assert np.array_equal(loaded.pheromones, env.pheromones)
+    # Sin copia: la grilla es un mapeo del archivo
+    assert isinstance(loaded.grid, np.memmap)
+
+
+def test_npz_without_pheromones(env, tmp_path):
+    path = tmp_path / 'mapa.npz'
+    save_map(env, path)
+    loaded = load_map(path)
+    assert np.array_equal(loaded.grid, env.grid)
+    assert np.all(loaded.pheromones == loaded.pheromones.flat[0])
+
+
+def test_edits_do_not_touch_file(env, tmp_path):
+    path = tmp_path / 'mapa.npz'
+    save_map(env, path)
+    loaded = load_map(path)
+    loaded.add_obstacle_rect(10, 10, 12, 12)
+    assert np.array_equal(load_map(path).grid, env.grid)
+
+
+@pytest.mark.parametrize('extension', ['.npy', '.pgm', '.png'])
+def test_grid_round_trip(env, tmp_path, extension):
+    if extension == '.png':
+        pytest.importorskip('pygame')
+    path = tmp_path / f'mapa{extension}'
+    save_map(env, path)
+    loaded = load_map(path)
+    assert np.array_equal(loaded.grid, env.grid)
+    # Sin inicio ni objetivo en el archivo: las esquinas estándar libres
+    assert loaded.start == (1, 1)
+    assert loaded.end == (env.rows - 2, env.cols - 2)
+
+
+def test_pgm_negate_and_threshold(tmp_path):
+    path = tmp_path / 'gris.pgm'
+    pixels = np.array([[0, 100, 200], [255, 50, 150], [255, 255, 255]], dtype=np.uint8)
+    with open(path, 'wb') as f:
+        f.write(b'P5\n# comentario\n3 3\n255\n' + pixels.tobytes())
+    assert np.array_equal(load_map(path, threshold=0.5).grid, pixels <= 127.5)
+    assert np.array_equal(load_map(path, threshold=0.5, negate=True).grid, pixels > 127.5)
+
+
+def test_load_scenario_from_path(env, tmp_path):
+    path = tmp_path / 'laberinto.npz'
+    save_map(env, path)
+    other = Environment(10, 12)
+    assert load_scenario(other, str(path)) == 'laberinto'
+    assert (other.rows, other.cols) == (env.rows, env.cols)
+    assert np.array_equal(other.grid, env.grid)
+
+
+def test_unsupported_extension(tmp_path):
+    with pytest.raises(ValueError):
+        load_map(tmp_path / 'mapa.txt')
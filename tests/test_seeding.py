@@ -0,0 +1,67 @@
+"""
+Pruebas de reproducibilidad: con la misma semilla, el mismo escenario y
+los mismos parámetros, el historial y la mejor ruta son idénticos.
+"""
+
+import numpy as np
+import pytest
+
+from aco_algorithm import ACOParams, create_solver
+from environment import Environment
+from scenarios import load_scenario
+
+
+def _run(engine, seed, scenario=1, iterations=8, **options):
+    """Historial y mejor ruta de una corrida con semilla"""
+    env = Environment()
+    load_scenario(env, scenario)
+    params = ACOParams()
+    params.num_ants = 12
+    params.backtrack_budget = 20
+    params.max_iterations = iterations
+    with create_solver(env, params, engine, seed=seed, **options) as solver:
+        while not solver.completed:
+            solver.run_iteration()
+        return solver.history, solver.best_path
+
+
+@pytest.mark.parametrize('engine', ['ants', 'vectorized'])
+def test_same_seed_same_run(engine):
+    assert _run(engine, 42) == _run(engine, 42)
+
+
+@pytest.mark.parametrize('engine', ['ants', 'vectorized'])
+def test_generator_seed(engine):
+    first = _run(engine, np.random.default_rng(7))
+    second = _run(engine, np.random.default_rng(7))
+    assert first == second
+
+
+def test_parallel_same_seed_same_run():
+    assert _run('parallel', 5, workers=2) == _run('parallel', 5, workers=2)
+
+
+def test_reset_repeats_run():
+    env = Environment()
+    load_scenario(env, 3)
+    params = ACOParams()
+    params.num_ants = 10
+    params.max_iterations = 6
+    solver = create_solver(env, params, 'ants', seed=11)
+    runs = []
+    for _ in range(2):
+        solver.reset()
+        while not solver.completed:
+            solver.run_iteration()
+        runs.append((solver.history, solver.best_path))
+    assert runs[0] == runs[1]
+
+
+def test_random_scenario_seed():
+    grids = []
+    for seed in (3, 3, 4):
+        env = Environment()
+        load_scenario(env, 5, seed=seed)
+        grids.append(np.array(env.grid))
+    assert np.array_equal(grids[0], grids[1])
+    assert not np.array_equal(grids[0], grids[2])
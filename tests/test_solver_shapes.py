@@ -0,0 +1,68 @@
+"""
+Pruebas de regresión: un mismo solver sobre mapas de distinto tamaño.
+
+load_map y load_scenario(ruta) reemplazan la grilla del entorno con
+set_grid, que puede cambiar su forma; el solver no debe conservar
+hormigas, heurística ni memoria compartida de la forma anterior.
+"""
+
+import numpy as np
+import pytest
+
+from aco_algorithm import ACOParams, create_solver
+from environment import Environment
+from maps import load_map
+
+
+def _save_grid(tmp_path, rows, cols):
+    """Guardar un mapa .npy con un muro que obliga a rodear"""
+    grid = np.zeros((rows, cols), dtype=np.int8)
+    grid[[0, -1], :] = 1
+    grid[:, [0, -1]] = 1
+    grid[rows // 2, 1:cols - 4] = 1
+    path = tmp_path / f'mapa_{rows}x{cols}.npy'
+    np.save(path, grid)
+    return path
+
+
+def _check_best_path(solver):
+    """El mejor camino cae dentro de la grilla actual y solo pisa celdas libres"""
+    env = solver.env
+    assert solver.best_path
+    assert solver.best_path[0] == env.start
+    assert solver.best_path[-1] == env.end
+    for row, col in solver.best_path:
+        assert 0 <= row < env.rows and 0 <= col < env.cols
+        assert env.grid[row, col] == 0
+    for (r1, c1), (r2, c2) in zip(solver.best_path, solver.best_path[1:]):
+        assert max(abs(r1 - r2), abs(c1 - c2)) == 1
+
+
+@pytest.mark.parametrize('engine', ['ants', 'vectorized', 'parallel'])
+def test_solver_follows_grid_shape(tmp_path, engine):
+    params = ACOParams()
+    params.num_ants = 10
+    params.backtrack_budget = 100
+    options = {'workers': 2} if engine == 'parallel' else {}
+    env = load_map(_save_grid(tmp_path, 30, 35), end=(25, 25))
+    
+    with create_solver(env, params, engine, seed=3, **options) as solver:
+        # 30x35 -> 35x30 (mismas celdas, otras columnas) -> 40x40 con el
+        # mismo objetivo
+        for rows, cols in [(30, 35), (35, 30), (40, 40)]:
+            load_map(_save_grid(tmp_path, rows, cols), env=env, end=(25, 25))
+            solver.reset()
+            for _ in range(5):
+                solver.run_iteration()
+            assert env.pheromones.shape == (rows, cols)
+            _check_best_path(solver)
+
+
+def test_heuristic_follows_grid_shape():
+    params = ACOParams()
+    env = Environment(30, 35)
+    solver = create_solver(env, params, 'vectorized', seed=0)
+    assert solver.get_heuristic_weights().size == 30 * 35
+    
+    env.set_grid(np.zeros((40, 40), dtype=np.int8), end=env.end)
+    assert solver.get_heuristic_weights().size == 40 * 40
@@ -5,9 +5,14 @@ Universidad Nacional de Chimborazo - Metaheurísticas
 Visualización avanzada del algoritmo ACO con efectos visuales profesionales.
 """
 
+import os
 import pygame
 import numpy as np
 import math
+import time
+from contextlib import nullcontext
+from aco_algorithm import ANT_ACTIVE, ANT_REACHED, ANT_STUCK
+from solver_thread import Snapshot, SolverThread
 from config import (
     WINDOW_WIDTH, WINDOW_HEIGHT, GRID_SIZE, FPS, COLORS,
     TITLE, SUBTITLE, UNIVERSITY, COURSE, GRID_COLS, GRID_ROWS,
@@ -15,6 +20,26 @@ from config import (
 )
 
 
+# Color transparente de la capa de frente (blit con colorkey, más rápido
+# que con alfa por píxel)
+LAYER_COLORKEY = (255, 0, 255)
+
+# Fases del perfil mostradas en pantalla (ver profiling.py)
+PROFILE_LABELS = (
+    ('construction', "Construcción"),
+    ('select_next_cell', "  select_next_cell"),
+    ('evaporation', "Evaporación"),
+    ('completed_tours', "Caminos"),
+    ('deposit', "Depósito"),
+    ('bookkeeping', "Resto del cierre"),
+    ('total', "Total"),
+)
+
+# Colores de las partículas (índices en ParticlePool.colors)
+PARTICLE_PATH = 0
+PARTICLE_CELEBRATION = 1
+
+
 class Button:
     """Botón interactivo para la interfaz"""
     
@@ -115,6 +140,100 @@ class Slider:
         self.value = max(self.min_val, min(self.max_val, self.value))
 
 
+class ParticlePool:
+    """
+    Partículas de efectos guardadas como arreglos de capacidad fija.
+    
+    Cada partícula es una posición en los arreglos x, y, vx, vy, life y
+    color (índice en colors). Una vida <= 0 marca el lugar como libre.
+    Si el pool está lleno, las partículas nuevas reemplazan a las de
+    menor vida, así que el costo por cuadro no depende de cuántas se
+    hayan creado. Los sprites se dibujan una vez por color, tamaño y
+    nivel de transparencia y se reutilizan.
+    """
+    
+    LIFE_DECAY = 0.02
+    ALPHA_LEVELS = 16
+    
+    def __init__(self, colors, capacity=512, seed=None):
+        self.colors = [tuple(color[:3]) for color in colors]
+        self.capacity = capacity
+        self.rng = np.random.default_rng(seed)
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros(capacity, dtype=np.intp)
+        self._sprites = {}
+        
+    def __len__(self):
+        return int(np.count_nonzero(self.life > 0))
+        
+    def clear(self):
+        """Eliminar todas las partículas"""
+        self.life.fill(0)
+        
+    def emit(self, x, y, vx, vy, color):
+        """
+        Crear partículas con vida 1.
+        
+        Args:
+            x, y, vx, vy: Arreglos (o escalares) de posición y velocidad
+            color: Índice en colors
+        """
+        x, y, vx, vy = np.broadcast_arrays(x, y, vx, vy)
+        count = min(x.size, self.capacity)
+        if count == 0:
+            return
+        x, y, vx, vy = (a.ravel()[:count] for a in (x, y, vx, vy))
+        
+        # Lugares libres primero; si faltan, los de menor vida
+        slots = np.argpartition(self.life, count - 1)[:count] if count < self.capacity \
+            else np.arange(self.capacity)
+        self.x[slots] = x
+        self.y[slots] = y
+        self.vx[slots] = vx
+        self.vy[slots] = vy
+        self.life[slots] = 1.0
+        self.color[slots] = color
+        
+    def update(self):
+        """Avanzar todas las partículas un cuadro"""
+        alive = self.life > 0
+        self.x += self.vx * alive
+        self.y += self.vy * alive
+        self.life -= self.LIFE_DECAY * alive
+        
+    def _sprite(self, color, size, level):
+        """Sprite circular pre-renderizado (se crea la primera vez)"""
+        key = (color, size, level)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            alpha = int(255 * (level + 1) / self.ALPHA_LEVELS)
+            sprite = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (*self.colors[color], alpha), (size, size), size)
+            self._sprites[key] = sprite
+        return sprite
+        
+    def draw(self, screen):
+        """Dibujar las partículas vivas con un solo blits"""
+        alive = np.flatnonzero(self.life > 0)
+        if alive.size == 0:
+            return
+        life = self.life[alive]
+        sizes = (life * 6).astype(np.intp) + 2
+        levels = np.minimum((life * self.ALPHA_LEVELS).astype(np.intp), self.ALPHA_LEVELS - 1)
+        left = (self.x[alive] - sizes).tolist()
+        top = (self.y[alive] - sizes).tolist()
+        screen.blits(
+            [(self._sprite(color, size, level), (px, py))
+             for color, size, level, px, py in zip(self.color[alive].tolist(), sizes.tolist(),
+                                                    levels.tolist(), left, top)],
+            doreturn=False
+        )
+
+
 class Visualization:
     """
     Motor de visualización principal.
@@ -124,9 +243,21 @@ class Visualization:
     - Animación de hormigas
     - Visualización de feromonas
     - Panel de control
+    
+    Con threaded=True el solver corre en un SolverThread y cada cuadro
+    dibuja la última instantánea publicada; si no, se avanza en el mismo
+    bucle que dibuja. Con headless=True no se abre ventana (driver 'dummy'
+    de SDL) y los cuadros quedan en self.screen (ver recording.py).
     """
     
-    def __init__(self, environment, aco_solver):
+    # Pasos del solver por cuadro a velocidad normal
+    STEPS_PER_FRAME = 5
+    # Fracción del rastro de hormigas que queda de un cuadro al siguiente
+    TRAIL_DECAY = 0.9
+    
+    def __init__(self, environment, aco_solver, threaded=False, headless=False):
+        if headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
         pygame.init()
         pygame.display.set_caption(TITLE)
         
@@ -155,12 +286,15 @@ class Visualization:
         self.running = True
         self.simulation_active = False
         self.speed = 1.0
+        self.max_speed = False
         self.show_pheromones = True
         self.show_best_path = True
+        self.show_trails = False
+        self.show_profile = False
         self.current_scenario = 0
         
         # Partículas para efectos
-        self.particles = []
+        self.particles = ParticlePool([COLORS['best_path'], COLORS['particle']])
         
         # Crear controles
         self._create_controls()
@@ -170,6 +304,36 @@ class Visualization:
             (self.env.cols * self.cell_size, self.env.rows * self.cell_size),
             pygame.SRCALPHA
         )
+        # Mapa de calor a un píxel por celda; se escala a pheromone_surface
+        self.pheromone_cells = pygame.Surface((self.env.cols, self.env.rows), pygame.SRCALPHA)
+        self.pheromone_lut = self._build_pheromone_lut()
+        
+        # Rastro de hormigas: intensidad por celda que se desvanece cada
+        # cuadro; el color es fijo y solo cambia el alfa
+        self.trail = np.zeros((self.env.rows, self.env.cols), dtype=np.float32)
+        self.trail_cells = pygame.Surface((self.env.cols, self.env.rows), pygame.SRCALPHA)
+        self.trail_cells.fill((*COLORS['ant'], 0))
+        self.trail_surface = pygame.Surface(self.pheromone_surface.get_size(), pygame.SRCALPHA)
+        
+        # Sprites de hormiga por estado (ANT_ACTIVE, ANT_REACHED)
+        self.ant_sprites = self._build_ant_sprites()
+        
+        # Capas estáticas: fondo (grilla) y frente (obstáculos, inicio y fin).
+        # Se reconstruyen solo cuando cambia el mapa (ver _static_key)
+        layer_size = (self.env.cols * self.cell_size + 1, self.env.rows * self.cell_size + 1)
+        self.background_layer = pygame.Surface(layer_size).convert()
+        self.foreground_layer = pygame.Surface(layer_size).convert()
+        self.foreground_layer.set_colorkey(LAYER_COLORKEY)
+        self._static_key = None
+        self._glow_cache = {}
+        
+        # Solver en segundo plano (opcional) e instantánea del cuadro actual
+        self.runner = None
+        if threaded:
+            self.runner = SolverThread(self.solver,
+                                       steps_per_second=self.STEPS_PER_FRAME * self.speed * FPS)
+            self.runner.start()
+        self.view = None
         
     def _create_controls(self):
         """Crear botones y sliders del panel"""
@@ -205,31 +369,67 @@ class Visualization:
         self.buttons = [self.btn_start, self.btn_reset, self.btn_scenario]
         self.sliders = [self.slider_alpha, self.slider_beta, self.slider_evap, self.slider_ants]
         
+    def _solver_lock(self):
+        """Lock para modificar solver o entorno (no hace nada sin hilo)"""
+        return self.runner.lock if self.runner else nullcontext()
+        
+    def _set_active(self, active):
+        """Iniciar o pausar la simulación"""
+        self.simulation_active = active
+        self.btn_start.text = "⏸ PAUSAR" if active else "▶ INICIAR"
+        if self.runner:
+            if active:
+                self.runner.resume()
+            else:
+                self.runner.pause()
+                
     def _toggle_simulation(self):
         """Iniciar/pausar simulación"""
-        self.simulation_active = not self.simulation_active
-        self.btn_start.text = "⏸ PAUSAR" if self.simulation_active else "▶ INICIAR"
+        self._set_active(not self.simulation_active)
         
+    def _toggle_max_speed(self):
+        """Alternar entre velocidad normal y máxima"""
+        self.max_speed = not self.max_speed
+        if self.runner:
+            self.runner.max_speed = self.max_speed
+            
+    def _toggle_profile(self):
+        """Mostrar/ocultar el perfil por fases (activa el perfilado del solver)"""
+        self.show_profile = not self.show_profile
+        with self._solver_lock():
+            if self.show_profile:
+                self.solver.enable_profiling()
+            else:
+                self.solver.disable_profiling()
+                
     def _reset_simulation(self):
         """Reiniciar simulación"""
-        self.simulation_active = False
-        self.btn_start.text = "▶ INICIAR"
-        self.solver.params.num_ants = int(self.slider_ants.value)
-        self.solver.reset()
-        self.particles = []
+        self._set_active(False)
+        with self._solver_lock():
+            self.solver.params.num_ants = int(self.slider_ants.value)
+            self.solver.reset()
+            if self.runner:
+                self.runner.events.clear()
+                self.runner.publish()
+        self.particles.clear()
+        self.trail.fill(0)
         
     def _next_scenario(self):
         """Cambiar al siguiente escenario"""
         from scenarios import SCENARIOS, load_scenario
         self.current_scenario = (self.current_scenario + 1) % len(SCENARIOS)
-        load_scenario(self.env, self.current_scenario)
+        with self._solver_lock():
+            load_scenario(self.env, self.current_scenario)
         self._reset_simulation()
         
     def _update_params_from_sliders(self):
         """Actualizar parámetros del solver desde los sliders"""
-        self.solver.params.alpha = self.slider_alpha.value
-        self.solver.params.beta = self.slider_beta.value
-        self.solver.params.evaporation_rate = self.slider_evap.value
+        params = self.solver.params
+        values = (self.slider_alpha.value, self.slider_beta.value, self.slider_evap.value)
+        # El lock solo se toma si algo cambió, para no frenar al hilo
+        if values != (params.alpha, params.beta, params.evaporation_rate):
+            with self._solver_lock():
+                params.alpha, params.beta, params.evaporation_rate = values
         
     def run(self):
         """Bucle principal de la visualización"""
@@ -237,15 +437,20 @@ class Visualization:
         
         # Cargar escenario inicial
         self.scenario_names = get_scenario_names()
-        load_scenario(self.env, 0)
-        self.solver.reset()
-        
+        with self._solver_lock():
+            load_scenario(self.env, 0)
+            self.solver.reset()
+            if self.runner:
+                self.runner.publish()
+                
         while self.running:
             self._handle_events()
             self._update()
             self._render()
             self.clock.tick(FPS)
             
+        if self.runner:
+            self.runner.stop()
         pygame.quit()
         
     def _handle_events(self):
@@ -264,6 +469,13 @@ class Visualization:
                     self.show_pheromones = not self.show_pheromones
                 elif event.key == pygame.K_b:
                     self.show_best_path = not self.show_best_path
+                elif event.key == pygame.K_m:
+                    self._toggle_max_speed()
+                elif event.key == pygame.K_f:
+                    self._toggle_profile()
+                elif event.key == pygame.K_t:
+                    self.show_trails = not self.show_trails
+                    self.trail.fill(0)
                     
             # Manejar botones
             for btn in self.buttons:
@@ -277,192 +489,228 @@ class Visualization:
         """Actualizar estado de la simulación"""
         self._update_params_from_sliders()
         
-        if self.simulation_active and not self.solver.completed:
-            # Ejecutar varios pasos por frame para mayor velocidad
-            for _ in range(int(5 * self.speed)):
-                result = self.solver.step()
-                if result == 'completed':
-                    self.simulation_active = False
-                    self._spawn_celebration_particles()
-                    break
-                elif result == 'new_iteration':
-                    # Agregar algunas partículas cuando se encuentra mejor ruta
-                    if self.solver.best_path:
-                        self._spawn_path_particles()
+        if self.runner:
+            # El hilo avanza solo; aquí se atienden sus eventos. A velocidad
+            # máxima llegan muchas iteraciones por cuadro: se reacciona una
+            # vez por tipo de evento
+            results = set()
+            while self.runner.events:
+                results.add(self.runner.events.popleft())
+            for result in ('new_iteration', 'completed'):
+                if result in results:
+                    self._handle_step_result(result, self.runner.snapshot.best_path)
+        else:
+            if self.simulation_active and not self.solver.completed:
+                # Varios pasos por frame; a velocidad máxima, hasta usar
+                # la mitad del tiempo de un cuadro
+                deadline = time.perf_counter() + 0.5 / FPS
+                steps = 0
+                while True:
+                    result = self.solver.step()
+                    self._handle_step_result(result, self.solver.best_path)
+                    steps += 1
+                    if result == 'completed':
+                        break
+                    if self.max_speed:
+                        if time.perf_counter() >= deadline:
+                            break
+                    elif steps >= int(self.STEPS_PER_FRAME * self.speed):
+                        break
                         
         # Actualizar partículas
         self._update_particles()
         
-    def _spawn_path_particles(self):
-        """Crear partículas en el mejor camino"""
-        if self.solver.best_path and len(self.solver.best_path) > 0:
-            import random
-            for pos in self.solver.best_path[::3]:  # Cada 3 posiciones
-                x = self.grid_offset_x + pos[1] * self.cell_size + self.cell_size // 2
-                y = self.grid_offset_y + pos[0] * self.cell_size + self.cell_size // 2
-                self.particles.append({
-                    'x': x,
-                    'y': y,
-                    'vx': random.uniform(-1, 1),
-                    'vy': random.uniform(-2, -1),
-                    'life': 1.0,
-                    'color': COLORS['best_path']
-                })
+    def _handle_step_result(self, result, best_path):
+        """Reaccionar a un resultado de solver.step()"""
+        if result == 'completed':
+            self._set_active(False)
+            self._spawn_celebration_particles()
+        elif result == 'new_iteration':
+            # Agregar algunas partículas cuando se encuentra mejor ruta
+            if best_path:
+                self._spawn_path_particles(best_path)
                 
+    def _spawn_path_particles(self, best_path):
+        """Crear partículas en el mejor camino"""
+        if best_path:
+            cells = np.asarray(best_path[::3])  # Cada 3 posiciones
+            x = self.grid_offset_x + cells[:, 1] * self.cell_size + self.cell_size // 2
+            y = self.grid_offset_y + cells[:, 0] * self.cell_size + self.cell_size // 2
+            rng = self.particles.rng
+            self.particles.emit(x, y, rng.uniform(-1, 1, len(cells)), rng.uniform(-2, -1, len(cells)),
+                                PARTICLE_PATH)
+                                
     def _spawn_celebration_particles(self):
         """Crear partículas de celebración"""
-        import random
         end_x = self.grid_offset_x + self.env.end[1] * self.cell_size + self.cell_size // 2
         end_y = self.grid_offset_y + self.env.end[0] * self.cell_size + self.cell_size // 2
         
-        for _ in range(50):
-            self.particles.append({
-                'x': end_x,
-                'y': end_y,
-                'vx': random.uniform(-5, 5),
-                'vy': random.uniform(-5, 5),
-                'life': 1.0,
-                'color': COLORS['particle']
-            })
-            
+        rng = self.particles.rng
+        self.particles.emit(end_x, end_y, rng.uniform(-5, 5, 50), rng.uniform(-5, 5, 50),
+                            PARTICLE_CELEBRATION)
+                            
     def _update_particles(self):
-        """Actualizar y eliminar partículas muertas"""
-        for p in self.particles[:]:
-            p['x'] += p['vx']
-            p['y'] += p['vy']
-            p['life'] -= 0.02
-            if p['life'] <= 0:
-                self.particles.remove(p)
+        """Actualizar partículas (las muertas dejan su lugar libre)"""
+        self.particles.update()
                 
     def _render(self):
         """Renderizar todo"""
+        # Estado a dibujar: la última instantánea del hilo, o el solver
+        # mismo (sin copiar) si corre en este bucle
+        self.view = self.runner.snapshot if self.runner else Snapshot(self.solver, copy=False)
+        
         self.screen.fill(COLORS['background'])
+        self._update_static_layers()
         
-        self._render_grid()
+        origin = (self.grid_offset_x, self.grid_offset_y)
+        self.screen.blit(self.background_layer, origin)
         
         if self.show_pheromones:
             self._render_pheromones()
             
-        self._render_obstacles()
-        self._render_start_end()
+        if self.show_trails:
+            self._render_trails()
+            
+        self._render_glow()
+        self.screen.blit(self.foreground_layer, origin)
         
-        if self.show_best_path and self.solver.best_path:
+        if self.show_best_path and self.view.best_path:
             self._render_best_path()
             
         self._render_ants()
         self._render_particles()
+        
+        if self.show_profile:
+            self._render_profile()
         self._render_panel()
         
         pygame.display.flip()
         
-    def _render_grid(self):
-        """Dibujar líneas de la grilla"""
+    def _update_static_layers(self):
+        """
+        Reconstruir las capas estáticas si el mapa cambió.
+        
+        Environment.version cambia con cada edición de obstáculos o
+        cambio de escenario; inicio y fin se comparan aparte porque
+        pueden moverse sin tocar la grilla.
+        """
+        key = (self.env.version, self.env.start, self.env.end)
+        if key == self._static_key:
+            return
+        self._static_key = key
+        
+        self.background_layer.fill(COLORS['background'])
+        self._render_grid(self.background_layer)
+        
+        self.foreground_layer.fill(LAYER_COLORKEY)
+        self._render_obstacles(self.foreground_layer)
+        self._render_start_end(self.foreground_layer)
+        
+    def _render_grid(self, surface):
+        """Dibujar líneas de la grilla (coordenadas de la capa)"""
+        width = self.env.cols * self.cell_size
+        height = self.env.rows * self.cell_size
         for r in range(self.env.rows + 1):
-            y = self.grid_offset_y + r * self.cell_size
-            pygame.draw.line(
-                self.screen, COLORS['grid_line'],
-                (self.grid_offset_x, y),
-                (self.grid_offset_x + self.env.cols * self.cell_size, y)
-            )
+            y = r * self.cell_size
+            pygame.draw.line(surface, COLORS['grid_line'], (0, y), (width, y))
         for c in range(self.env.cols + 1):
-            x = self.grid_offset_x + c * self.cell_size
-            pygame.draw.line(
-                self.screen, COLORS['grid_line'],
-                (x, self.grid_offset_y),
-                (x, self.grid_offset_y + self.env.rows * self.cell_size)
-            )
+            x = c * self.cell_size
+            pygame.draw.line(surface, COLORS['grid_line'], (x, 0), (x, height))
             
+    def _build_pheromone_lut(self, levels=256):
+        """
+        Tabla de colores del mapa de calor (bajo -> medio -> alto).
+        
+        Returns:
+            Arreglo (levels, 3) uint8; la fila i corresponde a la
+            intensidad i / (levels - 1)
+        """
+        lut = np.empty((levels, 3), dtype=np.uint8)
+        for i in range(levels):
+            intensity = i / (levels - 1)
+            if intensity < 0.5:
+                t = intensity * 2
+                lut[i] = self._lerp_color(COLORS['pheromone_low'], COLORS['pheromone_mid'], t)
+            else:
+                t = (intensity - 0.5) * 2
+                lut[i] = self._lerp_color(COLORS['pheromone_mid'], COLORS['pheromone_high'], t)
+        return lut
+        
     def _render_pheromones(self):
-        """Renderizar mapa de calor de feromonas"""
-        max_pher = max(self.env.get_max_pheromone(), 0.1)
-        
-        for r in range(self.env.rows):
-            for c in range(self.env.cols):
-                if self.env.grid[r, c] == 0:  # Solo celdas libres
-                    pher = self.env.pheromones[r, c]
-                    intensity = min(pher / max_pher, 1.0)
-                    
-                    if intensity > 0.05:  # Solo mostrar si hay feromona significativa
-                        # Interpolar color
-                        if intensity < 0.5:
-                            t = intensity * 2
-                            color = self._lerp_color(COLORS['pheromone_low'], COLORS['pheromone_mid'], t)
-                        else:
-                            t = (intensity - 0.5) * 2
-                            color = self._lerp_color(COLORS['pheromone_mid'], COLORS['pheromone_high'], t)
-                            
-                        # Dibujar celda con transparencia
-                        alpha = int(intensity * 180)
-                        x = self.grid_offset_x + c * self.cell_size
-                        y = self.grid_offset_y + r * self.cell_size
-                        
-                        s = pygame.Surface((self.cell_size - 1, self.cell_size - 1), pygame.SRCALPHA)
-                        s.fill((*color, alpha))
-                        self.screen.blit(s, (x + 1, y + 1))
-                        
+        """Renderizar mapa de calor de feromonas (un solo blit)"""
+        max_pher = max(self.view.max_pheromone, 0.1)
+        intensity = np.minimum(self.view.pheromones / max_pher, 1.0)
+        
+        # Solo celdas libres con feromona significativa
+        visible = (intensity > 0.05) & (self.env.grid == 0)
+        colors = self.pheromone_lut[(intensity * (len(self.pheromone_lut) - 1)).astype(np.intp)]
+        alpha = np.where(visible, intensity * 180, 0).astype(np.uint8)
+        
+        # surfarray indexa (x, y): se transponen filas y columnas
+        pygame.surfarray.pixels3d(self.pheromone_cells)[...] = colors.transpose(1, 0, 2)
+        pygame.surfarray.pixels_alpha(self.pheromone_cells)[...] = alpha.T
+        
+        pygame.transform.scale(self.pheromone_cells, self.pheromone_surface.get_size(),
+                               self.pheromone_surface)
+        # Cada celda se pinta sin su borde: las líneas de
+        # la grilla (x o y múltiplo de cell_size) quedan transparentes
+        edges = pygame.surfarray.pixels_alpha(self.pheromone_surface)
+        edges[::self.cell_size, :] = 0
+        edges[:, ::self.cell_size] = 0
+        del edges
+        self.screen.blit(self.pheromone_surface, (self.grid_offset_x, self.grid_offset_y))
+        
     def _lerp_color(self, c1, c2, t):
         """Interpolar entre dos colores"""
         return tuple(int(c1[i] + (c2[i] - c1[i]) * t) for i in range(3))
         
-    def _render_obstacles(self):
-        """Dibujar obstáculos"""
-        for r in range(self.env.rows):
-            for c in range(self.env.cols):
-                if self.env.grid[r, c] == 1:
-                    x = self.grid_offset_x + c * self.cell_size
-                    y = self.grid_offset_y + r * self.cell_size
-                    
-                    rect = pygame.Rect(x + 1, y + 1, self.cell_size - 2, self.cell_size - 2)
-                    pygame.draw.rect(self.screen, COLORS['obstacle'], rect, border_radius=3)
-                    pygame.draw.rect(self.screen, COLORS['obstacle_border'], rect, 1, border_radius=3)
-                    
-    def _render_start_end(self):
-        """Dibujar punto de inicio y fin con efectos de brillo"""
-        # Inicio (nido)
-        sx = self.grid_offset_x + self.env.start[1] * self.cell_size
-        sy = self.grid_offset_y + self.env.start[0] * self.cell_size
-        
-        # Efecto de brillo pulsante
+    def _render_obstacles(self, surface):
+        """Dibujar obstáculos (coordenadas de la capa)"""
+        rows, cols = np.nonzero(self.env.grid == 1)
+        for r, c in zip(rows.tolist(), cols.tolist()):
+            rect = pygame.Rect(c * self.cell_size + 1, r * self.cell_size + 1,
+                               self.cell_size - 2, self.cell_size - 2)
+            pygame.draw.rect(surface, COLORS['obstacle'], rect, border_radius=3)
+            pygame.draw.rect(surface, COLORS['obstacle_border'], rect, 1, border_radius=3)
+            
+    def _render_start_end(self, surface):
+        """Dibujar las celdas de inicio y fin (coordenadas de la capa)"""
+        for (row, col), color, icon in ((self.env.start, COLORS['start'], "🏠"),
+                                        (self.env.end, COLORS['end'], "🎯")):
+            x = col * self.cell_size
+            y = row * self.cell_size
+            rect = pygame.Rect(x + 2, y + 2, self.cell_size - 4, self.cell_size - 4)
+            pygame.draw.rect(surface, color, rect, border_radius=5)
+            surface.blit(self.font_medium.render(icon, True, (0, 0, 0)), (x + 2, y + 2))
+            
+    def _render_glow(self):
+        """Dibujar el brillo pulsante de inicio y fin"""
         pulse = (math.sin(pygame.time.get_ticks() / 200) + 1) / 2
         glow_size = int(self.cell_size * (1.2 + pulse * 0.3))
         glow_offset = (self.cell_size - glow_size) // 2
         
-        # Dibujar brillo
-        glow_surf = pygame.Surface((glow_size, glow_size), pygame.SRCALPHA)
-        pygame.draw.rect(glow_surf, (*COLORS['start'], 50), (0, 0, glow_size, glow_size), border_radius=8)
-        self.screen.blit(glow_surf, (sx + glow_offset, sy + glow_offset))
-        
-        # Celda principal
-        rect = pygame.Rect(sx + 2, sy + 2, self.cell_size - 4, self.cell_size - 4)
-        pygame.draw.rect(self.screen, COLORS['start'], rect, border_radius=5)
-        
-        # Emoji de hormiga
-        ant_text = self.font_medium.render("🏠", True, (0, 0, 0))
-        self.screen.blit(ant_text, (sx + 2, sy + 2))
-        
-        # Fin (objetivo)
-        ex = self.grid_offset_x + self.env.end[1] * self.cell_size
-        ey = self.grid_offset_y + self.env.end[0] * self.cell_size
-        
-        # Brillo
-        glow_surf = pygame.Surface((glow_size, glow_size), pygame.SRCALPHA)
-        pygame.draw.rect(glow_surf, (*COLORS['end'], 50), (0, 0, glow_size, glow_size), border_radius=8)
-        self.screen.blit(glow_surf, (ex + glow_offset, ey + glow_offset))
-        
-        rect = pygame.Rect(ex + 2, ey + 2, self.cell_size - 4, self.cell_size - 4)
-        pygame.draw.rect(self.screen, COLORS['end'], rect, border_radius=5)
-        
-        target_text = self.font_medium.render("🎯", True, (0, 0, 0))
-        self.screen.blit(target_text, (ex + 2, ey + 2))
+        # Pocas medidas posibles: cada superficie se crea una sola vez
+        if glow_size not in self._glow_cache:
+            glows = []
+            for color in (COLORS['start'], COLORS['end']):
+                glow_surf = pygame.Surface((glow_size, glow_size), pygame.SRCALPHA)
+                pygame.draw.rect(glow_surf, (*color, 50), (0, 0, glow_size, glow_size), border_radius=8)
+                glows.append(glow_surf)
+            self._glow_cache[glow_size] = glows
+            
+        for (row, col), glow_surf in zip((self.env.start, self.env.end), self._glow_cache[glow_size]):
+            x = self.grid_offset_x + col * self.cell_size + glow_offset
+            y = self.grid_offset_y + row * self.cell_size + glow_offset
+            self.screen.blit(glow_surf, (x, y))
         
     def _render_best_path(self):
         """Dibujar el mejor camino encontrado"""
-        if len(self.solver.best_path) < 2:
+        if len(self.view.best_path) < 2:
             return
             
         # Dibujar línea del camino
         points = []
-        for pos in self.solver.best_path:
+        for pos in self.view.best_path:
             x = self.grid_offset_x + pos[1] * self.cell_size + self.cell_size // 2
             y = self.grid_offset_y + pos[0] * self.cell_size + self.cell_size // 2
             points.append((x, y))
@@ -474,35 +722,74 @@ class Visualization:
             # Línea principal más fina
             pygame.draw.lines(self.screen, (255, 255, 255), False, points, 2)
             
+    def _build_ant_sprites(self):
+        """Sprites de hormiga: activa (ANT_ACTIVE) y en el objetivo (ANT_REACHED)"""
+        radius = self.cell_size // 3
+        sprites = {}
+        for status, color in ((ANT_ACTIVE, COLORS['ant']), (ANT_REACHED, COLORS['best_path'])):
+            sprite = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, color, (radius, radius), radius)
+            pygame.draw.circle(sprite, (0, 0, 0), (radius, radius), radius, 1)
+            sprites[status] = sprite
+        return sprites
+        
+    def _render_trails(self):
+        """Desvanecer el rastro, marcar las celdas actuales y dibujarlo"""
+        self.trail *= self.TRAIL_DECAY
+        active = self.view.positions[self.view.status == ANT_ACTIVE]
+        self.trail.reshape(-1)[active] = 1.0
+        
+        pygame.surfarray.pixels_alpha(self.trail_cells)[...] = (self.trail * 120).astype(np.uint8).T
+        pygame.transform.scale(self.trail_cells, self.trail_surface.get_size(), self.trail_surface)
+        self.screen.blit(self.trail_surface, (self.grid_offset_x, self.grid_offset_y))
+        
     def _render_ants(self):
-        """Dibujar hormigas con su rastro"""
-        for ant in self.solver.ants:
-            if ant.stuck:
-                continue
-                
-            x = self.grid_offset_x + ant.position[1] * self.cell_size + self.cell_size // 2
-            y = self.grid_offset_y + ant.position[0] * self.cell_size + self.cell_size // 2
-            
-            # Color según estado
-            if ant.reached_goal:
-                color = COLORS['best_path']
-            else:
-                color = COLORS['ant']
-                
-            # Dibujar hormiga
-            pygame.draw.circle(self.screen, color, (x, y), self.cell_size // 3)
-            pygame.draw.circle(self.screen, (0, 0, 0), (x, y), self.cell_size // 3, 1)
+        """Dibujar hormigas con un solo blits (un sprite por celda y estado)"""
+        positions, status = self.view.positions, self.view.status
+        
+        # Varias hormigas en la misma celda y estado se ven igual: se
+        # dibujan una vez. Las activas primero y encima las que llegaron
+        keys = np.unique(status.astype(np.int64) * self.env.rows * self.env.cols + positions)
+        status, cells = np.divmod(keys, self.env.rows * self.env.cols)
+        visible = status != ANT_STUCK
+        status, cells = status[visible], cells[visible]
+        rows, cols = np.divmod(cells, self.env.cols)
+        
+        radius = self.cell_size // 3
+        xs = (self.grid_offset_x + cols * self.cell_size + self.cell_size // 2 - radius).tolist()
+        ys = (self.grid_offset_y + rows * self.cell_size + self.cell_size // 2 - radius).tolist()
+        sprites = self.ant_sprites
+        self.screen.blits(
+            [(sprites[s], (x, y)) for s, x, y in zip(status.tolist(), xs, ys)],
+            doreturn=False
+        )
             
     def _render_particles(self):
         """Dibujar partículas de efectos"""
-        for p in self.particles:
-            alpha = int(p['life'] * 255)
-            size = int(p['life'] * 6) + 2
-            
-            s = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*p['color'][:3], alpha), (size, size), size)
-            self.screen.blit(s, (p['x'] - size, p['y'] - size))
+        self.particles.draw(self.screen)
             
+    def _render_profile(self):
+        """Dibujar el perfil por fases de la última iteración sobre el mapa"""
+        profiler = self.solver.profiler
+        record = profiler.last if profiler else None
+        
+        lines = [("PERFIL (última iteración)", COLORS['text_primary'])]
+        if record is None:
+            lines.append(("Esperando una iteración...", COLORS['text_secondary']))
+        else:
+            for phase, label in PROFILE_LABELS:
+                lines.append((f"{label}: {record[phase] * 1000:.2f} ms", COLORS['text_secondary']))
+            lines.append((f"Pasos: {record['ant_steps']}  Sin llegar: {record['unfinished_ants']}",
+                          COLORS['text_secondary']))
+            lines.append((f"Bloques de memoria: {record['allocated_blocks']:+d}",
+                          COLORS['text_secondary']))
+                          
+        box = pygame.Surface((240, 10 + 18 * len(lines)), pygame.SRCALPHA)
+        box.fill((*COLORS['panel_bg'], 220))
+        for i, (text, color) in enumerate(lines):
+            box.blit(self.font_small.render(text, True, color), (8, 6 + i * 18))
+        self.screen.blit(box, (self.grid_offset_x + 8, self.grid_offset_y + 8))
+        
     def _render_panel(self):
         """Dibujar panel lateral con estadísticas y controles"""
         panel_x = WINDOW_WIDTH - self.panel_width
@@ -535,7 +822,7 @@ class Visualization:
         )
         
         # Estadísticas
-        stats = self.solver.get_statistics()
+        stats = self.view.statistics
         
         stat_y = 155
         stat_spacing = 28
@@ -574,7 +861,7 @@ class Visualization:
             slider.draw(self.screen, self.font_small)
             
         # Controles de teclado
-        help_y = WINDOW_HEIGHT - 120
+        help_y = WINDOW_HEIGHT - 145
         pygame.draw.line(
             self.screen, COLORS['panel_border'],
             (panel_x + 20, help_y - 10), (panel_x + self.panel_width - 20, help_y - 10)
@@ -588,9 +875,12 @@ class Visualization:
             "R - Reiniciar",
             "S - Cambiar escenario",
             "P - Mostrar feromonas",
-            "B - Mostrar mejor ruta"
+            "B - Mostrar mejor ruta",
+            "M - Velocidad máxima",
+            "T - Rastro de hormigas",
+            "F - Perfil por fases",
         ]
         
         for i, shortcut in enumerate(shortcuts):
             text = self.font_small.render(shortcut, True, COLORS['text_secondary'])
-            self.screen.blit(text, (panel_x + 20, help_y + 25 + i * 18))
+            self.screen.blit(text, (panel_x + 20, help_y + 25 + i * 15))